@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Per-call overhead of `_(name, default)` in hot loops, before and after
+`hpargparse.freeze`.
+
+    python3 benchmarks/bench_freeze.py
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# run from a source checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hpman
+import hpargparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    _ = hpman.HyperParameterManager("_")
+    _.parse_source('_("batch_size", 256)\n_("model.backbone.depth", 50)')
+    hpargparse.bind(argparse.ArgumentParser(), _)
+
+    stmts = ['_("batch_size", 256)', '_("model.backbone.depth")']
+    results = {}
+    for state in ["before", "after"]:
+        if state == "after":
+            hpargparse.freeze(_)
+        for stmt in stmts:
+            t = timeit.timeit(stmt, globals={"_": _}, number=args.number)
+            results[state, stmt] = t / args.number * 1e9
+
+    for stmt in stmts:
+        before, after = results["before", stmt], results["after", stmt]
+        print(
+            "{:<30} before: {:8.0f}ns  after: {:6.0f}ns  speedup: {:.1f}x".format(
+                stmt, before, after, before / after
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Compare option resolution of stock argparse with
+`hpargparse.bind(..., fast_option_lookup=True)` on a parser with many
+hyperparameters and a sweep-style command line of many overrides.
+
+    python3 benchmarks/bench_option_resolution.py --num-options 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# run from a source checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hpman
+import hpargparse
+
+
+def make_parser(num_options, fast):
+    hp_mgr = hpman.HyperParameterManager("_")
+    hp_mgr.parse_source(
+        "\n".join(
+            '_("group{}.param_{}", 0)'.format(i % 100, i) for i in range(num_options)
+        )
+    )
+    parser = argparse.ArgumentParser()
+    hpargparse.bind(parser, hp_mgr, fast_option_lookup=fast)
+    return parser
+
+
+def make_argv(num_options, num_overrides):
+    argv = []
+    step = max(1, num_options // num_overrides)
+    for i in range(0, num_options, step)[:num_overrides]:
+        # abbreviations, "=" forms and negative values all need a lookup
+        # beyond the exact match
+        argv += ["--group{}.param-{}=1".format(i % 100, i)]
+        argv += ["--group{}.param-{}".format(i % 100, i), "-1"]
+    return argv
+
+
+def bench(parser, argv, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser.parse_known_args(argv)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-options", type=int, default=20000)
+    parser.add_argument("--num-overrides", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    argv = make_argv(args.num_options, args.num_overrides)
+    results = {}
+    for name, fast in [("argparse", False), ("prefix index", True)]:
+        results[name] = bench(make_parser(args.num_options, fast), argv, args.repeat)
+        print("{:>14}: {:.4f}s".format(name, results[name]))
+    print(
+        "{:>14}: {:.1f}x".format(
+            "speedup", results["argparse"] / results["prefix index"]
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,9 @@ def main():
     hpargparse.bind(parser, _)
     parser.parse_args()  # we need not to use args
 
+    # values are fixed from now on; make `_()` calls in the loops cheap
+    hpargparse.freeze(_)
+
     # print all hyperparameters
     print("-" * 10 + " Hyperparameters " + "-" * 10)
     print(yaml.dump(_.get_values()))
@@ -1,2 +1,12 @@
 from .hputils import bind
+from .async_save import AsyncSaver, hp_save_async, flush_saves
+from .imports import parse_reachable, reachable_modules
+from .conditions import active_names
+from .freeze import freeze, unfreeze, is_frozen, FrozenManagerError
+from .journal import HPJournal, replay_journal, compact_journal
+from .memoize import hp_memoize
+from .overlay import overlay, parse_overlay
+from .search import report
+from .shm import export_shared, attach_shared
+from .snapshot import snapshot, restore, HPSnapshot
 from .pkginfo import *
@@ -0,0 +1,148 @@
+import atexit
+import collections
+import concurrent.futures
+import copy
+import threading
+
+import hpman
+
+from . import config
+from .catalog import catalog_of
+from .hputils import dump_values
+
+from typing import Dict, Optional
+
+
+def _snapshot_values(values):
+    """Copy containers among values, which may be changed in place later.
+    Other values, including arrays which may be large memory maps, are
+    kept by reference."""
+    return {
+        k: copy.deepcopy(v) if isinstance(v, (list, dict, set, tuple)) else v
+        for k, v in values.items()
+    }
+
+
+class _SaveJob:
+    def __init__(self, path, values, serial_format, separator):
+        self.path = path
+        self.values = values
+        self.serial_format = serial_format
+        self.separator = separator
+        self.future = concurrent.futures.Future()
+
+
+class AsyncSaver:
+    """Save hyperparameters in background threads. Values are snapshotted
+    when a save is requested, so later changes to the manager do not leak
+    into the file; arrays are not copied, though, so they should not be
+    modified in place until the save finishes. If a save to the same path is
+    still waiting in the queue, it is merged with the new one: only the
+    latest values are written, and both requests share the same future.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hpargparse-save"
+        )
+        self._lock = threading.Lock()
+        self._queued = {}  # type: Dict[str, _SaveJob]
+        self._path_locks = collections.defaultdict(threading.Lock)
+        self._futures = set()
+
+    def save(
+        self,
+        path: str,
+        hp_mgr: hpman.HyperParameterManager,
+        serial_format: str = config.HP_SERIAL_FORMAT_DEFAULT,
+    ) -> concurrent.futures.Future:
+        """Request a save. See :func:`.hp_save` for the arguments. Like
+        there, inactive conditional hyperparameters are not saved.
+
+        :return: a `concurrent.futures.Future` resolved to `path` once the
+            file is written.
+        """
+        # the catalog kept on the manager reads values without walking the
+        # tree twice, which matters as this runs on the caller's thread
+        values = _snapshot_values(catalog_of(hp_mgr).active_values())
+        with self._lock:
+            job = self._queued.get(path)
+            if job is not None:
+                job.values = values
+                job.serial_format = serial_format
+                return job.future
+
+            job = _SaveJob(path, values, serial_format, hp_mgr.separator)
+            self._queued[path] = job
+            self._futures.add(job.future)
+            job.future.add_done_callback(self._forget_succeeded)
+            self._executor.submit(self._run, job)
+            return job.future
+
+    def _forget_succeeded(self, future):
+        # failed saves are kept until flush() reports them
+        if future.cancelled() or future.exception() is None:
+            self._futures.discard(future)
+
+    def _run(self, job):
+        # hold the path lock before dequeuing, so that writes to the same
+        # path happen in request order
+        with self._path_locks[job.path]:
+            with self._lock:
+                del self._queued[job.path]
+
+            if not job.future.set_running_or_notify_cancel():
+                return
+            try:
+                dump_values(job.path, job.values, job.serial_format, job.separator)
+            except BaseException as e:
+                job.future.set_exception(e)
+            else:
+                job.future.set_result(job.path)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait for all requested saves to finish. Exceptions of failed saves
+        are re-raised here.
+        """
+        with self._lock:
+            futures = list(self._futures)
+        done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        for f in done:
+            self._futures.discard(f)
+        if not_done:
+            raise TimeoutError("{} saves are not finished".format(len(not_done)))
+        for f in done:
+            f.result()
+
+
+_default_saver = None  # type: Optional[AsyncSaver]
+_default_saver_lock = threading.Lock()
+
+
+def _get_default_saver():
+    global _default_saver
+    with _default_saver_lock:
+        if _default_saver is None:
+            _default_saver = AsyncSaver()
+            atexit.register(_default_saver.flush)
+        return _default_saver
+
+
+def hp_save_async(
+    path: str,
+    hp_mgr: hpman.HyperParameterManager,
+    serial_format: str = config.HP_SERIAL_FORMAT_DEFAULT,
+) -> concurrent.futures.Future:
+    """Non-blocking :func:`.hp_save`, e.g. to save hyperparameters along with
+    every checkpoint without stalling the training loop. Pending saves are
+    flushed at exit.
+
+    :return: a `concurrent.futures.Future` resolved to `path`.
+    """
+    return _get_default_saver().save(path, hp_mgr, serial_format)
+
+
+def flush_saves(timeout: Optional[float] = None):
+    """Wait for all saves requested by :func:`.hp_save_async`."""
+    if _default_saver is not None:
+        _default_saver.flush(timeout)
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from typing import Optional
+
+
+def make_key(*parts) -> str:
+    """Make a cache key out of several parts.
+
+    :param parts: str or bytes objects. Other objects are converted by `repr`.
+    :return: a hex digest string
+    """
+    h = hashlib.sha1()
+    for p in parts:
+        if isinstance(p, str):
+            p = p.encode("utf-8")
+        elif not isinstance(p, (bytes, bytearray)):
+            p = repr(p).encode("utf-8")
+        # length-prefix each part so that ("ab", "c") != ("a", "bc")
+        h.update(str(len(p)).encode("ascii") + b":")
+        h.update(p)
+    return h.hexdigest()
+
+
+class DiskCache:
+    """A directory of binary blobs keyed by strings, evicted in
+    least-recently-used order. Recency is tracked by file modification time,
+    which is refreshed on every hit, so several processes may safely share
+    the same directory.
+
+    The directory is only scanned for eviction when the number and size of
+    entries, counted from the last scan plus those put since, exceed the
+    limits by `SLACK`, so that a run of puts to a full cache does not scan
+    the directory each time; eviction then goes down to the limits.
+    """
+
+    SLACK = 0.1
+    """Fraction of the limits entries may exceed them by until evicted."""
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        :param directory: Where to store cached files. Created on demand.
+        :param max_entries: Maximum number of entries. None for unlimited.
+        :param max_bytes: Maximum total size in bytes. None for unlimited.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # upper bounds of the directory contents, None until scanned; other
+        # processes may add entries too, which the next scan catches up with
+        self._num_entries = None  # type: Optional[int]
+        self._num_bytes = 0
+
+    def path_of(self, key: str) -> str:
+        """Path of the file storing given key."""
+        return os.path.join(self.directory, make_key(key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get cached data, or None if missing."""
+        path = self.path_of(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            # a concurrent eviction may have removed it; the data is still valid
+            pass
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store data atomically and evict old entries if limits are exceeded."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path_of(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if self._num_entries is None:
+            self.evict()
+        else:
+            self._num_entries += 1
+            self._num_bytes += len(data)
+            if self._over_limits(self._num_entries, self._num_bytes, self.SLACK):
+                self.evict()
+
+    def _over_limits(self, num_entries, num_bytes, slack=0.0):
+        def over(num, limit):
+            return limit is not None and num > limit + int(limit * slack)
+
+        return over(num_entries, self.max_entries) or over(num_bytes, self.max_bytes)
+
+    def evict(self):
+        """Remove least recently used entries until within limits."""
+        if self.max_entries is None and self.max_bytes is None:
+            self._num_entries = 0
+            return
+
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    if e.name.startswith(".tmp-") or not e.is_file():
+                        continue
+                    try:
+                        st = e.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, e.path))
+        except FileNotFoundError:
+            self._num_entries, self._num_bytes = 0, 0
+            return
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            if not self._over_limits(count, total_bytes):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            count -= 1
+            total_bytes -= size
+        self._num_entries, self._num_bytes = count, total_bytes
+
+    def clear(self):
+        """Remove all entries."""
+        shutil.rmtree(self.directory, ignore_errors=True)
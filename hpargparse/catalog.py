@@ -0,0 +1,141 @@
+import hpman
+
+from .conditions import CONDITION_HINT, inactive_names
+
+from typing import Dict, Iterator, Optional, Tuple
+
+
+def _get_attr(node, attr_name):
+    """The first attribute or hint of given name among occurrences of a
+    node, in priority order."""
+    for oc in node.db:
+        if hasattr(oc, attr_name):
+            return getattr(oc, attr_name)
+        if oc.hints and attr_name in oc.hints:
+            return oc.hints[attr_name]
+    return None
+
+
+class HPRecord:
+    """What hpargparse needs to know about a hyperparameter, extracted from
+    its occurrences once."""
+
+    __slots__ = (
+        "name",
+        "node",
+        "default",
+        "help",
+        "choices",
+        "required",
+        "range",
+        "condition",
+        "occurrences",
+    )
+
+    def __init__(self, node):
+        self.name = node.name
+        self.node = node
+        # value at the time the catalog is built, i.e. the parser default
+        self.default = node.value
+        self.help = _get_attr(node, "help")
+        self.choices = _get_attr(node, "choices")
+        self.required = _get_attr(node, "required")
+        self.range = _get_attr(node, "range")
+        self.condition = _get_attr(node, CONDITION_HINT)
+        # (filename, lineno) of occurrences, sorted by filename
+        self.occurrences = tuple(
+            sorted(
+                ((oc.filename, oc.lineno) for oc in node.db),
+                key=lambda x: x[0] or "",
+            )
+        )
+
+    @property
+    def value(self):
+        """Current value."""
+        return self.node.value
+
+
+class HPCatalog:
+    """Records of all hyperparameters of a manager sorted by name, built
+    once by :func:`.bind` and shared by option injection, listing, saving
+    and loading, instead of each walking the hyperparameter tree.
+
+    Records refer to nodes of the tree, so current values are always up to
+    date; hyperparameters added to or removed from the manager after the
+    catalog is built are followed by :meth:`refresh`.
+    """
+
+    def __init__(self, hp_mgr: hpman.HyperParameterManager):
+        self.hp_mgr = hp_mgr
+        self.separator = hp_mgr.separator
+        self.by_name = {}  # type: Dict[str, HPRecord]
+        self._build(hp_mgr.get_nodes())
+
+    def _build(self, nodes):
+        # records of nodes still in the tree are kept, as their defaults
+        # were taken then
+        by_name = {}
+        for node in nodes:
+            record = self.by_name.get(node.name)
+            if record is None or record.node is not node:
+                record = HPRecord(node)
+            by_name[node.name] = record
+        self.by_name = by_name
+        self.records = tuple(sorted(self.by_name.values(), key=lambda r: r.name))
+        self.conditions = {
+            r.name: r.condition for r in self.records if r.condition is not None
+        }
+
+    def refresh(self) -> "HPCatalog":
+        """Follow hyperparameters added to or removed from the manager since
+        the catalog was built, e.g. by parsing more sources after
+        :func:`.bind`, or by restoring a :func:`.snapshot`.
+        """
+        nodes = self.hp_mgr.get_nodes()
+        by_name = self.by_name
+        if len(nodes) != len(by_name) or any(
+            getattr(by_name.get(node.name), "node", None) is not node for node in nodes
+        ):
+            self._build(nodes)
+        return self
+
+    def __iter__(self) -> Iterator[HPRecord]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, name) -> bool:
+        return name in self.by_name
+
+    def get(self, name: str) -> Optional[HPRecord]:
+        return self.by_name.get(name)
+
+    def names(self) -> Tuple[str, ...]:
+        """Sorted names."""
+        return tuple(r.name for r in self.records)
+
+    def values(self) -> dict:
+        """Current values, like `hp_mgr.get_values()` sorted by name."""
+        return {r.name: r.node.value for r in self.records}
+
+    def active_values(self) -> dict:
+        """Current values of active hyperparameters, see :mod:`.conditions`."""
+        values = self.values()
+        if not self.conditions:
+            return values
+        inactive = inactive_names(self.conditions, values)
+        return {k: v for k, v in values.items() if k not in inactive}
+
+
+def catalog_of(hp_mgr: hpman.HyperParameterManager) -> HPCatalog:
+    """A catalog of `hp_mgr` kept on the manager and refreshed on each call,
+    for functions given only a manager, e.g. :func:`.hp_save_async`, which
+    would otherwise build a new catalog on every call.
+    """
+    catalog = vars(hp_mgr).get("_hpargparse_catalog")
+    if catalog is None:
+        catalog = hp_mgr._hpargparse_catalog = HPCatalog(hp_mgr)
+        return catalog
+    return catalog.refresh()
@@ -0,0 +1,217 @@
+"""Subcommands of `hpcli`. Each one takes the remaining command line
+arguments and returns an exit code."""
+
+import argparse
+import json
+import sys
+
+import hpman
+
+from . import config
+from . import drift
+from . import imports
+from . import search
+from . import journal
+from . import validate
+
+from typing import List
+
+
+def compact_journal_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="hpcli compact-journal",
+        description="Collapse records of a hyperparameter journal",
+    )
+    parser.add_argument("path", help="path of the journal")
+    parser.add_argument(
+        "-o", "--output", help="where to write; defaults to replacing PATH"
+    )
+    parser.add_argument(
+        "--upto-step",
+        type=int,
+        help="collapse records up to this step; defaults to all records",
+    )
+    args = parser.parse_args(argv)
+    journal.compact_journal(args.path, args.output, args.upto_step)
+    return 0
+
+
+def validate_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="hpcli validate",
+        description="Check saved hyperparameter files against sources. "
+        "Prints a JSON report per file, one per line.",
+    )
+    parser.add_argument("configs", nargs="+", help="files to check")
+    parser.add_argument(
+        "-s",
+        "--source",
+        action="append",
+        required=True,
+        help="source file or directory defining hyperparameters; repeatable",
+    )
+    parser.add_argument(
+        "--placeholder", default="_", help="placeholder of hpman used in sources"
+    )
+    parser.add_argument(
+        "--serial-format",
+        default=config.HP_SERIAL_FORMAT_DEFAULT,
+        choices=config.HP_SERIAL_FORMAT_CHOICES,
+        help="format of the files",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, help="number of worker processes; defaults to CPUs"
+    )
+    args = parser.parse_args(argv)
+
+    hp_mgr = hpman.HyperParameterManager(args.placeholder)
+    hp_mgr.parse_file(args.source)
+    reports = validate.validate_files(
+        hp_mgr, args.configs, serial_format=args.serial_format, jobs=args.jobs
+    )
+    for report in reports:
+        sys.stdout.write(json.dumps(report) + "\n")
+    return 0 if all(r["ok"] for r in reports) else 1
+
+
+def drift_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="hpcli drift",
+        description="Report hyperparameters added, removed, retyped or with "
+        "changed defaults between two snapshots of sources. "
+        "Exits with 1 if anything drifted.",
+    )
+    parser.add_argument("old", help="old source directory, or revision with --git")
+    parser.add_argument("new", help="new source directory, or revision with --git")
+    parser.add_argument(
+        "--git",
+        metavar="REPO",
+        nargs="?",
+        const=".",
+        help="compare git revisions of given repository (default: current "
+        "directory) instead of directories",
+    )
+    parser.add_argument(
+        "--path",
+        action="append",
+        help="with --git, only compare sources under this path; repeatable",
+    )
+    parser.add_argument(
+        "--placeholder", default="_", help="placeholder of hpman used in sources"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print a JSON object per change"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="where to cache summaries of files; defaults to a directory "
+        "under `{}`".format(config.HP_CACHE_DIR_DEFAULT),
+    )
+    args = parser.parse_args(argv)
+
+    def sources(snapshot):
+        if args.git is not None:
+            return drift.iter_git_sources(snapshot, args.git, args.path)
+        return drift.iter_dir_sources(snapshot)
+
+    summarizer = drift.SourceSummarizer(args.placeholder, args.cache_dir)
+    changes = drift.compare_defaults(
+        drift.collect_defaults(sources(args.old), summarizer),
+        drift.collect_defaults(sources(args.new), summarizer),
+    )
+    for c in changes:
+        line = json.dumps(c) if args.json else drift.format_change(c)
+        sys.stdout.write(line + "\n")
+    return 1 if changes else 0
+
+
+def search_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="hpcli search",
+        description="Search hyperparameters with asynchronous successive "
+        "halving. Trials run COMMAND with sampled hyperparameters as options, "
+        "and report metrics by hpargparse.report(step, **metrics). "
+        "Prints the best trial as JSON.",
+    )
+    parser.add_argument(
+        "command", nargs=argparse.REMAINDER, help="trial command, after `--`"
+    )
+    parser.add_argument(
+        "--state",
+        required=True,
+        help="JSON file keeping the state; an existing one is resumed",
+    )
+    parser.add_argument(
+        "-s",
+        "--source",
+        action="append",
+        help="source file or directory defining hyperparameters; repeatable. "
+        "Defaults to modules imported by the first .py file of COMMAND",
+    )
+    parser.add_argument(
+        "--placeholder", default="_", help="placeholder of hpman used in sources"
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        help="hyperparameter to search; repeatable. Defaults to all with "
+        "`choices` or `range` hints",
+    )
+    parser.add_argument("--trials", type=int, default=32, help="number of trials")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="number of concurrent trials"
+    )
+    parser.add_argument("--metric", required=True, help="name of reported metric")
+    parser.add_argument("--mode", choices=["min", "max"], default="min")
+    parser.add_argument(
+        "--min-resource", type=float, default=1, help="step of the first rung"
+    )
+    parser.add_argument(
+        "--max-resource", type=float, required=True, help="step trials end at"
+    )
+    parser.add_argument("--eta", type=int, default=3, help="reduction factor")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("a trial command is required")
+
+    hp_mgr = hpman.HyperParameterManager(args.placeholder)
+    if args.source:
+        hp_mgr.parse_file(args.source)
+    else:
+        scripts = [c for c in command if c.endswith(".py")]
+        if not scripts:
+            parser.error("--source is required if COMMAND has no .py file")
+        imports.parse_reachable(hp_mgr, scripts[0])
+
+    spec = validate.build_spec(hp_mgr)
+    space = search.search_space(spec, args.param)
+    driver = search.SearchDriver(
+        command,
+        space,
+        args.state,
+        num_trials=args.trials,
+        jobs=args.jobs,
+        metric=args.metric,
+        scheduler=search.ASHAScheduler(
+            args.min_resource, args.max_resource, args.eta, args.mode
+        ),
+        seed=args.seed,
+        spec=spec,
+    )
+    driver.run()
+    best = driver.best()
+    if best is None:
+        return 1
+    sys.stdout.write(json.dumps(best) + "\n")
+    return 0
+
+
+SUBCOMMANDS = {
+    "compact-journal": compact_journal_main,
+    "validate": validate_main,
+    "drift": drift_main,
+    "search": search_main,
+}
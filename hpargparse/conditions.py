@@ -0,0 +1,87 @@
+"""Conditional hyperparameters, which are only in effect when other
+hyperparameters have given values:
+
+.. code:: python
+
+    opt = _("optimizer", "adam", choices=["adam", "sgd"])
+    momentum = _("sgd.momentum", 0.9, condition={"optimizer": "sgd"})
+
+A condition maps names of controlling hyperparameters to a required value,
+or to a list of allowed values. A hyperparameter is active if all its
+conditions hold and its controllers are active themselves. Inactive ones are
+not added to the parser by :func:`.bind`, and are left out of saved files,
+`--hp-list` and `hpcli validate`. Reading them through `_()` still works.
+"""
+
+import hpman
+
+from typing import Dict, List, Optional, Set
+
+CONDITION_HINT = "condition"
+
+
+def conditions_of(hp_mgr: hpman.HyperParameterManager) -> Dict[str, dict]:
+    """Map names of conditional hyperparameters to their conditions."""
+    from .catalog import catalog_of
+
+    return catalog_of(hp_mgr).conditions
+
+
+def _holds(expected, actual):
+    if isinstance(expected, (list, tuple)):
+        return actual in expected
+    return actual == expected
+
+
+def inactive_names(conds: Dict[str, dict], values: dict) -> Set[str]:
+    """Names in `conds` which are inactive given values of controllers.
+
+    :param conds: See :func:`.conditions_of`.
+    :param values: Values of hyperparameters; a controller missing from it
+        makes its dependents inactive.
+    """
+    active = {}  # type: Dict[str, bool]
+
+    def is_active(name, visiting):
+        if name not in conds:
+            return name in values
+        if name in active:
+            return active[name]
+        if name in visiting:
+            raise ValueError("Circular conditions of `{}`".format(name))
+        visiting.add(name)
+        result = all(
+            is_active(k, visiting) and _holds(expected, values[k])
+            for k, expected in conds[name].items()
+        )
+        visiting.discard(name)
+        active[name] = result
+        return result
+
+    return {name for name in conds if not is_active(name, set())}
+
+
+def active_names(
+    hp_mgr: hpman.HyperParameterManager, values: Optional[dict] = None
+) -> List[str]:
+    """Sorted names of active hyperparameters.
+
+    :param values: Values to decide conditions by. Defaults to the current
+        values of `hp_mgr`.
+    """
+    from .catalog import catalog_of
+
+    catalog = catalog_of(hp_mgr)
+    if values is None:
+        values = catalog.values()
+    inactive = inactive_names(catalog.conditions, values)
+    return sorted(k for k in values if k not in inactive)
+
+
+def filter_active(hp_mgr: hpman.HyperParameterManager, values: dict) -> dict:
+    """Drop inactive hyperparameters from values of `hp_mgr`."""
+    conds = conditions_of(hp_mgr)
+    if not conds:
+        return values
+    inactive = inactive_names(conds, values)
+    return {k: v for k, v in values.items() if k not in inactive}
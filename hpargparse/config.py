@@ -1,4 +1,20 @@
+import os
+
 HP_SERIAL_FORMAT_DEFAULT = "auto"
-HP_SERIAL_FORMAT_CHOICES = ["auto", "yaml", "pickle"]
+HP_SERIAL_FORMAT_CHOICES = ["auto", "yaml", "pickle", "journal", "embedded"]
 
 HP_ACTION_PREFIX_DEFAULT = "hp"
+
+HP_CACHE_DIR_DEFAULT = os.environ.get(
+    "HPARGPARSE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "hpargparse"),
+)
+
+HP_SHM_NAME_ENV = "HPARGPARSE_SHM_NAME"
+
+HP_RENDEZVOUS_ENV = "HPARGPARSE_RENDEZVOUS"
+HP_RENDEZVOUS_TIMEOUT = 300
+HP_LAUNCH_ID_ENV = "HPARGPARSE_LAUNCH_ID"
+
+HP_OFFLINE_ENV = "HPARGPARSE_OFFLINE"
+HP_URI_MAX_AGE = float(os.environ.get("HPARGPARSE_URI_MAX_AGE", 10))
@@ -0,0 +1,107 @@
+"""Embed a block of serialized hyperparameters at the end of an arbitrary
+binary file, e.g. a checkpoint, and read it back without reading the rest
+of the file.
+
+The layout of a file with an embedded block is::
+
+    [original content][block][footer]
+
+where the fixed-size footer stores the offset, length, CRC32 and format of
+the block. Reading the block costs two seeks and reads of the footer and
+the block, regardless of the size of the file.
+
+:note: The original content is left untouched, so formats read from the
+    start of the file, such as pickle and `.npy`, are still readable by
+    their own loaders. Formats locating an index at the end of the file,
+    such as zip archives, may not tolerate the trailing block.
+"""
+
+import os
+import struct
+import zlib
+
+from typing import Tuple
+
+MAGIC = b"HPARGPRS"
+VERSION = 1
+
+# magic, version, format, reserved, offset, length, crc32
+_FOOTER = struct.Struct("<8sHBxQQI")
+
+_FORMAT_CODES = {"yaml": 0, "pickle": 1}
+_FORMAT_NAMES = {v: k for k, v in _FORMAT_CODES.items()}
+
+
+class NoEmbeddedBlockError(ValueError):
+    pass
+
+
+def _read_footer(f):
+    """Return the footer of an open file, or None if there is none."""
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    if size < _FOOTER.size:
+        return None
+    f.seek(size - _FOOTER.size)
+    magic, version, fmt, offset, length, crc = _FOOTER.unpack(f.read(_FOOTER.size))
+    if (
+        magic != MAGIC
+        or version != VERSION
+        or fmt not in _FORMAT_NAMES
+        or offset + length + _FOOTER.size != size
+    ):
+        return None
+    return _FORMAT_NAMES[fmt], offset, length, crc
+
+
+def has_block(path: str) -> bool:
+    """Whether a file ends with an embedded block."""
+    try:
+        with open(path, "rb") as f:
+            return _read_footer(f) is not None
+    except (FileNotFoundError, IsADirectoryError):
+        return False
+
+
+def write_block(path: str, data: bytes, serial_format: str):
+    """Append a block to a file, replacing a block embedded before. The file
+    is created if missing.
+
+    :param serial_format: 'yaml' or 'pickle', the format of `data`.
+    """
+    with os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o666), "r+b") as f:
+        old = _read_footer(f)
+        if old is not None:
+            f.truncate(old[1])
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+        footer = _FOOTER.pack(
+            MAGIC,
+            VERSION,
+            _FORMAT_CODES[serial_format],
+            offset,
+            len(data),
+            zlib.crc32(data),
+        )
+        f.write(data)
+        f.write(footer)
+
+
+def read_block(path: str) -> Tuple[str, bytes]:
+    """Read the block embedded in a file.
+
+    :return: a tuple of (format, data)
+    :raises NoEmbeddedBlockError: if the file has no block
+    """
+    with open(path, "rb") as f:
+        footer = _read_footer(f)
+        if footer is None:
+            raise NoEmbeddedBlockError(
+                "No embedded hyperparameters found in {}".format(path)
+            )
+        serial_format, offset, length, crc = footer
+        f.seek(offset)
+        data = f.read(length)
+    if zlib.crc32(data) != crc:
+        raise ValueError("Corrupted hyperparameters embedded in {}".format(path))
+    return serial_format, data
@@ -0,0 +1,285 @@
+import os
+import socket
+import struct
+import time
+
+import dill
+
+from . import config
+
+from typing import Any, Mapping, Optional, Tuple
+
+_HEADER = struct.Struct("<Q")
+
+
+def get_rank_and_world_size(environ: Optional[Mapping] = None) -> Tuple[int, int]:
+    """Get rank and world size of the current process from `RANK` and
+    `WORLD_SIZE` (falling back to `LOCAL_RANK` and `LOCAL_WORLD_SIZE`)
+    environment variables, as set by `torchrun` and most launchers.
+
+    :return: (rank, world_size); (0, 1) if not launched by such a launcher.
+    """
+    if environ is None:
+        environ = os.environ
+
+    def get(*names, default):
+        for name in names:
+            if environ.get(name):
+                return int(environ[name])
+        return default
+
+    return (
+        get("RANK", "LOCAL_RANK", default=0),
+        get("WORLD_SIZE", "LOCAL_WORLD_SIZE", default=1),
+    )
+
+
+def get_rendezvous(environ: Optional[Mapping] = None) -> str:
+    """Get the rendezvous address from environment variable
+    `HPARGPARSE_RENDEZVOUS`. If it is not set but `MASTER_PORT` is, the port
+    next to `MASTER_PORT` on `MASTER_ADDR` is used.
+
+    :return: "tcp://host:port" or "file:///path/to/file"
+    """
+    if environ is None:
+        environ = os.environ
+
+    if environ.get(config.HP_RENDEZVOUS_ENV):
+        return environ[config.HP_RENDEZVOUS_ENV]
+
+    if environ.get("MASTER_PORT"):
+        return "tcp://{}:{}".format(
+            environ.get("MASTER_ADDR", "127.0.0.1"), int(environ["MASTER_PORT"]) + 1
+        )
+
+    raise RuntimeError(
+        "Cannot determine rendezvous address; please set environment variable"
+        " `{}` to tcp://host:port or file:///path".format(config.HP_RENDEZVOUS_ENV)
+    )
+
+
+def get_launch_id(environ: Optional[Mapping] = None) -> Optional[str]:
+    """Get an id of the current launch, the same on all ranks of a launch,
+    from environment variable `HPARGPARSE_LAUNCH_ID`, or else from those set
+    by `torchrun` and Slurm.
+
+    :return: the id, or None if there is none.
+    """
+    if environ is None:
+        environ = os.environ
+
+    if environ.get(config.HP_LAUNCH_ID_ENV):
+        return environ[config.HP_LAUNCH_ID_ENV]
+
+    names = [
+        "TORCHELASTIC_RUN_ID",
+        "TORCHELASTIC_RESTART_COUNT",
+        "SLURM_JOB_ID",
+        "SLURM_STEP_ID",
+        "MASTER_ADDR",
+        "MASTER_PORT",
+    ]
+    parts = ["{}={}".format(name, environ[name]) for name in names if name in environ]
+    return ",".join(parts) or None
+
+
+class BroadcastError(RuntimeError):
+    """Raised on non-zero ranks when rank 0 failed to resolve the object
+    to broadcast."""
+
+
+def _split_address(rendezvous):
+    scheme, sep, rest = rendezvous.partition("://")
+    if not sep or scheme not in ("tcp", "file"):
+        raise ValueError("Unsupported rendezvous address: {}".format(rendezvous))
+    if scheme == "file":
+        return scheme, rest
+    host, _, port = rest.rpartition(":")
+    return scheme, (host, int(port))
+
+
+def _recv_exactly(sock, n):
+    chunks = []
+    while n:
+        chunk = sock.recv(min(n, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Rendezvous connection closed unexpectedly")
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def _tcp_send(address, payload, num_receivers, timeout):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(address)
+        server.listen(num_receivers)
+        server.settimeout(timeout)
+        for _ in range(num_receivers):
+            conn, _ = server.accept()
+            with conn:
+                conn.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _tcp_recv(address, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            sock = socket.create_connection(address, timeout=timeout)
+            break
+        except OSError:
+            # rank 0 is not listening yet
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+    with sock:
+        (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+        return _recv_exactly(sock, size)
+
+
+def _ack_path(path, rank):
+    return "{}.ack-{}".format(path, rank)
+
+
+def _write_atomically(path, data):
+    tmp_path = "{}.tmp-{}".format(path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read_if_exists(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _file_send(path, message, num_receivers, timeout, launch_id):
+    tag = repr(launch_id).encode("utf-8")
+    ack_paths = [_ack_path(path, rank) for rank in range(1, num_receivers + 1)]
+    for ack_path in ack_paths:
+        if os.path.exists(ack_path):
+            os.remove(ack_path)
+    _write_atomically(path, message)
+
+    # wait until all receivers have read the file, then clean up
+    deadline = time.monotonic() + timeout
+    pending = list(ack_paths)
+    while pending:
+        pending = [p for p in pending if _read_if_exists(p) != tag]
+        if not pending:
+            break
+        if time.monotonic() > deadline:
+            raise TimeoutError(
+                "Timeout waiting for {} ranks to read rendezvous file {}".format(
+                    len(pending), path
+                )
+            )
+        time.sleep(0.05)
+    for p in [path] + ack_paths:
+        os.remove(p)
+
+
+def _file_recv(path, timeout, launch_id, rank):
+    deadline = time.monotonic() + timeout
+    while True:
+        data = _read_if_exists(path)
+        if data is not None:
+            try:
+                message = dill.loads(data)
+            except Exception:
+                message = None  # not from this version of hpargparse
+            # a file left by another launch is stale
+            if message is not None and message[0] == launch_id:
+                break
+        if time.monotonic() > deadline:
+            raise TimeoutError("Timeout waiting for rendezvous file {}".format(path))
+        time.sleep(0.05)
+    _write_atomically(_ack_path(path, rank), repr(launch_id).encode("utf-8"))
+    return message
+
+
+def _broadcast(obj, failed, *, rank, world_size, rendezvous, timeout, launch_id) -> Any:
+    scheme, address = _split_address(rendezvous)
+
+    if rank == 0:
+        if world_size > 1:
+            message = dill.dumps((launch_id, failed, obj))
+            if scheme == "tcp":
+                _tcp_send(address, message, world_size - 1, timeout)
+            else:
+                _file_send(address, message, world_size - 1, timeout, launch_id)
+        return obj
+
+    if scheme == "tcp":
+        message = dill.loads(_tcp_recv(address, timeout))
+    else:
+        message = _file_recv(address, timeout, launch_id, rank)
+    _, failed, obj = message
+    if failed:
+        raise BroadcastError("Rank 0 failed: {}".format(obj))
+    return obj
+
+
+def broadcast_object(
+    obj: Any,
+    *,
+    rank: int,
+    world_size: int,
+    rendezvous: str,
+    timeout: float = config.HP_RENDEZVOUS_TIMEOUT,
+    launch_id: Optional[str] = None,
+) -> Any:
+    """Send an object from rank 0 to all other ranks.
+
+    :param obj: The object to be sent. Ignored on non-zero ranks.
+    :param rank: Rank of the current process.
+    :param world_size: Number of processes.
+    :param rendezvous: "tcp://host:port", where rank 0 listens on; or
+        "file:///path", which rank 0 writes to and removes once all ranks
+        have read it.
+    :param timeout: Timeout in seconds.
+    :param launch_id: Id of the launch, see :func:`.get_launch_id`. A file
+        left at the rendezvous path by a launch with another id is not
+        taken as ready. Without an id, the file must be unique to each
+        launch.
+
+    :return: the object sent by rank 0.
+    :raise BroadcastError: on non-zero ranks, if rank 0 called
+        :func:`.broadcast_error` instead.
+    """
+    return _broadcast(
+        obj,
+        False,
+        rank=rank,
+        world_size=world_size,
+        rendezvous=rendezvous,
+        timeout=timeout,
+        launch_id=launch_id,
+    )
+
+
+def broadcast_error(
+    message: str,
+    *,
+    world_size: int,
+    rendezvous: str,
+    timeout: float = config.HP_RENDEZVOUS_TIMEOUT,
+    launch_id: Optional[str] = None,
+):
+    """Called on rank 0 instead of :func:`.broadcast_object` if it fails,
+    so that :func:`.broadcast_object` raises :class:`.BroadcastError` with
+    `message` on other ranks rather than waiting until the timeout.
+    """
+    _broadcast(
+        message,
+        True,
+        rank=0,
+        world_size=world_size,
+        rendezvous=rendezvous,
+        timeout=timeout,
+        launch_id=launch_id,
+    )
@@ -0,0 +1,206 @@
+"""Compare defaults of hyperparameters between two snapshots of sources.
+See :func:`.compare_defaults`."""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tarfile
+import warnings
+
+import hpman
+
+from . import config
+from .cache import DiskCache, make_key
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def iter_dir_sources(root: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield (relative path, content) of python files under a directory, in
+    the same order as `hpman.HyperParameterManager.parse_file`."""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        paths.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(".py"))
+    for path in sorted(paths):
+        with open(path, "rb") as f:
+            yield os.path.relpath(path, root), f.read()
+
+
+def iter_git_sources(
+    revision: str, repo: str = ".", paths: Optional[List[str]] = None
+) -> Iterator[Tuple[str, bytes]]:
+    """Yield (relative path, content) of python files at a git revision,
+    streamed from `git archive` without touching the working tree."""
+    cmd = ["git", "-C", repo, "archive", "--format=tar", revision]
+    if paths:
+        cmd += ["--"] + list(paths)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    try:
+        with tarfile.open(fileobj=proc.stdout, mode="r|") as tar:
+            for member in tar:
+                if member.isfile() and member.name.endswith(".py"):
+                    yield member.name, tar.extractfile(member).read()
+    finally:
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _value_repr(oc):
+    if isinstance(oc.value, hpman.EmptyValue):
+        return None, None
+    if isinstance(oc.value, hpman.NotLiteralEvaluable):
+        if hasattr(ast, "unparse"):
+            return ast.unparse(oc.ast_node), "<expr>"
+        # Python < 3.9; less readable, but compares equal just the same
+        return ast.dump(oc.ast_node), "<expr>"
+    return repr(oc.value), type(oc.value).__name__
+
+
+def summarize_source(source: str, placeholder: str = "_") -> List[dict]:
+    """Occurrences of hyperparameters in a python source, as a list of dicts
+    of `name`, `line`, `value` and `type`. A default value is given by its
+    repr, and is None for an occurrence without one."""
+    hp_mgr = hpman.HyperParameterManager(placeholder)
+    hp_mgr.parse_source(source)
+    summary = []
+    for node in hp_mgr.get_nodes():
+        for oc in node.db:
+            value, typ = _value_repr(oc)
+            summary.append(
+                {"name": oc.name, "line": oc.lineno, "value": value, "type": typ}
+            )
+    summary.sort(key=lambda e: (e["line"], e["name"]))
+    return summary
+
+
+class SourceSummarizer:
+    """Summarize sources by content hash. A content seen before, in either
+    snapshot or in a previous run sharing the cache directory, is never
+    parsed again.
+
+    Summaries are kept in a single cache entry, read once and written back
+    by :meth:`save` (called by :func:`.collect_defaults`), since a cache
+    file per source costs about as much as parsing it.
+    """
+
+    MAX_SUMMARIES = 65536
+    """Summaries kept in the cache; those used most recently are kept."""
+
+    def __init__(self, placeholder: str = "_", cache_dir: Optional[str] = None):
+        self.placeholder = placeholder
+        self.cache = DiskCache(
+            os.path.join(cache_dir or config.HP_CACHE_DIR_DEFAULT, "drift"),
+            max_entries=64,
+        )
+        # expressions are summarized differently before Python 3.9
+        self._key = make_key("summaries", placeholder, hasattr(ast, "unparse"))
+        # a cheap test before parsing; most files have no hyperparameter
+        self._call_re = re.compile(
+            rb"(?<![\w.])" + re.escape(placeholder.encode("utf-8")) + rb"\s*\("
+        )
+        self._cached = {}  # type: Dict[str, List[dict]]
+        data = self.cache.get(self._key)
+        if data is not None:
+            try:
+                self._cached = json.loads(data.decode("utf-8"))
+            except ValueError:
+                pass
+        # summaries used in this run, by digest
+        self._memo = {}  # type: Dict[str, List[dict]]
+        self._changed = False
+        self.parsed = 0
+
+    def __call__(self, relpath: str, content: bytes) -> List[dict]:
+        if not self._call_re.search(content):
+            return []
+        digest = hashlib.sha1(content).hexdigest()
+        if digest in self._memo:
+            return self._memo[digest]
+
+        summary = self._cached.get(digest)
+        if summary is None:
+            try:
+                summary = summarize_source(content.decode("utf-8"), self.placeholder)
+            except Exception as e:
+                warnings.warn("Skipping {}: {}".format(relpath, e))
+                summary = []
+            self.parsed += 1
+            self._changed = True
+        self._memo[digest] = summary
+        return summary
+
+    def save(self):
+        """Write summaries to the cache, if any source was parsed."""
+        if not self._changed:
+            return
+        summaries = dict(self._memo)
+        for digest, summary in self._cached.items():
+            if len(summaries) >= self.MAX_SUMMARIES:
+                break
+            summaries.setdefault(digest, summary)
+        self.cache.put(self._key, json.dumps(summaries).encode("utf-8"))
+        self._cached = summaries
+        self._changed = False
+
+
+def collect_defaults(
+    sources: Iterator[Tuple[str, bytes]], summarizer: SourceSummarizer
+) -> Dict[str, dict]:
+    """Map each hyperparameter name to its default, given by a dict of
+    `value`, `type`, `file` and `line`. The first occurrence with a default
+    wins, or the first occurrence if none has one."""
+    defaults = {}
+    for relpath, content in sources:
+        for e in summarizer(relpath, content):
+            entry = {
+                "value": e["value"],
+                "type": e["type"],
+                "file": relpath,
+                "line": e["line"],
+            }
+            old = defaults.get(e["name"])
+            if old is None or (old["value"] is None and e["value"] is not None):
+                defaults[e["name"]] = entry
+    summarizer.save()
+    return defaults
+
+
+def compare_defaults(old: Dict[str, dict], new: Dict[str, dict]) -> List[dict]:
+    """Compare two results of :func:`.collect_defaults`.
+
+    :return: a list of dicts of `name`, `change` (one of 'added', 'removed',
+        'retyped' and 'changed'), `old` and `new`, sorted by name.
+    """
+    changes = []
+    for name in sorted(set(old) | set(new)):
+        o, n = old.get(name), new.get(name)
+        if o is None:
+            change = "added"
+        elif n is None:
+            change = "removed"
+        elif o["type"] != n["type"]:
+            change = "retyped"
+        elif o["value"] != n["value"]:
+            change = "changed"
+        else:
+            continue
+        changes.append({"name": name, "change": change, "old": o, "new": n})
+    return changes
+
+
+def format_change(c: dict) -> str:
+    def where(e):
+        return "{}:{}".format(e["file"], e["line"])
+
+    o, n = c["old"], c["new"]
+    if c["change"] == "added":
+        return "added {} = {} ({})".format(c["name"], n["value"], where(n))
+    if c["change"] == "removed":
+        return "removed {} = {} ({})".format(c["name"], o["value"], where(o))
+    return "{} {}: {} -> {} ({} -> {})".format(
+        c["change"], c["name"], o["value"], n["value"], where(o), where(n)
+    )
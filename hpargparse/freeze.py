@@ -0,0 +1,105 @@
+import hpman
+from hpman import EmptyValue
+
+
+class FrozenManagerError(RuntimeError):
+    pass
+
+
+_EMPTY = EmptyValue()
+
+
+class _FrozenMixin:
+    """Fast-path lookups of a frozen manager. See :func:`.freeze`."""
+
+    def __call__(self, hp_name, hp_value=_EMPTY, **hints):
+        # go through get_value, so that wrappers installed on the instance
+        # (e.g. :func:`.memoize.record_reads`) still see every read
+        try:
+            return self.get_value(hp_name)
+        except KeyError:
+            if isinstance(hp_value, EmptyValue):
+                raise
+            # registering a new hyperparameter would modify the manager
+            raise FrozenManagerError(
+                "HyperParameterManager is frozen; `{}` is not a known "
+                "hyperparameter".format(hp_name)
+            ) from None
+
+    def get_value(self, name, raise_exception=True):
+        try:
+            return self._hpargparse_frozen_values[name]
+        except KeyError:
+            # not a leaf; e.g. the subtree of a namespace
+            return super().get_value(name, raise_exception=raise_exception)
+
+    def get_values(self):
+        return dict(self._hpargparse_frozen_values)
+
+    def _raise_frozen(self, *args, **kwargs):
+        raise FrozenManagerError(
+            "HyperParameterManager is frozen; call hpargparse.unfreeze() first"
+        )
+
+    set_value = set_values = set_tree = _raise_frozen
+    parse_source = parse_file = _raise_frozen
+
+    def __reduce__(self):
+        # frozen classes of subclasses are created at runtime and cannot be
+        # found by pickle; pickle as the base class and freeze again on load
+        state = dict(vars(self))
+        del state["_hpargparse_frozen_values"]
+        return _load_frozen, (type(self).__mro__[2], state)
+
+
+class FrozenHyperParameterManager(_FrozenMixin, hpman.HyperParameterManager):
+    pass
+
+
+def _load_frozen(cls, state):
+    hp_mgr = cls.__new__(cls)
+    hp_mgr.__dict__.update(state)
+    return freeze(hp_mgr)
+
+
+_frozen_classes = {hpman.HyperParameterManager: FrozenHyperParameterManager}
+
+
+def freeze(hp_mgr: hpman.HyperParameterManager) -> hpman.HyperParameterManager:
+    """Compile the resolved values of `hp_mgr` into an immutable flat table.
+    Afterwards, `hp_mgr(name, ...)` and `hp_mgr.get_value(name)` are plain
+    dict lookups, which is meant for reads in hot loops; any setter raises
+    :class:`.FrozenManagerError`. Usually called right after
+    `parser.parse_args()`.
+
+    :param hp_mgr: The manager to be frozen, in place.
+    :return: the manager itself
+
+    :note: Reading a hyperparameter not known at freezing time raises
+        :class:`.FrozenManagerError` even if a default is given, as it would
+        register a new hyperparameter.
+    """
+    if is_frozen(hp_mgr):
+        return hp_mgr
+
+    cls = type(hp_mgr)
+    if cls not in _frozen_classes:
+        _frozen_classes[cls] = type("Frozen" + cls.__name__, (_FrozenMixin, cls), {})
+
+    # a plain dict is the fastest to look up, and picklable; it is never
+    # written after this point
+    hp_mgr._hpargparse_frozen_values = hp_mgr.get_values()
+    hp_mgr.__class__ = _frozen_classes[cls]
+    return hp_mgr
+
+
+def unfreeze(hp_mgr: hpman.HyperParameterManager) -> hpman.HyperParameterManager:
+    """Undo :func:`.freeze`."""
+    if is_frozen(hp_mgr):
+        hp_mgr.__class__ = type(hp_mgr).__mro__[2]
+        del hp_mgr._hpargparse_frozen_values
+    return hp_mgr
+
+
+def is_frozen(hp_mgr: hpman.HyperParameterManager) -> bool:
+    return isinstance(hp_mgr, _FrozenMixin)
@@ -0,0 +1,135 @@
+import argparse
+import os
+import shutil
+import sys
+
+from types import MethodType
+
+from . import config
+from .cache import DiskCache, make_key
+
+from typing import Optional
+
+
+def help_fingerprint(parser: argparse.ArgumentParser) -> str:
+    """Fingerprint of everything the help message of `parser` depends on:
+    the registered options with their defaults, helps and choices, the
+    texts of the parser, the terminal width, and the Python version, whose
+    argparse decides the layout.
+    """
+    parts = [
+        sys.version_info[:2],
+        parser.prog,
+        parser.usage,
+        parser.description,
+        parser.epilog,
+        parser.formatter_class.__module__,
+        parser.formatter_class.__qualname__,
+        shutil.get_terminal_size().columns,
+    ]
+    for group in parser._action_groups:
+        parts.append((group.title, group.description))
+        for action in group._group_actions:
+            parts.append(
+                (
+                    type(action).__name__,
+                    action.option_strings,
+                    action.dest,
+                    action.nargs,
+                    action.default,
+                    action.choices,
+                    action.required,
+                    action.help,
+                    action.metavar,
+                )
+            )
+    for mutex_group in parser._mutually_exclusive_groups:
+        parts.append([a.dest for a in mutex_group._group_actions])
+    return make_key(*parts)
+
+
+def iter_help_sections(parser: argparse.ArgumentParser):
+    """Format help section by section, in the same layout as
+    `parser.format_help()`.
+
+    :return: an iterator of strings
+    """
+    formatter = parser._get_formatter()
+    formatter.add_usage(
+        parser.usage, parser._actions, parser._mutually_exclusive_groups
+    )
+    formatter.add_text(parser.description)
+    yield formatter.format_help()
+
+    for action_group in parser._action_groups:
+        formatter = parser._get_formatter()
+        formatter.start_section(action_group.title)
+        formatter.add_text(action_group.description)
+        formatter.add_arguments(action_group._group_actions)
+        formatter.end_section()
+        section = formatter.format_help()
+        if section.strip():
+            yield "\n" + section
+
+    if parser.epilog:
+        formatter = parser._get_formatter()
+        formatter.add_text(parser.epilog)
+        yield "\n" + formatter.format_help()
+
+
+def install_help_cache(
+    parser: argparse.ArgumentParser, cache_dir: Optional[str] = None
+) -> argparse.ArgumentParser:
+    """Make `parser.format_help` and `parser.print_help` reuse help texts
+    rendered by previous invocations, which are stored on disk and keyed by
+    :func:`.help_fingerprint`. If the cache directory is not writable,
+    `print_help` streams the help section by section instead of rendering
+    it at once.
+
+    :param parser: The parser whose help is to be cached.
+    :param cache_dir: Defaults to "help" under `config.HP_CACHE_DIR_DEFAULT`.
+
+    :return: the parser
+    """
+    cache = DiskCache(
+        cache_dir or os.path.join(config.HP_CACHE_DIR_DEFAULT, "help"),
+        max_entries=64,
+    )
+    original_format_help = parser.format_help
+
+    def cache_usable():
+        try:
+            os.makedirs(cache.directory, exist_ok=True)
+        except OSError:
+            return False
+        return os.access(cache.directory, os.W_OK)
+
+    def format_help(self):
+        key = help_fingerprint(self)
+        data = cache.get(key)
+        if data is not None:
+            return data.decode("utf-8")
+
+        text = original_format_help()
+        try:
+            cache.put(key, text.encode("utf-8"))
+        except OSError:
+            pass
+        return text
+
+    def print_help(self, file=None):
+        if file is None:
+            file = sys.stdout
+
+        if cache_usable():
+            self._print_message(self.format_help(), file)
+            return
+
+        for section in iter_help_sections(self):
+            self._print_message(section, file)
+            if file is not None:
+                file.flush()
+
+    parser.format_help = MethodType(format_help, parser)
+    parser.print_help = MethodType(print_help, parser)
+    return parser
@@ -1,4 +1,5 @@
 # logistics
+import atexit
 import subprocess
 import sys
 import ast
@@ -9,7 +10,10 @@ import dill
 import yaml
 import json
 import collections
+import contextvars
 import os
+import tempfile
+import threading
 from copy import deepcopy
 
 from types import MethodType
@@ -23,8 +27,20 @@ from hpman import (
 )
 
 from . import config
-
-from typing import Union, List
+from . import distributed as dist
+from . import loaders
+from . import journal
+from . import container
+from . import conditions
+from .help_cache import install_help_cache
+from .profiler import AccessProfiler
+from .snapshot import snapshot
+from .resolver import OptionPrefixIndex, install_prefix_resolver
+from .suggest import NameIndex
+from .yaml_cache import YAMLCache
+from .catalog import HPCatalog, catalog_of
+
+from typing import Union, List, Optional, Set
 
 
 from rich.console import Console
@@ -33,6 +49,12 @@ from rich.syntax import Syntax
 from rich.style import Style
 from rich import box
 
+value_names_sink = contextvars.ContextVar("value_names_sink", default=None)
+"""If set to a set, names of hyperparameters given on the command line are
+collected there instead of in the parser, which leaves the parser state
+untouched. See :func:`.overlay.parse_overlay`.
+"""
+
 
 class StringAsDefault(str):
     """If a string is used as parser.add_argument(default=string),
@@ -88,11 +110,16 @@ def make_value_illu(v):
     return v
 
 
-def hp_list(mgr):
-    """Print hyperparameter settings to stdout"""
+def hp_list(mgr, catalog: Optional[HPCatalog] = None):
+    """Print hyperparameter settings to stdout
 
+    :param catalog: Catalog of `mgr` built before, if any.
+    """
+    if catalog is None:
+        catalog = HPCatalog(mgr)
+    active = catalog.refresh().active_values()
     syntax = Syntax(
-        "All hyperparameters:\n" + "    {}".format(sorted(mgr.get_values().keys())),
+        "All hyperparameters:\n" + "    {}".format(list(active)),
         "python",
         theme="monokai",
     )
@@ -143,15 +170,17 @@ def hp_list(mgr):
         )
         """
 
-    for node in sorted(mgr.tree.flatten(), key=lambda x: x.name):
+    for record in catalog:
+        if record.name not in active:
+            continue
         details = []
-        for i, oc in enumerate(sorted(node.db, key=lambda x: x.filename)):
+        for i, (filename, lineno) in enumerate(record.occurrences):
             # make context detail
             details.append(
                 {
                     "name": "occurrence[{}]".format(i),
                     "detail": SourceHelper.format_given_filepath_and_lineno(
-                        oc.filename, oc.lineno
+                        filename, lineno
                     ),
                 }
             )
@@ -159,10 +188,11 @@ def hp_list(mgr):
         # combine details
         detail_str = make_detail_str(details)
         detail_syntax = Syntax(detail_str, "python", theme="monokai")
+        value = record.value
         table.add_row(
-            node.name,
-            str(type(node.value).__name__),
-            str(make_value_illu(node.value)),
+            record.name,
+            str(type(value).__name__),
+            str(make_value_illu(value)),
             detail_syntax,
         )
 
@@ -176,24 +206,96 @@ def parse_action_list(inject_actions: Union[bool, List[str]]) -> List[str]:
     :return: a list of action names
     """
     if isinstance(inject_actions, bool):
-        inject_actions = {True: ["save", "load", "list", "detail"], False: []}[
-            inject_actions
-        ]
+        inject_actions = {
+            True: ["save", "load", "list", "detail", "help-group"],
+            False: [],
+        }[inject_actions]
     return inject_actions
 
 
+ARRAY_FILE_PREFIX = "@"
+
+
+def _is_ndarray(value):
+    # numpy is optional; if it has not been imported, there are no arrays
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def _is_array_file_ref(value):
+    return (
+        isinstance(value, str)
+        and value.startswith(ARRAY_FILE_PREFIX)
+        and value.endswith(".npy")
+    )
+
+
+# arrays up to this size are listed by their elements
+LIST_ARRAY_MAX_SIZE = 16
+
+
+def _listable_values(values):
+    """Replace arrays in `values` with something yaml and json can dump: a
+    memory map by a reference to its file, a small array by its elements
+    and others by a summary of shape and dtype.
+    """
+    if not any(_is_ndarray(v) for v in values.values()):
+        return values
+    new_values = {}
+    for k, v in values.items():
+        if _is_ndarray(v):
+            filename = getattr(v, "filename", None)
+            if filename is not None:
+                v = ARRAY_FILE_PREFIX + filename
+            elif v.size <= LIST_ARRAY_MAX_SIZE:
+                v = v.tolist()
+            else:
+                v = "<ndarray shape={} dtype={}>".format(v.shape, v.dtype)
+        new_values[k] = v
+    return new_values
+
+
+def _load_array_file(ref):
+    """Memory-map a `.npy` file referred by "@path/to/file.npy" """
+    import numpy as np
+
+    return np.load(loaders.resolve_uri(ref[len(ARRAY_FILE_PREFIX) :]), mmap_mode="r")
+
+
+def _array_type(s):
+    import numpy as np
+
+    if _is_array_file_ref(s):
+        return _load_array_file(s)
+    if isinstance(s, str):
+        s = ast.literal_eval(s)
+    return np.asarray(s)
+
+
+_array_type.__name__ = "ndarray"
+
+
 def _get_argument_type_by_value(value):
+    if _is_ndarray(value):
+        return _array_type
+
     typ = type(value)
     if isinstance(value, (list, dict)):
+        # a list can also be given by an array, e.g. `--weights @weights.npy`
+        accepts_array = typ is list
 
         def type_func(s):
-            if isinstance(s, typ):
+            if isinstance(s, typ) or (accepts_array and _is_ndarray(s)):
                 eval_val = s
+            elif accepts_array and _is_array_file_ref(s):
+                eval_val = _load_array_file(s)
             else:
                 assert isinstance(s, str), type(s)
                 eval_val = ast.literal_eval(s)
 
-            if not isinstance(eval_val, typ):
+            if not (
+                isinstance(eval_val, typ) or (accepts_array and _is_ndarray(eval_val))
+            ):
                 raise TypeError("value `{}` is not of type {}".format(eval_val, typ))
             return eval_val
 
@@ -216,6 +318,38 @@ def str2bool(v):
         raise argparse.ArgumentTypeError("Unsupported value encountered.")
 
 
+class _HelpGroupAction(argparse.Action):
+    """Print help of argument groups under a namespace and exit."""
+
+    def __init__(self, option_strings, dest, groups_by_prefix, separator, **kwargs):
+        super().__init__(option_strings, dest, default=argparse.SUPPRESS, **kwargs)
+        self.groups_by_prefix = groups_by_prefix
+        self.separator = separator
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        groups = self.groups_by_prefix.get(values)
+        if not groups:
+            parser.error(
+                "unknown hyperparameter namespace `{}`; available: {}".format(
+                    values,
+                    ", ".join(
+                        sorted(
+                            k for k in self.groups_by_prefix if self.separator not in k
+                        )
+                    ),
+                )
+            )
+
+        formatter = parser._get_formatter()
+        for group in groups:
+            formatter.start_section(group.title)
+            formatter.add_text(group.description)
+            formatter.add_arguments(group._group_actions)
+            formatter.end_section()
+        parser._print_message(formatter.format_help(), sys.stdout)
+        parser.exit()
+
+
 def inject_args(
     parser: argparse.ArgumentParser,
     hp_mgr: hpman.HyperParameterManager,
@@ -224,6 +358,7 @@ def inject_args(
     action_prefix: str,
     serial_format: str,
     show_defaults: bool,
+    catalog: Optional[HPCatalog] = None,
 ) -> argparse.ArgumentParser:
     """Inject hpman parsed hyperparameter settings into argparse arguments.
     Only a limited set of format are supported. See code for details.
@@ -235,6 +370,7 @@ def inject_args(
     :param action_prefix: Prefix for hpargparse related options
     :param serial_format: One of 'yaml' and 'pickle'
     :param show_defaults: Show default values
+    :param catalog: Catalog of `hp_mgr` built before, if any.
 
     :return: The injected parser.
     """
@@ -254,46 +390,56 @@ def inject_args(
             # the `parser.parse_args()` will run type(default) automaticly.
             # value_names_been_set should ignore these names.
             if not isinstance(string, StringAsDefault):
-                value_names_been_set.add(name)
+                sink = value_names_sink.get()
+                if sink is None:
+                    sink = value_names_been_set
+                sink.add(name)
             return func(string)
 
         return wrapper
 
-    def get_node_attr(node, attr_name):
-        for oc in node.db:
-            if hasattr(oc, attr_name):
-                return getattr(oc, attr_name)
-
-            if attr_name in oc.hints:
-                return oc.hints[attr_name]
-
-        return None
-
-    # add options for collected hyper-parameters
-    for node in hp_mgr.get_nodes():
-        k = get_node_attr(node, "name")
-        v = node.get().value
+    if catalog is None:
+        catalog = HPCatalog(hp_mgr)
+
+    # Hyperparameters named "a.b.c" are put into an argument group "a.b".
+    # groups_by_prefix maps each namespace prefix ("a" and "a.b") to the
+    # groups beneath it.
+    groups = {}
+    groups_by_prefix = collections.defaultdict(list)
+
+    def get_container(name):
+        namespace, sep, _ = name.rpartition(hp_mgr.separator)
+        if not sep:
+            return parser
+        if namespace not in groups:
+            group = parser.add_argument_group(namespace)
+            groups[namespace] = group
+            parts = namespace.split(hp_mgr.separator)
+            for i in range(1, len(parts) + 1):
+                groups_by_prefix[hp_mgr.separator.join(parts[:i])].append(group)
+        return groups[namespace]
+
+    def add_hyperparameter(record):
+        k = record.name
+        v = record.default
+        container = get_container(k)
 
         # this is just a simple hack
         option_name = "--{}".format(k.replace("_", "-"))
 
         value_type = _get_argument_type_by_value(v)
         type_str = value_type.__name__
-        help = (
-            get_node_attr(node, "help") or f"A {type_str} hyper-parameter named `{k}`."
-        )
-        choices = get_node_attr(node, "choices")
-        required = get_node_attr(node, "required")
+        help = record.help or f"A {type_str} hyper-parameter named `{k}`."
         other_kwargs = {
-            "choices": choices,
-            "required": required,
+            "choices": record.choices,
+            "required": record.required,
             "help": help,
         }
 
         if value_type == bool:
             # argparse does not directly support bool types.
             other_kwargs.update(choices=[True, False])
-            parser.add_argument(
+            container.add_argument(
                 option_name,
                 type=_make_value_names_been_set_injection(k, str2bool),
                 default=v,
@@ -304,7 +450,7 @@ def inject_args(
                 # if isinstance(v, str), mark as StringAsDefault
                 v = StringAsDefault(v)
 
-            parser.add_argument(
+            container.add_argument(
                 option_name,
                 type=_make_value_names_been_set_injection(
                     k, _get_argument_type_by_value(v)
@@ -313,6 +459,24 @@ def inject_args(
                 **other_kwargs,
             )
 
+    # add options for collected hyper-parameters; conditional ones are added
+    # at parse time if their conditions hold, see _activate_conditional
+    pending_conditional = {}
+    for record in catalog:
+        if record.condition is None:
+            add_hyperparameter(record)
+        else:
+            pending_conditional[record.name] = record
+
+    def activate(names):
+        for name in names:
+            record = pending_conditional.pop(name, None)
+            if record is not None:
+                add_hyperparameter(record)
+
+    parser._hpargparse_pending_conditional = pending_conditional
+    parser._hpargparse_activate = activate
+
     make_option = lambda name: "--{}-{}".format(action_prefix, name)
 
     for action in inject_actions:
@@ -348,11 +512,36 @@ def inject_args(
             parser.add_argument(
                 make_option("load"),
                 help=(
-                    "Load hyperparameters from a file. The hyperparameters"
+                    "Load hyperparameters from a file or URI. The hyperparameters"
                     " are loaded before any other options are processed"
                 ),
             )
 
+        elif action == "access-report":
+            parser.add_argument(
+                make_option("access-report"),
+                nargs="?",
+                const="-",
+                metavar="PATH",
+                help=(
+                    "Profile reads of hyperparameters and dump a JSON report"
+                    " to PATH, or stdout if PATH is omitted, at exit"
+                ),
+            )
+
+        elif action == "help-group":
+            parser.add_argument(
+                make_option("help-group"),
+                action=_HelpGroupAction,
+                groups_by_prefix=groups_by_prefix,
+                separator=hp_mgr.separator,
+                metavar="NAMESPACE",
+                help=(
+                    "Show help of hyperparameters under a namespace, e.g."
+                    " `model.backbone`, and exit"
+                ),
+            )
+
     if "load" in inject_actions or "save" in inject_actions:
         parser.add_argument(
             make_option("serial-format"),
@@ -388,6 +577,7 @@ def _infer_file_format(path):
         ".yml": "yaml",
         ".pickle": "pickle",
         ".pkl": "pickle",
+        ".jsonl": "journal",
     }
 
     if ext in supported_exts:
@@ -400,56 +590,215 @@ def _infer_file_format(path):
     )
 
 
-def hp_save(path: str, hp_mgr: hpman.HyperParameterManager, serial_format: str):
+def _save_arrays_to_sidecars(path, values):
+    """Save array values to `.npy` files next to `path`, and replace them
+    with "@file.npy" references.
+    """
+    if not any(_is_ndarray(v) for v in values.values()):
+        return values
+
+    import numpy as np
+
+    stem = os.path.splitext(path)[0]
+    new_values = {}
+    for k, v in values.items():
+        if _is_ndarray(v):
+            sidecar = "{}.{}.npy".format(stem, k)
+            # `v` may be a memory map of the sidecar itself, e.g. with
+            # `--hp-load c.yaml --hp-save c.yaml`; never write over it
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(sidecar) or ".", prefix=".tmp-", suffix=".npy"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, v)
+                os.replace(tmp_path, sidecar)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            v = ARRAY_FILE_PREFIX + os.path.basename(sidecar)
+        new_values[k] = v
+    return new_values
+
+
+def hp_save(
+    path: str,
+    hp_mgr: hpman.HyperParameterManager,
+    serial_format: str,
+    catalog: Optional[HPCatalog] = None,
+):
     """Save(serialize) hyperparamters.
 
     :param path: Where to save
     :param hp_mgr: The HyperParameterManager to be saved.
     :param serial_format: The saving format.
+    :param catalog: Catalog of `hp_mgr` built before, if any.
+
+    :note: In yaml format, NumPy arrays are saved to `.npy` sidecar files
+        named after `path` and referred as "@file.npy" in yaml, which are
+        memory-mapped by :func:`.hp_load`.
+    :note: Inactive conditional hyperparameters are not saved, see
+        :mod:`.conditions`.
 
     :see: :func:`.bind` for more detail.
     """
-    values = hp_mgr.get_values()
+    catalog = catalog_of(hp_mgr) if catalog is None else catalog.refresh()
+    values = catalog.active_values()
+    dump_values(path, values, serial_format, hp_mgr.separator)
+
+
+def _namespaces_of(names, separator):
+    """All proper prefixes of dotted names, e.g. {"a", "a.b"} for "a.b.c"."""
+    namespaces = set()
+    for name in names:
+        parts = name.split(separator)
+        for i in range(1, len(parts)):
+            namespaces.add(separator.join(parts[:i]))
+    return namespaces
+
+
+def _nest_values(values, separator):
+    """Convert {"a.b": 1, "a.c": 2} to {"a": {"b": 1, "c": 2}}. Values are
+    left flat if a name is also a namespace of another name."""
+    if not any(separator in k for k in values):
+        return values
+    if _namespaces_of(values, separator) & set(values):
+        return values
+
+    nested = {}
+    for k, v in values.items():
+        *namespaces, leaf = k.split(separator)
+        level = nested
+        for ns in namespaces:
+            level = level.setdefault(ns, {})
+        level[leaf] = v
+    return nested
+
+
+def flatten_values(values, names, separator):
+    """Inverse of :func:`._nest_values`, given the known hyperparameter
+    names. Both nested and flat keys are accepted."""
+    namespaces = _namespaces_of(names, separator)
+    flat = {}
+
+    def walk(level, prefix):
+        for k, v in level.items():
+            name = prefix + k
+            if name not in names and name in namespaces and isinstance(v, dict):
+                walk(v, name + separator)
+            else:
+                flat[name] = v
 
+    walk(values, "")
+    return flat
+
+
+def dump_values(path: str, values: dict, serial_format: str, separator: str = "."):
+    """Save a dict of hyperparameter values. See :func:`.hp_save`."""
     if serial_format == "auto":
-        serial_format = _infer_file_format(path)
+        # keep saving into a file that already carries embedded values
+        if container.has_block(path):
+            serial_format = "embedded"
+        else:
+            serial_format = _infer_file_format(path)
 
-    if serial_format == "yaml":
+    if serial_format == "embedded":
+        # the block is kept self-contained, so arrays are pickled
+        if any(_is_ndarray(v) for v in values.values()):
+            container.write_block(path, dill.dumps(values), "pickle")
+        else:
+            data = yaml.dump(_nest_values(values, separator)).encode("utf-8")
+            container.write_block(path, data, "yaml")
+    elif serial_format == "yaml":
+        values = _save_arrays_to_sidecars(path, values)
+        # namespaced names are saved as nested mappings
+        values = _nest_values(values, separator)
         with open(path, "w") as f:
             yaml.dump(values, f)
+    elif serial_format == "journal":
+        raise ValueError(
+            "Journals are written by hpargparse.journal.HPJournal: {}".format(path)
+        )
     else:
         assert serial_format == "pickle", serial_format
         with open(path, "wb") as f:
             dill.dump(values, f)
 
 
-def hp_load(path, hp_mgr, serial_format):
+def load_values(
+    path: str, serial_format: str, yaml_cache: Optional[YAMLCache] = None
+) -> dict:
+    """Load a dict of hyperparameter values. See :func:`.hp_load`."""
+    # journals can be loaded at a step: "journal.jsonl@step=12000"
+    step = None
+    m = journal.STEP_SUFFIX_RE.match(path)
+    if m:
+        path, step = m.group("path"), int(m.group("step"))
+
+    local_path = loaders.resolve_uri(path)
+    if serial_format == "auto":
+        # sniffing costs a read of the fixed-size footer
+        if container.has_block(local_path):
+            serial_format = "embedded"
+        else:
+            serial_format = _infer_file_format(loaders.get_uri_path(path))
+
+    if serial_format == "embedded":
+        block_format, data = container.read_block(local_path)
+        if block_format == "yaml":
+            values = yaml.safe_load(data.decode("utf-8"))
+        else:
+            values = dill.loads(data)
+    elif serial_format == "journal":
+        values = journal.replay_journal(local_path, step)
+    elif serial_format == "yaml":
+        if yaml_cache is not None:
+            values = yaml_cache.load(local_path)
+        else:
+            with open(local_path, "r") as f:
+                values = yaml.safe_load(f)
+    else:
+        assert serial_format == "pickle", serial_format
+        with open(local_path, "rb") as f:
+            values = dill.load(f)
+    return values
+
+
+def hp_load(
+    path,
+    hp_mgr,
+    serial_format,
+    yaml_cache: Optional[YAMLCache] = None,
+    catalog: Optional[HPCatalog] = None,
+):
     """Load(deserialize) hyperparamters.
 
-    :param path: Where to load
+    :param path: Where to load. Either a local path or a URI, see
+        :func:`.loaders.resolve_uri`.
     :param hp_mgr: The HyperParameterManager to be set.
     :param serial_format: The saving format.
+    :param yaml_cache: If given, yaml files are decoded through it.
+    :param catalog: Catalog of `hp_mgr` built before, if any.
 
     :see: :func:`.bind` for more detail.
     """
-    if serial_format == "auto":
-        serial_format = _infer_file_format(path)
+    values = load_values(path, serial_format, yaml_cache)
+    _set_loaded_values(values, path, hp_mgr, catalog)
 
-    if serial_format == "yaml":
-        with open(path, "r") as f:
-            values = yaml.safe_load(f)
-    else:
-        assert serial_format == "pickle", serial_format
-        with open(path, "rb") as f:
-            values = dill.load(f)
 
-    old_values = hp_mgr.get_values()
+def _set_loaded_values(values, path, hp_mgr, catalog):
+    """Second half of :func:`.hp_load`, given the values of file `path`."""
+    if catalog is None:
+        old_values = hp_mgr.get_values()
+    else:
+        old_values = catalog.refresh().values()
+    values = flatten_values(values, old_values, hp_mgr.separator)
     new_values = {}
     for k, v in values.items():
         if k in old_values:
-            old_v = old_values[k]
             try:
-                new_values[k] = _get_argument_type_by_value(old_v)(v)
+                new_values[k] = convert_loaded_value(old_values[k], v, path)
             except TypeError as e:
                 e.args = ("Error parsing hyperparameter `{}`".format(k),) + e.args
                 raise
@@ -457,6 +806,154 @@ def hp_load(path, hp_mgr, serial_format):
     hp_mgr.set_values(new_values)
 
 
+def convert_loaded_value(default, value, path: str):
+    """Convert a value loaded from a file to the type of a hyperparameter,
+    as :func:`.hp_load` does.
+
+    :param default: Current value of the hyperparameter.
+    :param path: The loaded file; array file references of arrays and lists
+        are relative to it.
+    """
+    # other types take such strings as they are
+    accepts_array = _is_ndarray(default) or type(default) is list
+    if accepts_array and _is_array_file_ref(value):
+        value = ARRAY_FILE_PREFIX + os.path.join(
+            os.path.dirname(path), value[len(ARRAY_FILE_PREFIX) :]
+        )
+    return _get_argument_type_by_value(default)(value)
+
+
+def _expand_abbrevs(argv: List[str], option_strings: Set[str]) -> List[str]:
+    """Replace unambiguous abbreviations of `option_strings` in `argv` with
+    the full option strings."""
+    index = None
+    expanded = []
+    for arg in argv:
+        option, eq, value = arg.partition("=")
+        if arg.startswith("--") and option not in option_strings:
+            if index is None:
+                index = OptionPrefixIndex(option_strings)
+            matches = index.with_prefix(option)
+            if len(matches) == 1:
+                arg = matches[0] + eq + value
+        expanded.append(arg)
+    return expanded
+
+
+def _activate_conditional(
+    parser: argparse.ArgumentParser,
+    hp_mgr: hpman.HyperParameterManager,
+    argv: List[str],
+    *,
+    load_option: str,
+    serial_format: str,
+    yaml_cache: Optional[YAMLCache],
+    catalog: HPCatalog,
+):
+    """First phase of parsing with conditional hyperparameters: find values
+    of controlling hyperparameters from the command line, the file to load
+    and defaults, in the order of precedence, and add options of conditional
+    hyperparameters that are active.
+
+    :return: a tuple of (path, serial_format, values) of the loaded file, to
+        be reused by the second phase; None if no file is loaded.
+    """
+    conds = catalog.conditions
+    values = catalog.values()
+
+    pre_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    for name in {k for cond in conds.values() for k in cond}:
+        if name not in values:
+            continue
+        v = values[name]
+        pre_parser.add_argument(
+            "--{}".format(name.replace("_", "-")),
+            dest=name,
+            type=str2bool if isinstance(v, bool) else _get_argument_type_by_value(v),
+            default=argparse.SUPPRESS,
+        )
+    if load_option is not None:
+        pre_parser.add_argument(load_option, dest="_hpargparse_load")
+        pre_parser.add_argument(
+            load_option.replace("-load", "-serial-format"),
+            dest="_hpargparse_serial_format",
+            default=serial_format,
+        )
+
+    # options after "--" are positional arguments
+    if "--" in argv:
+        argv = argv[: argv.index("--")]
+    if parser.allow_abbrev:
+        # resolve abbreviations against all options, as the main parser
+        # does; the pre-parser alone would match some of them wrongly
+        argv = _expand_abbrevs(
+            argv,
+            set(parser._option_string_actions)
+            | set(pre_parser._option_string_actions)
+            | {
+                "--{}".format(k.replace("_", "-"))
+                for k in parser._hpargparse_pending_conditional
+            },
+        )
+    known, _ = pre_parser.parse_known_args(argv)
+    known = vars(known)
+
+    load_value = known.pop("_hpargparse_load", None)
+    file_format = known.pop("_hpargparse_serial_format", serial_format)
+    preloaded = None
+    if load_value is not None:
+        raw = load_values(load_value, file_format, yaml_cache)
+        preloaded = (load_value, file_format, raw)
+        loaded = flatten_values(raw, values, hp_mgr.separator)
+        values.update((k, v) for k, v in loaded.items() if k in values)
+    values.update(known)
+
+    inactive = conditions.inactive_names(conds, values)
+    parser._hpargparse_activate(
+        [k for k in parser._hpargparse_pending_conditional if k not in inactive]
+    )
+    return preloaded
+
+
+def check_unknown_options(
+    parser: argparse.ArgumentParser,
+    extras: List[str],
+    option_index: NameIndex,
+    mode: str,
+    argv: Optional[List[str]] = None,
+):
+    """Report unrecognized `--` options with suggestions of known ones.
+
+    :param mode: 'suggest' to print to stderr, or 'error' to fail.
+    :param argv: The parsed arguments. If given, extras after a bare "--"
+        in it are positional and not reported.
+    """
+    options = None
+    if argv is not None and "--" in argv:
+        options = set(argv[: argv.index("--")])
+    messages = []
+    for arg in extras:
+        if not arg.startswith("--") or arg == "--":
+            continue
+        if options is not None and arg not in options:
+            continue
+        option = arg.split("=", 1)[0]
+        suggestions = option_index.suggest(option)
+        message = "unrecognized option `{}`".format(option)
+        if suggestions:
+            message += "; did you mean {}?".format(
+                " or ".join("`{}`".format(s) for s in suggestions)
+            )
+        messages.append(message)
+
+    if not messages:
+        return
+    if mode == "error":
+        parser.error("\n".join(messages))
+    for message in messages:
+        print("{}: {}".format(parser.prog, message), file=sys.stderr)
+
+
 def bind(
     parser: argparse.ArgumentParser,
     hp_mgr: hpman.HyperParameterManager,
@@ -465,6 +962,11 @@ def bind(
     action_prefix: str = config.HP_ACTION_PREFIX_DEFAULT,
     serial_format: str = config.HP_SERIAL_FORMAT_DEFAULT,
     show_defaults: bool = True,
+    distributed: bool = False,
+    help_cache: Union[bool, str] = False,
+    unknown_options: str = "ignore",
+    fast_option_lookup: bool = False,
+    yaml_cache: Union[bool, str] = False,
 ):
     """Bridging the gap between argparse and hpman. This is
         the most important method. Once bounded, hpargparse
@@ -474,8 +976,9 @@ def bind(
     :param hp_mgr: The hyperparameter manager from `hpman`. It is
         usually an 'underscore' variable obtained by `from hpman.m import _`
     :param inject_actions: A list of actions names to inject, or True, to
-        inject all available actions. Available actions are 'save', 'load',
-        'detail' and 'list'
+        inject all default actions. Available actions are 'save', 'load',
+        'detail', 'list', 'help-group', and 'access-report', which is not
+        injected by default.
     :param action_prefix: Prefix for options of hpargparse injected additional
         actions. e.g., the default action_prefix is 'hp'. Therefore, the
         command line options added by :func:`.bind` will be '--hp-save',
@@ -484,8 +987,38 @@ def bind(
         'auto'.  In most cases you need not to alter this argument as long as
         you give the right file extension when using save and load action. To
         be specific, '.yaml' and '.yml' would be deemed as yaml format, and
-        '.pickle' and '.pkl' would be seen as pickle format.
+        '.pickle' and '.pkl' would be seen as pickle format. 'embedded'
+        appends values to the end of any file, e.g. a checkpoint, from
+        which they are loaded without reading the rest of the file (see
+        :mod:`.container`); such files are detected in 'auto' format.
     :param show_defaults: Show the default value in help messages.
+    :param distributed: Coordinate multi-process launches. When the
+        `RANK` and `WORLD_SIZE` environment variables indicate more than one
+        process, only rank 0 loads, saves and lists hyperparameters; the
+        resolved values, and which conditional hyperparameters are active,
+        are then sent to other ranks through the rendezvous given by
+        `HPARGPARSE_RENDEZVOUS` (see :func:`.distributed.get_rendezvous`),
+        which parse the command line only after receiving them. Other ranks
+        exit along with rank 0 on `--hp-list`, `--hp-detail`, `--hp-exit`
+        and parse errors, silently, and raise
+        :class:`.distributed.BroadcastError` if rank 0 fails.
+    :param help_cache: Cache rendered help messages on disk, which saves
+        seconds of `-h` for parsers with thousands of options. True to use
+        the default cache directory, or a path of the directory. See
+        :func:`.help_cache.install_help_cache`.
+    :param unknown_options: How to treat unrecognized `--` options left by
+        `parse_known_args`. One of 'ignore', 'suggest' and 'error'. 'suggest'
+        prints the nearest known options to stderr, which also explains the
+        error raised by `parse_args`; 'error' fails even in
+        `parse_known_args`.
+    :param fast_option_lookup: Resolve abbreviated and unknown options
+        through a prefix index instead of scanning every option, for parsers
+        with tens of thousands of hyperparameters. See
+        :func:`.resolver.install_prefix_resolver`.
+    :param yaml_cache: Cache yaml files loaded by `--hp-load` in a binary
+        form, which skips yaml parsing for files loaded before. True to use
+        the default cache directory, or a path of the directory. See
+        :class:`.yaml_cache.YAMLCache`.
 
     :note: pickle is done by `dill` to support pickling of more types.
     """
@@ -493,55 +1026,199 @@ def bind(
     # make action list to be injected
     inject_actions = parse_action_list(inject_actions)
 
+    # shared by option injection, listing, saving and loading
+    catalog = HPCatalog(hp_mgr)
+    parser._hpargparse_catalog = catalog
+    # serializes parses of :func:`.overlay.parse_overlay`, which may run
+    # concurrently; parsing swaps and adds options of the parser
+    parser._hpargparse_parse_lock = threading.Lock()
+
     args_set_getter = inject_args(
         parser,
         hp_mgr,
+        catalog=catalog,
         inject_actions=inject_actions,
         action_prefix=action_prefix,
         serial_format=serial_format,
         show_defaults=show_defaults,
     )
 
+    if help_cache:
+        install_help_cache(parser, help_cache if isinstance(help_cache, str) else None)
+
+    if fast_option_lookup:
+        install_prefix_resolver(parser)
+
+    load_cache = None
+    if yaml_cache:
+        load_cache = YAMLCache(yaml_cache if isinstance(yaml_cache, str) else None)
+
+    if unknown_options not in ("ignore", "suggest", "error"):
+        raise ValueError("Unknown unknown_options: {}".format(unknown_options))
+
+    index_state = {"index": None, "num_options": None}
+
+    def get_option_index():
+        # options are added after bind, e.g. active conditional ones
+        num_options = len(parser._option_string_actions)
+        if index_state["num_options"] != num_options:
+            index_state["index"] = NameIndex(
+                k for k in parser._option_string_actions if k.startswith("--")
+            )
+            index_state["num_options"] = num_options
+        return index_state["index"]
+
+    def activate_conditional(argv):
+        if parser._hpargparse_pending_conditional:
+            return _activate_conditional(
+                parser,
+                hp_mgr,
+                argv,
+                load_option=(
+                    "--{}-load".format(action_prefix)
+                    if "load" in inject_actions
+                    else None
+                ),
+                serial_format=serial_format,
+                yaml_cache=load_cache,
+                catalog=catalog,
+            )
+
+    # also used by :func:`.overlay.parse_overlay`
+    parser._hpargparse_activate_conditional = activate_conditional
+
+    def resolve(self, argv, args, kwargs):
+        """Parse and resolve values on rank 0, or without `distributed`."""
+        preloaded = activate_conditional(argv)
+        args, extras = self._original_parse_known_args(argv, *args, **kwargs)
+        check_extras(self, argv, args, extras)
+
+        # apply all changes or none of them
+        with snapshot(hp_mgr) as snap:
+            # --hp-serial-format overrides the format given to bind
+            file_format = get_action_value(args, "serial_format") or serial_format
+            try:
+                # load saved hyperparameter instance
+                load_value = get_action_value(args, "load")
+                if "load" in inject_actions and load_value is not None:
+                    if preloaded is not None and preloaded[:2] == (
+                        load_value,
+                        file_format,
+                    ):
+                        # already loaded to find active conditional options
+                        _set_loaded_values(preloaded[2], load_value, hp_mgr, catalog)
+                    else:
+                        hp_load(load_value, hp_mgr, file_format, load_cache, catalog)
+
+                # set hyperparameters set from command lines
+                for k in self.__hpargparse_value_names_been_set():
+                    assert hasattr(args, k)
+                    t = getattr(args, k)
+                    if isinstance(t, StringAsDefault):
+                        t = str(t)
+                    hp_mgr.set_value(k, t)
+
+                save_value = get_action_value(args, "save")
+                if "save" in inject_actions and save_value is not None:
+                    hp_save(save_value, hp_mgr, file_format, catalog)
+            except BaseException:
+                snap.restore()
+                raise
+        return args, extras
+
+    def check_extras(self, argv, args, extras):
+        if unknown_options != "ignore" and extras:
+            check_unknown_options(
+                self, extras, get_option_index(), unknown_options, argv
+            )
+
+        report_value = get_action_value(args, "access_report")
+        if "access-report" in inject_actions and report_value is not None:
+            profiler = AccessProfiler(hp_mgr).install()
+            atexit.register(profiler.dump, report_value)
+
+    # actions not injected have no value
+    get_action_value = lambda args, name: getattr(
+        args, "{}_{}".format(action_prefix, name), None
+    )
+
     # hook parser.parse_known_args
     parser._original_parse_known_args = parser.parse_known_args
 
     def new_parse_known_args(self, *args, **kwargs):
-        args, extras = self._original_parse_known_args(*args, **kwargs)
-
-        get_action_value = lambda name: getattr(
-            args, "{}_{}".format(action_prefix, name)
-        )
-
-        # load saved hyperparameter instance
-        load_value = get_action_value("load")
-        if "load" in inject_actions and load_value is not None:
-            hp_load(load_value, hp_mgr, serial_format)
+        argv = args[0] if args else kwargs.pop("args", None)
+        argv = sys.argv[1:] if argv is None else list(argv)
+        args = args[1:]
+
+        rank, world_size = dist.get_rank_and_world_size() if distributed else (0, 1)
+        if world_size > 1:
+            rendezvous = dict(
+                world_size=world_size,
+                rendezvous=dist.get_rendezvous(),
+                launch_id=dist.get_launch_id(),
+            )
 
-        # set hyperparameters set from command lines
-        old_values = hp_mgr.get_values()
-        for k in self.__hpargparse_value_names_been_set():
-            v = old_values[k]
-            assert hasattr(args, k)
-            t = getattr(args, k)
-            if isinstance(t, StringAsDefault):
-                t = str(t)
-            hp_mgr.set_value(k, t)
-
-        save_value = get_action_value("save")
-        if "save" in inject_actions and save_value is not None:
-            hp_save(save_value, hp_mgr, serial_format)
+        if rank != 0:
+            # only rank 0 reads files; it sends the resolved values, whether
+            # to exit, and which conditional options are active
+            values, exit_code, active = dist.broadcast_object(
+                None, rank=rank, **rendezvous
+            )
+            if exit_code is not None:
+                sys.exit(exit_code)
+            parser._hpargparse_activate(active)
+            args, extras = self._original_parse_known_args(argv, *args, **kwargs)
+            check_extras(self, argv, args, extras)
+            hp_mgr.set_values(values)
+            return args, extras
+
+        try:
+            args, extras = resolve(self, argv, args, kwargs)
+        except BaseException as e:
+            if world_size > 1 and not isinstance(e, KeyboardInterrupt):
+                # let other ranks exit too rather than wait for values
+                try:
+                    if isinstance(e, SystemExit):
+                        dist.broadcast_object(
+                            (None, e.code, None), rank=0, **rendezvous
+                        )
+                    else:
+                        dist.broadcast_error(
+                            "{}: {}".format(type(e).__name__, e), **rendezvous
+                        )
+                except Exception:
+                    pass
+            raise
+
+        if world_size > 1:
+            will_exit = any(
+                name in inject_actions and get_action_value(args, name)
+                for name in ["detail", "list", "exit"]
+            )
+            active = [
+                k
+                for k in catalog.conditions
+                if k not in parser._hpargparse_pending_conditional
+            ]
+            dist.broadcast_object(
+                (hp_mgr.get_values(), 0 if will_exit else None, active),
+                rank=0,
+                **rendezvous,
+            )
 
         # `--hp-detail`` need to preceed `--hp-list`` because `--hp-list detail`
         # will be set by default.
-        if "detail" in inject_actions and get_action_value("detail"):
-            hp_list(hp_mgr)
+        if "detail" in inject_actions and get_action_value(args, "detail"):
+            hp_list(hp_mgr, catalog)
             sys.exit(0)
 
-        hp_list_value = get_action_value("list")
+        hp_list_value = get_action_value(args, "list")
         if "list" in inject_actions and hp_list_value is not None:
             if hp_list_value == "yaml":
                 syntax = Syntax(
-                    yaml.dump(hp_mgr.get_values()).replace("\n\n", "\n"),
+                    yaml.dump(
+                        _listable_values(catalog.refresh().active_values())
+                    ).replace("\n\n", "\n"),
                     "yaml",
                     theme="monokai",
                 )
@@ -549,17 +1226,19 @@ def bind(
                 console.print(syntax)
             elif hp_list_value == "json":
                 syntax = Syntax(
-                    json.dumps(hp_mgr.get_values()), "json", theme="monokai"
+                    json.dumps(_listable_values(catalog.refresh().active_values())),
+                    "json",
+                    theme="monokai",
                 )
                 console = Console()
                 console.print(syntax)
             else:
                 assert hp_list_value == "detail", hp_list_value
-                hp_list(hp_mgr)
+                hp_list(hp_mgr, catalog)
 
             sys.exit(0)
 
-        if inject_actions and get_action_value("exit"):
+        if inject_actions and get_action_value(args, "exit"):
             sys.exit(0)
 
         return args, extras
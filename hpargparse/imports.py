@@ -0,0 +1,203 @@
+"""Find modules of a project reachable from an entry module by following its
+imports statically, so that only those are parsed for hyperparameters.
+See :func:`.parse_reachable`."""
+
+import ast
+import json
+import os
+
+import hpman
+
+from . import config
+from .cache import DiskCache, make_key
+
+from typing import Dict, List, Optional
+
+
+def _module_name(path: str, root: str) -> str:
+    rel = os.path.splitext(os.path.relpath(path, root))[0]
+    parts = rel.split(os.sep)
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def _walk_statements(nodes):
+    """Statements, including nested ones, but not expressions, which cannot
+    contain imports; much faster than `ast.walk`."""
+    for node in nodes:
+        yield node
+        for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                yield from _walk_statements(children)
+
+
+def find_imports(source: str, module: str, is_package: bool) -> List[str]:
+    """Absolute names of modules imported anywhere in a source, including
+    imports inside functions. For `from a import b`, both `a` and `a.b` are
+    listed, since `b` may be a submodule.
+
+    :param module: Name of the module of the source, to resolve relative
+        imports.
+    :param is_package: Whether the source is an `__init__.py`.
+    """
+    package = module if is_package else module.rpartition(".")[0]
+    names = set()
+    for node in _walk_statements(ast.parse(source).body):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split(".") if package else []
+                if node.level - 1 > len(parts):
+                    continue  # beyond the project root
+                parts = parts[: len(parts) - (node.level - 1)]
+                if node.module:
+                    parts.append(node.module)
+                base = ".".join(parts)
+            else:
+                base = node.module
+            if base:
+                names.add(base)
+            for alias in node.names:
+                if alias.name != "*":
+                    names.add(base + "." + alias.name if base else alias.name)
+    return sorted(names)
+
+
+def _resolve(name: str, root: str) -> Optional[str]:
+    """Path of a module within root, or None for a module from elsewhere."""
+    base = os.path.join(root, *name.split("."))
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+class ImportGraph:
+    """Static imports of modules under a project root. Names of modules
+    imported by each module are kept in a single index per root, cached
+    on disk, with entries checked against the modification time and size of
+    each module; they are resolved to paths on every lookup, so that modules
+    created later are followed."""
+
+    def __init__(self, root: str, cache_dir: Optional[str] = None):
+        self.root = os.path.realpath(root)
+        self.cache = DiskCache(
+            os.path.join(cache_dir or config.HP_CACHE_DIR_DEFAULT, "imports"),
+            max_entries=1024,
+        )
+        # one file per root: reading and writing a file per module costs
+        # more than parsing it
+        self._key = make_key("index", self.root)
+        # path -> [mtime_ns, size, imported names]
+        self._index = {}  # type: Dict[str, list]
+        data = self.cache.get(self._key)
+        if data is not None:
+            try:
+                self._index = json.loads(data.decode("utf-8"))
+            except ValueError:
+                pass
+        self._dirty = False
+        # module name -> path, for this graph only, as modules may be
+        # created later
+        self._paths = {}  # type: Dict[str, Optional[str]]
+
+    def _resolve(self, name):
+        if name not in self._paths:
+            self._paths[name] = _resolve(name, self.root)
+        return self._paths[name]
+
+    def imported_names(self, path: str) -> List[str]:
+        """Absolute names of modules imported by the module at path."""
+        st = os.stat(path)
+        entry = self._index.get(path)
+        if entry is not None and entry[:2] == [st.st_mtime_ns, st.st_size]:
+            return entry[2]
+
+        with open(path, "rb") as f:
+            source = f.read()
+        names = find_imports(
+            source,
+            _module_name(path, self.root),
+            os.path.basename(path) == "__init__.py",
+        )
+        self._index[path] = [st.st_mtime_ns, st.st_size, names]
+        self._dirty = True
+        return names
+
+    def save(self):
+        """Write the index to the cache, if changed."""
+        if not self._dirty:
+            return
+        # forget modules removed since
+        index = {p: e for p, e in self._index.items() if os.path.exists(p)}
+        self.cache.put(self._key, json.dumps(index).encode("utf-8"))
+        self._dirty = False
+
+    def imports_of(self, path: str) -> List[str]:
+        """Paths of project modules imported by the module at path."""
+        paths = set()
+        for name in self.imported_names(path):
+            # importing a.b.c runs a/__init__.py and a/b/__init__.py as well
+            parts = name.split(".")
+            for i in range(1, len(parts) + 1):
+                p = self._resolve(".".join(parts[:i]))
+                if p is not None and p != path:
+                    paths.add(p)
+        return sorted(paths)
+
+    def reachable(self, entry: str) -> List[str]:
+        """Paths of modules reachable from entry, including itself."""
+        entry = os.path.realpath(entry)
+        seen = {entry}
+        stack = [entry]
+        while stack:
+            for p in self.imports_of(stack.pop()):
+                if p not in seen:
+                    seen.add(p)
+                    stack.append(p)
+        self.save()
+        return sorted(seen)
+
+
+def reachable_modules(
+    entry: str, root: Optional[str] = None, *, cache_dir: Optional[str] = None
+) -> List[str]:
+    """Paths of project modules reachable from `entry` by imports.
+
+    :param entry: Path of the entry module, usually `__file__` of the script.
+    :param root: The directory imports are resolved against, i.e. the one on
+        `sys.path`. Defaults to the directory of `entry`. Modules outside of
+        it are not followed.
+    :param cache_dir: Root cache directory. Defaults to
+        `config.HP_CACHE_DIR_DEFAULT`.
+    """
+    if root is None:
+        root = os.path.dirname(os.path.realpath(entry))
+    return ImportGraph(root, cache_dir).reachable(entry)
+
+
+def parse_reachable(
+    hp_mgr: hpman.HyperParameterManager,
+    entry: str,
+    root: Optional[str] = None,
+    *,
+    cache_dir: Optional[str] = None,
+) -> hpman.HyperParameterManager:
+    """Parse hyperparameters of modules reachable from `entry`, instead of
+    every file under a directory as `hp_mgr.parse_file(directory)` does.
+
+    .. code:: python
+
+        hpargparse.parse_reachable(_, __file__)
+
+    :note: It saves time when the entry reaches a small part of a large
+        tree; for a few modules, parsing the directory is as fast.
+    :note: Imports are found statically, so modules imported dynamically,
+        e.g. by `importlib.import_module(name)`, are not followed.
+
+    :see: :func:`.reachable_modules` for the parameters.
+    """
+    return hp_mgr.parse_file(reachable_modules(entry, root, cache_dir=cache_dir))
@@ -0,0 +1,133 @@
+import json
+import os
+import re
+import time
+
+import hpman
+
+from typing import Any, Dict, Iterator, Optional
+
+STEP_SUFFIX_RE = re.compile(r"^(?P<path>.*)@step=(?P<step>\d+)$")
+
+
+class HPJournal:
+    """An append-only JSON-lines journal of hyperparameter changes. Each
+    line is a record of `{"t": timestamp, "step": step, "key": name,
+    "value": value}`, so that jobs changing values mid-run (schedules, hot
+    fixes) write a line per change instead of a full config. Values at any
+    step can be rebuilt by :func:`.replay_journal`, or by
+    `--hp-load journal.jsonl@step=12000`.
+
+    .. code:: python
+
+        journal = HPJournal("hp.jsonl", _)
+        journal.record(step=0)  # the initial values
+        ...
+        journal.set_value("learning_rate", 1e-4, step=12000)
+    """
+
+    def __init__(self, path: str, hp_mgr: Optional[hpman.HyperParameterManager] = None):
+        """
+        :param path: Path of the journal. Appended if it exists.
+        :param hp_mgr: The manager whose changes are journaled. Required by
+            :meth:`set_value` and :meth:`record`.
+        """
+        self.path = path
+        self.hp_mgr = hp_mgr
+        self._last_values = replay_journal(path) if os.path.exists(path) else {}
+        self._file = open(path, "a")
+
+    def append(self, key: str, value: Any, step: Optional[int] = None):
+        """Append a record. Records without a step belong to the step of the
+        previous record."""
+        record = {"t": time.time(), "step": step, "key": key, "value": value}
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self._last_values[key] = value
+
+    def set_value(self, key: str, value: Any, step: Optional[int] = None):
+        """Set a value to the manager and journal it."""
+        self.hp_mgr.set_value(key, value)
+        self.append(key, value, step)
+
+    def record(self, step: Optional[int] = None):
+        """Journal all values of the manager that changed since the last
+        record, e.g. once per step when values are set elsewhere."""
+        for k, v in self.hp_mgr.get_values().items():
+            if k not in self._last_values or self._last_values[k] != v:
+                self.append(k, v, step)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """Iterate records of a journal, with the step of step-less records
+    filled from previous ones."""
+    step = None
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("step") is None:
+                record["step"] = step
+            step = record["step"]
+            yield record
+
+
+def replay_journal(path: str, step: Optional[int] = None) -> Dict[str, Any]:
+    """Rebuild values from a journal.
+
+    :param path: Path of the journal.
+    :param step: Only apply records up to this step. All records if None.
+    :return: dict of name to value.
+    """
+    values = {}
+    for record in read_journal(path):
+        if step is None or record["step"] is None or record["step"] <= step:
+            values[record["key"]] = record["value"]
+    return values
+
+
+def compact_journal(
+    path: str, out_path: Optional[str] = None, upto_step: Optional[int] = None
+):
+    """Collapse records up to a step into one record per key, stamped with
+    that step. Later records are kept as is, so replays at or after
+    `upto_step` are unchanged, while earlier steps can no longer be
+    replayed.
+
+    :param path: Path of the journal.
+    :param out_path: Where to write the compacted journal. Defaults to
+        replacing `path` atomically.
+    :param upto_step: Defaults to compacting all records, at the last step.
+    """
+    records = list(read_journal(path))
+    if upto_step is None:
+        steps = [r["step"] for r in records if r["step"] is not None]
+        upto_step = max(steps) if steps else None
+
+    snapshot = {}
+    rest = []
+    for record in records:
+        if upto_step is None or record["step"] is None or record["step"] <= upto_step:
+            snapshot[record["key"]] = record
+        else:
+            rest.append(record)
+
+    out_path = out_path or path
+    tmp_path = "{}.tmp-{}".format(out_path, os.getpid())
+    with open(tmp_path, "w") as f:
+        for record in snapshot.values():
+            record = dict(record, step=upto_step)
+            f.write(json.dumps(record) + "\n")
+        for record in rest:
+            f.write(json.dumps(record) + "\n")
+    os.replace(tmp_path, out_path)
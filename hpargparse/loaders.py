@@ -0,0 +1,207 @@
+import contextlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+from . import config
+from .cache import DiskCache
+
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+_loaders = {}  # type: Dict[str, Callable[[str], str]]
+
+
+def register_loader(scheme: str, loader: Callable[[str], str]):
+    """Register a loader for URIs of given scheme, e.g. "s3".
+
+    :param scheme: URI scheme, without "://".
+    :param loader: A callable that takes the URI and returns a local path
+        of the fetched file.
+    """
+    _loaders[scheme] = loader
+
+
+def get_uri_path(uri: str) -> str:
+    """The path component of a URI, or `uri` itself if it is a plain path.
+    Used to deduce file formats from extensions."""
+    if "://" not in uri:
+        return uri
+    rest = uri.split("://", 1)[1]
+    return rest.split("?", 1)[0].split("#", 1)[0]
+
+
+def resolve_uri(uri: str) -> str:
+    """Resolve a path or URI to a local path, fetching it if necessary.
+
+    :param uri: a local path, "file://" URI, or a URI of a registered scheme.
+        "http://" and "https://" are registered by default.
+    :return: a local path
+    """
+    if "://" not in uri:
+        return uri
+
+    scheme = uri.split("://", 1)[0]
+    if scheme == "file":
+        return urllib.parse.unquote(urllib.parse.urlparse(uri).path)
+    if scheme not in _loaders:
+        raise ValueError(
+            "Unsupported URI scheme: {}. Registered schemes: {}".format(
+                scheme, ", ".join(["file"] + sorted(_loaders))
+            )
+        )
+    return _loaders[scheme](uri)
+
+
+class HTTPLoader:
+    """Fetch files over HTTP(S) with keep-alive connections and an on-disk
+    cache validated by ETag or Last-Modified.
+
+    A cached file younger than `max_age` seconds is used without any request,
+    and fetches of the same URI are serialized by a file lock, so that many
+    workers on a node starting together download a file only once.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        *,
+        max_age: float = config.HP_URI_MAX_AGE,
+        offline: Optional[bool] = None,
+        timeout: float = 30,
+    ):
+        """
+        :param cache_dir: Defaults to "uri" under `config.HP_CACHE_DIR_DEFAULT`.
+        :param max_age: Seconds in which a cached file is used without
+            revalidation.
+        :param offline: Only use cached files. Defaults to whether environment
+            variable `HPARGPARSE_OFFLINE` is set to a non-empty value.
+        :param timeout: Timeout of connections in seconds.
+        """
+        self.cache = DiskCache(
+            cache_dir or os.path.join(config.HP_CACHE_DIR_DEFAULT, "uri")
+        )
+        self.max_age = max_age
+        self.offline = offline
+        self.timeout = timeout
+        self._idle_connections = {}  # type: Dict[tuple, List]
+        self._lock = threading.Lock()
+
+    def _is_offline(self):
+        if self.offline is not None:
+            return self.offline
+        return bool(os.environ.get(config.HP_OFFLINE_ENV))
+
+    @contextlib.contextmanager
+    def _connection(self, scheme, netloc):
+        key = (scheme, netloc)
+        with self._lock:
+            idle = self._idle_connections.setdefault(key, [])
+            conn = idle.pop() if idle else None
+        if conn is None:
+            cls = {
+                "http": http.client.HTTPConnection,
+                "https": http.client.HTTPSConnection,
+            }[scheme]
+            conn = cls(netloc, timeout=self.timeout)
+
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        with self._lock:
+            self._idle_connections[key].append(conn)
+
+    def _request(self, uri, headers):
+        parsed = urllib.parse.urlparse(uri)
+        target = parsed.path or "/"
+        if parsed.query:
+            target += "?" + parsed.query
+
+        for retry in range(2):
+            with self._connection(parsed.scheme, parsed.netloc) as conn:
+                try:
+                    conn.request("GET", target, headers=headers)
+                    resp = conn.getresponse()
+                    # read the whole body so the connection can be reused
+                    return resp.status, resp.headers, resp.read()
+                except (http.client.RemoteDisconnected, ConnectionError):
+                    # the server closed an idle keep-alive connection; a closed
+                    # connection reconnects on the next request
+                    conn.close()
+                    if retry:
+                        raise
+
+    @contextlib.contextmanager
+    def _file_lock(self, key):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.cache.directory, exist_ok=True)
+        with open(self.cache.path_of(key) + ".lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_meta(self, uri):
+        data = self.cache.get("meta:" + uri)
+        if data is None or not os.path.exists(self.cache.path_of(uri)):
+            return None
+        return json.loads(data.decode("utf-8"))
+
+    def _write_meta(self, uri, meta):
+        self.cache.put("meta:" + uri, json.dumps(meta).encode("utf-8"))
+
+    def __call__(self, uri: str) -> str:
+        path = self.cache.path_of(uri)
+
+        if self._is_offline():
+            if self._read_meta(uri) is None:
+                raise FileNotFoundError(
+                    "`{}` is not cached in offline mode".format(uri)
+                )
+            return path
+
+        with self._file_lock(uri):
+            meta = self._read_meta(uri)
+            if meta is not None and time.time() - meta["fetched_at"] < self.max_age:
+                return path
+
+            headers = {}
+            if meta is not None:
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+            status, resp_headers, body = self._request(uri, headers)
+            if status == 304 and meta is not None:
+                meta["fetched_at"] = time.time()
+            elif status == 200:
+                self.cache.put(uri, body)
+                meta = {
+                    "etag": resp_headers.get("ETag"),
+                    "last_modified": resp_headers.get("Last-Modified"),
+                    "fetched_at": time.time(),
+                }
+            else:
+                raise OSError("Failed to fetch {}: HTTP {}".format(uri, status))
+            self._write_meta(uri, meta)
+
+        return path
+
+
+http_loader = HTTPLoader()
+register_loader("http", http_loader)
+register_loader("https", http_loader)
@@ -0,0 +1,153 @@
+import contextlib
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import os
+
+import dill
+import hpman
+
+from . import config
+from .cache import DiskCache, make_key
+
+from typing import Callable, List, Optional
+
+
+def enable_read_recording(hp_mgr: hpman.HyperParameterManager):
+    """Make reads of `hp_mgr` append their names to the list recording
+    in the current context, if any. Called by :func:`.record_reads` on
+    demand; calling it again is a no-op.
+    """
+    if "_hpargparse_read_sink" in vars(hp_mgr):
+        return hp_mgr
+
+    sink = contextvars.ContextVar("hpargparse_read_sink", default=None)
+    hp_mgr._hpargparse_read_sink = sink
+    base_get_value = hp_mgr.get_value
+
+    def get_value(name, *args, **kwargs):
+        names = sink.get()
+        if names is not None:
+            names.append(name)
+        return base_get_value(name, *args, **kwargs)
+
+    hp_mgr.get_value = get_value
+    return hp_mgr
+
+
+@contextlib.contextmanager
+def record_reads(hp_mgr: hpman.HyperParameterManager):
+    """Record names of hyperparameters read through `hp_mgr.get_value`,
+    which is what `hp_mgr(name, ...)` calls under the hood, in the current
+    context only, i.e. the current thread or asyncio task. Reads recorded by
+    a nested call are also recorded by the outer one.
+
+    :return: a list of names being filled in read order, with duplicates.
+    """
+    enable_read_recording(hp_mgr)
+    sink = hp_mgr._hpargparse_read_sink
+    outer = sink.get()
+    names = []  # type: List[str]
+    token = sink.set(names)
+    try:
+        yield names
+    finally:
+        sink.reset(token)
+        if outer is not None:
+            outer.extend(names)
+
+
+def _function_source_hash(func: Callable) -> str:
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        code = func.__code__
+        source = repr((code.co_code, code.co_consts, code.co_names))
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def _dump_hp_values(hp_mgr, names):
+    values = []
+    for name in names:
+        v = hp_mgr.get_value(name, raise_exception=False)
+        if isinstance(v, hpman.EmptyValue):
+            v = "<empty>"
+        values.append((name, v))
+    return dill.dumps(values)
+
+
+def hp_memoize(
+    hp_mgr: hpman.HyperParameterManager,
+    *,
+    cache_dir: Optional[str] = None,
+    max_entries: Optional[int] = 256,
+    max_bytes: Optional[int] = None,
+):
+    """Cache results of an expensive function on disk, keyed by its
+    arguments, its source code, and the values of the hyperparameters it
+    reads. The set of relevant hyperparameters is recorded while the function
+    runs, so unrelated hyperparameters can change freely between runs
+    without invalidating the cache.
+
+    .. code:: python
+
+        @hpargparse.hp_memoize(_)
+        def get_data_and_labels(dataset_type):
+            ...
+
+    :param hp_mgr: The hyperparameter manager the function reads from.
+    :param cache_dir: Root cache directory. Defaults to
+        `config.HP_CACHE_DIR_DEFAULT`, which is `~/.cache/hpargparse` or
+        the value of environment variable `HPARGPARSE_CACHE_DIR`.
+    :param max_entries: Maximum number of cached results per function.
+    :param max_bytes: Maximum total size of cached results per function.
+
+    :note: Only reads through `hp_mgr(name, ...)` and `hp_mgr.get_value` are
+        recorded. Arguments and results are serialized by `dill`.
+    """
+
+    def decorator(func):
+        func_id = "{}.{}".format(func.__module__, func.__qualname__)
+        cache = DiskCache(
+            os.path.join(
+                cache_dir or config.HP_CACHE_DIR_DEFAULT, "memoize", make_key(func_id)
+            ),
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+        )
+        source_hash = _function_source_hash(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call_key = make_key(source_hash, dill.dumps((args, sorted(kwargs.items()))))
+            deps_key = make_key("deps", call_key)
+
+            deps_data = cache.get(deps_key)
+            deps = json.loads(deps_data.decode("utf-8")) if deps_data else None
+            if deps is not None:
+                data = cache.get(
+                    make_key("result", call_key, _dump_hp_values(hp_mgr, deps))
+                )
+                if data is not None:
+                    return dill.loads(data)
+
+            with record_reads(hp_mgr) as names:
+                result = func(*args, **kwargs)
+
+            # A different branch may have read different hyperparameters, so
+            # keep the union; a result keyed by a superset of what it read is
+            # still valid.
+            deps = sorted(set(names) | set(deps or []))
+            cache.put(deps_key, json.dumps(deps).encode("utf-8"))
+            cache.put(
+                make_key("result", call_key, _dump_hp_values(hp_mgr, deps)),
+                dill.dumps(result),
+            )
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,114 @@
+import argparse
+import contextlib
+import contextvars
+import types
+
+import hpman
+
+from . import conditions, hputils
+
+from typing import Dict, List, Mapping
+
+
+def enable_overlays(hp_mgr: hpman.HyperParameterManager):
+    """Make reads of `hp_mgr` check the overlay of the current context
+    first. Called by :func:`.overlay` on demand; calling it again is a no-op.
+    """
+    if "_hpargparse_overlay" in vars(hp_mgr):
+        return hp_mgr
+
+    var = contextvars.ContextVar("hpargparse_overlay", default=None)
+    hp_mgr._hpargparse_overlay = var
+    base_get_value = hp_mgr.get_value
+    base_get_values = hp_mgr.get_values
+
+    def get_value(name, *args, **kwargs):
+        values = var.get()
+        if values is not None and name in values:
+            return values[name]
+        return base_get_value(name, *args, **kwargs)
+
+    def get_values():
+        values = base_get_values()
+        overlay_values = var.get()
+        if overlay_values:
+            values.update(overlay_values)
+        return values
+
+    hp_mgr.get_value = get_value
+    hp_mgr.get_values = get_values
+    return hp_mgr
+
+
+@contextlib.contextmanager
+def overlay(hp_mgr: hpman.HyperParameterManager, values: Mapping):
+    """Override values of `hp_mgr` in the current context only, i.e. the
+    current thread or asyncio task, and the tasks it creates. On Python 3.6,
+    where asyncio does not propagate contexts, asyncio tasks share the
+    overlay of their thread.
+
+    .. code:: python
+
+        with hpargparse.overlay(_, {"beam_size": 8}):
+            handle_request()  # sees beam_size == 8; other requests do not
+
+    Overlays nest; an inner overlay is a copy of the outer one updated with
+    `values`, so the shared base and outer overlays are never written.
+    Reads take no locks.
+
+    :param hp_mgr: The shared manager.
+    :param values: dict of name to value.
+    """
+    enable_overlays(hp_mgr)
+    var = hp_mgr._hpargparse_overlay
+    merged = dict(var.get() or {})
+    merged.update(values)
+    token = var.set(types.MappingProxyType(merged))
+    try:
+        yield
+    finally:
+        var.reset(token)
+
+
+def parse_overlay(parser: argparse.ArgumentParser, argv: List[str]) -> Dict:
+    """Parse hyperparameter overrides with a parser bound by
+    :func:`.bind`, without applying them to the manager nor running
+    hpargparse actions. Safe to call from concurrent requests, as parses
+    with the same parser are serialized by a lock.
+
+    :param parser: A bound parser.
+    :param argv: Command line arguments, e.g. `["--beam-size", "8"]`.
+        Required arguments of the parser must be present.
+
+    :return: dict of name to value of hyperparameters given in `argv`,
+        suitable for :func:`.overlay`. Inactive conditional hyperparameters
+        are left out, see :mod:`.conditions`.
+    """
+    argv = list(argv)
+    names = set()
+    with parser._hpargparse_parse_lock:
+        parser._hpargparse_activate_conditional(argv)
+        token = hputils.value_names_sink.set(names)
+        try:
+            args, extras = parser._original_parse_known_args(argv)
+        finally:
+            hputils.value_names_sink.reset(token)
+
+    if extras:
+        parser.error("unrecognized arguments: {}".format(" ".join(extras)))
+
+    values = {}
+    for k in names:
+        v = getattr(args, k)
+        if isinstance(v, hputils.StringAsDefault):
+            v = str(v)
+        values[k] = v
+
+    # options activated by earlier calls may be inactive for this one
+    catalog = parser._hpargparse_catalog
+    if catalog.conditions:
+        merged = catalog.values()
+        merged.update(values)
+        inactive = conditions.inactive_names(catalog.conditions, merged)
+        values = {k: v for k, v in values.items() if k not in inactive}
+    return values
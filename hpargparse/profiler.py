@@ -0,0 +1,153 @@
+import array
+import collections
+import json
+import os
+import sys
+import time
+
+import hpman
+
+from typing import Dict, Optional
+
+_HPMAN_DIR = os.path.dirname(os.path.abspath(hpman.__file__))
+
+if hasattr(time, "perf_counter_ns"):
+    _perf_counter_ns = time.perf_counter_ns
+else:  # Python < 3.7
+
+    def _perf_counter_ns():
+        return int(time.perf_counter() * 1e9)
+
+
+class AccessProfiler:
+    """Count reads of hyperparameters through `hp_mgr.get_value`, which
+    `hp_mgr(name, ...)` calls under the hood. Every read is counted in a
+    compact array; one in `sample_every` reads is timed and attributed to
+    its call site. Nothing is wrapped until :meth:`install`, so a disabled
+    profiler costs nothing.
+    """
+
+    def __init__(self, hp_mgr: hpman.HyperParameterManager, sample_every: int = 16):
+        """
+        :param hp_mgr: The manager to be profiled.
+        :param sample_every: Time one read out of this many.
+        """
+        self.hp_mgr = hp_mgr
+        self.sample_every = sample_every
+        self._index = {}  # type: Dict[str, int]
+        self._names = []
+        self._counts = array.array("Q")
+        self._sampled_counts = array.array("Q")
+        self._sampled_ns = array.array("Q")
+        self._call_sites = collections.defaultdict(collections.Counter)
+        self._num_reads = 0
+        self._original = None
+        self._wrapper = None
+
+        # registered hyperparameters, reported as unread if never read
+        for name in hp_mgr.get_values():
+            self._add(name)
+
+    def _add(self, name):
+        i = len(self._names)
+        self._index[name] = i
+        self._names.append(name)
+        self._counts.append(0)
+        self._sampled_counts.append(0)
+        self._sampled_ns.append(0)
+        return i
+
+    @staticmethod
+    def _call_site():
+        frame = sys._getframe(2)
+        while frame is not None and (
+            frame.f_code.co_filename.startswith(_HPMAN_DIR)
+            or frame.f_code.co_filename == __file__
+        ):
+            frame = frame.f_back
+        if frame is None:
+            return "<unknown>"
+        return "{}:{}".format(frame.f_code.co_filename, frame.f_lineno)
+
+    def install(self):
+        """Start profiling."""
+        assert self._original is None, "already installed"
+        self._had_attr = "get_value" in vars(self.hp_mgr)
+        original = self._original = self.hp_mgr.get_value
+        index, counts = self._index, self._counts
+
+        def get_value(name, *args, **kwargs):
+            if self._original is None:
+                # uninstalled while wrapped by someone else; pass through
+                return original(name, *args, **kwargs)
+            i = index.get(name)
+            if i is None:
+                i = self._add(name)
+            counts[i] += 1
+            self._num_reads += 1
+            if self._num_reads % self.sample_every:
+                return original(name, *args, **kwargs)
+
+            start = _perf_counter_ns()
+            try:
+                return original(name, *args, **kwargs)
+            finally:
+                self._sampled_ns[i] += _perf_counter_ns() - start
+                self._sampled_counts[i] += 1
+                self._call_sites[name][self._call_site()] += 1
+
+        self._wrapper = self.hp_mgr.get_value = get_value
+        return self
+
+    def uninstall(self):
+        """Stop profiling."""
+        if self._original is None:
+            return
+        # `get_value` may have been wrapped again after installation, e.g.
+        # by :func:`.overlay`; then the wrapper stays, passing reads through
+        if vars(self.hp_mgr).get("get_value") is self._wrapper:
+            if self._had_attr:
+                self.hp_mgr.get_value = self._original
+            else:
+                del self.hp_mgr.get_value
+        self._original = self._wrapper = None
+
+    def report(self) -> dict:
+        """
+        :return: a JSON-serializable dict of per-hyperparameter read counts,
+            estimated read time, sampled call sites, and names never read.
+        """
+        hyperparameters = {}
+        for name, i in sorted(self._index.items()):
+            if not self._counts[i]:
+                continue
+            sampled = self._sampled_counts[i]
+            hyperparameters[name] = {
+                "reads": self._counts[i],
+                "sampled_reads": sampled,
+                "estimated_time_ns": (
+                    self._sampled_ns[i] * self._counts[i] // sampled
+                    if sampled
+                    else None
+                ),
+                "call_sites": dict(self._call_sites[name].most_common()),
+            }
+
+        return {
+            "total_reads": self._num_reads,
+            "sample_every": self.sample_every,
+            "hyperparameters": hyperparameters,
+            "unread": [
+                n for n, i in sorted(self._index.items()) if not self._counts[i]
+            ],
+        }
+
+    def dump(self, path: Optional[str] = None):
+        """Write :meth:`report` as JSON to `path`, or stdout if it is None or
+        "-"."""
+        text = json.dumps(self.report(), indent=2)
+        if path is None or path == "-":
+            print(text)
+        else:
+            with open(path, "w") as f:
+                f.write(text)
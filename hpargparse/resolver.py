@@ -0,0 +1,74 @@
+import argparse
+import bisect
+
+from types import MethodType
+
+from typing import List
+
+
+class OptionPrefixIndex:
+    """Prefix lookup of option strings. Keys are kept sorted, so all keys
+    with a given prefix form a contiguous range found by binary search. This
+    answers the same queries as a trie without allocating a node per
+    character, which matters with tens of thousands of options.
+    """
+
+    def __init__(self, option_strings):
+        # remember registration order, which argparse uses in error messages
+        self._order = {k: i for i, k in enumerate(option_strings)}
+        self._keys = sorted(self._order)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        """Keys starting with `prefix`, in registration order."""
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = lo
+        while hi < len(self._keys) and self._keys[hi].startswith(prefix):
+            hi += 1
+        return sorted(self._keys[lo:hi], key=self._order.__getitem__)
+
+
+def install_prefix_resolver(parser: argparse.ArgumentParser):
+    """Resolve abbreviated, "--opt=value" and unknown option strings
+    through an :class:`.OptionPrefixIndex` instead of scanning all options
+    of the parser.
+
+    Stock argparse compares an unmatched argument against every registered
+    option string, e.g. for `allow_abbrev` prefixes and negative numbers,
+    which is O(len(argv) x options). Here, the candidates are looked up first
+    and argparse's own matching runs on them only, so results and ambiguity
+    errors are exactly those of argparse.
+    """
+    original_get_option_tuples = parser._get_option_tuples
+    state = {"index": None}
+
+    def get_index(self):
+        index = state["index"]
+        # options may be added after installation; they are never removed
+        # except by conflict_handler="resolve", which replaces them
+        if index is None or len(index) != len(self._option_string_actions):
+            index = OptionPrefixIndex(list(self._option_string_actions))
+            state["index"] = index
+        return index
+
+    def _get_option_tuples(self, option_string):
+        index = get_index(self)
+        prefix = option_string.split("=", 1)[0]
+        candidates = index.with_prefix(prefix)
+        short_option = option_string[:2]
+        if short_option in self._option_string_actions:
+            candidates.append(short_option)
+
+        all_actions = self._option_string_actions
+        self._option_string_actions = {
+            k: all_actions[k] for k in candidates if k in all_actions
+        }
+        try:
+            return original_get_option_tuples(option_string)
+        finally:
+            self._option_string_actions = all_actions
+
+    parser._get_option_tuples = MethodType(_get_option_tuples, parser)
+    return parser
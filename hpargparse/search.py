@@ -0,0 +1,328 @@
+"""A local hyperparameter search with asynchronous successive halving
+(ASHA). Trials are commands run as subprocesses with sampled hyperparameters
+given as command line options, and report metrics by :func:`.report`. A
+trial falling behind the others at a rung is stopped early.
+
+.. code:: python
+
+    # in the training script, after hpargparse.bind(parser, _)
+    for epoch in range(_("num_epochs", 27)):
+        ...
+        hpargparse.report(epoch + 1, loss=loss)
+
+.. code:: bash
+
+    hpcli search --state search.json --trials 64 --jobs 4 \\
+        --metric loss --max-resource 27 -- python train.py
+"""
+
+import concurrent.futures
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+
+from .conditions import inactive_names
+
+from typing import Dict, List, Optional
+
+REPORT_PREFIX = "HPARGPARSE_REPORT "
+"""Prefix of a report line on the stdout of a trial."""
+
+
+def report(step: int, **metrics):
+    """Report metrics of a trial at a step, e.g. an epoch, to the search
+    driver. It does nothing other than printing a line, so it is safe to
+    call when not run by the driver."""
+    sys.stdout.write(REPORT_PREFIX + json.dumps({"step": step, **metrics}) + "\n")
+    sys.stdout.flush()
+
+
+def parse_report(line: str) -> Optional[dict]:
+    """Parse a line of output of a trial, or return None if not a report."""
+    if not line.startswith(REPORT_PREFIX):
+        return None
+    try:
+        data = json.loads(line[len(REPORT_PREFIX) :])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) and "step" in data else None
+
+
+def search_space(spec: Dict[str, dict], names: Optional[List[str]] = None) -> dict:
+    """Derive a search space from :func:`.validate.build_spec`.
+
+    Hyperparameters with a `choices` or `range` hint are searched. Given
+    `names`, only those are searched, and bools are searched over True and
+    False without hints.
+
+    :return: a dict of name to ("choice", list) or ("uniform"|"int", lo, hi)
+    """
+    space = {}
+    for k, s in spec.items():
+        if names is not None and k not in names:
+            continue
+        default = s["default"]
+        if s["choices"] is not None:
+            space[k] = ("choice", list(s["choices"]))
+        elif s["range"] is not None and isinstance(default, (int, float)):
+            lo, hi = s["range"]
+            if math.isinf(lo) or math.isinf(hi):
+                raise ValueError("range of `{}` must be bounded to search".format(k))
+            kind = "int" if isinstance(default, int) else "uniform"
+            space[k] = (kind, lo, hi)
+        elif isinstance(default, bool) and names is not None:
+            space[k] = ("choice", [True, False])
+        elif names is not None:
+            raise ValueError(
+                "`{}` has neither choices nor range hint to search".format(k)
+            )
+    if names is not None:
+        missing = set(names) - set(space)
+        if missing:
+            raise ValueError("unknown hyperparameters: {}".format(sorted(missing)))
+    return space
+
+
+def sample(
+    space: dict, rng: random.Random, spec: Optional[Dict[str, dict]] = None
+) -> dict:
+    """Sample values from a search space.
+
+    :param spec: If given, inactive conditional hyperparameters are dropped
+        from the sample, see :mod:`.conditions`.
+    """
+    params = {}
+    for k in sorted(space):
+        kind, *args = space[k]
+        if kind == "choice":
+            params[k] = rng.choice(args[0])
+        elif kind == "int":
+            params[k] = rng.randint(int(args[0]), int(args[1]))
+        else:
+            params[k] = rng.uniform(args[0], args[1])
+
+    conds = {k: s["condition"] for k, s in (spec or {}).items() if s["condition"]}
+    if conds:
+        values = {k: s["default"] for k, s in spec.items()}
+        values.update(params)
+        inactive = inactive_names(conds, values)
+        params = {k: v for k, v in params.items() if k not in inactive}
+    return params
+
+
+def format_options(params: dict) -> List[str]:
+    """Command line options setting params, in the way :func:`.bind` names
+    them."""
+    argv = []
+    for k, v in sorted(params.items()):
+        argv.append("--{}".format(k.replace("_", "-")))
+        argv.append(repr(v) if isinstance(v, (list, dict)) else str(v))
+    return argv
+
+
+class ASHAScheduler:
+    """Decide whether a trial continues at rungs `min_resource * eta ** k`
+    below `max_resource`: a trial reaching a rung continues only if it is in
+    the top `1 / eta` of all trials that have reached the rung so far.
+    Trials are never paused, so a continued trial is promoted implicitly.
+    """
+
+    def __init__(
+        self,
+        min_resource: float = 1,
+        max_resource: float = 81,
+        eta: int = 3,
+        mode: str = "min",
+    ):
+        assert eta >= 2, eta
+        assert mode in ("min", "max"), mode
+        self.eta = eta
+        self.mode = mode
+        self.rungs = []  # type: List[float]
+        r = min_resource
+        while r < max_resource:
+            self.rungs.append(r)
+            r *= eta
+
+    def _better(self, a, b):
+        return a < b if self.mode == "min" else a > b
+
+    def on_report(self, trials: List[dict], trial: dict, step: float, value) -> bool:
+        """Record a report of a trial into its `rungs`.
+
+        :param trials: All trials, each a dict with a `rungs` dict mapping
+            str(rung) to the metric reached there.
+        :return: whether the trial should continue
+        """
+        for rung in self.rungs:
+            if step < rung:
+                break
+            key = str(rung)
+            if key in trial["rungs"]:
+                continue
+            trial["rungs"][key] = value
+            recorded = [t["rungs"][key] for t in trials if key in t["rungs"]]
+            if len(recorded) < self.eta:
+                continue
+            recorded.sort(reverse=self.mode == "max")
+            cutoff = recorded[len(recorded) // self.eta - 1]
+            if self._better(cutoff, value):
+                return False
+        return True
+
+
+class SearchDriver:
+    """Run a search and keep its state in a JSON file, so that an
+    interrupted search is resumed by running it again with the same state
+    file. Trials running at the interruption are run again from scratch.
+
+    Lines a trial prints other than reports are forwarded to stderr, as
+    stdout of `hpcli search` is the best trial; stderr of a trial is written
+    to `<state_path>.logs/<id>.stderr`, recorded as `stderr` of the trial.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        space: dict,
+        state_path: str,
+        *,
+        num_trials: int,
+        jobs: int,
+        metric: str,
+        scheduler: ASHAScheduler,
+        seed: int = 0,
+        spec: Optional[Dict[str, dict]] = None,
+    ):
+        self.command = list(command)
+        self.space = space
+        self.state_path = state_path
+        self.num_trials = num_trials
+        self.jobs = jobs
+        self.metric = metric
+        self.scheduler = scheduler
+        self.seed = seed
+        self.spec = spec
+        self.lock = threading.Lock()
+        self.trials = self._load_state()
+
+    def _load_state(self) -> List[dict]:
+        if not os.path.exists(self.state_path):
+            return []
+        with open(self.state_path) as f:
+            state = json.load(f)
+        return state["trials"]
+
+    def _reset_interrupted(self):
+        # their metrics would otherwise count in cutoffs of other trials
+        for t in self.trials:
+            if t["status"] == "running":
+                t.update(status="pending", rungs={}, last=None)
+
+    def _save_state(self):
+        state = {
+            "command": self.command,
+            "metric": self.metric,
+            "mode": self.scheduler.mode,
+            "trials": self.trials,
+        }
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp_path, self.state_path)
+
+    def _new_trial(self, trial_id: int) -> dict:
+        # seeded by id, so a resumed search samples the same trials
+        rng = random.Random("{}-{}".format(self.seed, trial_id))
+        return {
+            "id": trial_id,
+            "params": sample(self.space, rng, self.spec),
+            "status": "pending",
+            "rungs": {},
+            "last": None,
+        }
+
+    def _run_trial(self, trial: dict):
+        with self.lock:
+            trial["status"] = "running"
+            self._save_state()
+        argv = self.command + format_options(trial["params"])
+        env = dict(os.environ, HPARGPARSE_TRIAL_ID=str(trial["id"]))
+        log_dir = self.state_path + ".logs"
+        os.makedirs(log_dir, exist_ok=True)
+        stderr_path = os.path.join(log_dir, "{}.stderr".format(trial["id"]))
+        with open(stderr_path, "w") as stderr:
+            proc = subprocess.Popen(
+                argv,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                env=env,
+                universal_newlines=True,
+            )
+        with self.lock:
+            trial["stderr"] = stderr_path
+        stopped = False
+        for line in proc.stdout:
+            data = parse_report(line)
+            if data is None:
+                sys.stderr.write(
+                    "[trial {}] {}\n".format(trial["id"], line.rstrip("\n"))
+                )
+                continue
+            if self.metric not in data:
+                continue
+            with self.lock:
+                trial["last"] = data
+                keep = self.scheduler.on_report(
+                    self.trials, trial, data["step"], data[self.metric]
+                )
+                self._save_state()
+            if not keep:
+                stopped = True
+                proc.terminate()
+                break
+        proc.stdout.close()
+        code = proc.wait()
+        with self.lock:
+            if stopped:
+                trial["status"] = "stopped"
+            else:
+                trial["status"] = "completed" if code == 0 else "failed"
+            self._save_state()
+
+    def run(self) -> List[dict]:
+        """Run until all trials finish.
+
+        :return: all trials
+        """
+        with self.lock:
+            self._reset_interrupted()
+            while len(self.trials) < self.num_trials:
+                self.trials.append(self._new_trial(len(self.trials)))
+            pending = [t for t in self.trials if t["status"] == "pending"]
+            self._save_state()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for f in [executor.submit(self._run_trial, t) for t in pending]:
+                f.result()
+        return self.trials
+
+    def best(self) -> Optional[dict]:
+        """The completed trial with the best last metric."""
+        done = [
+            t
+            for t in self.trials
+            if t["status"] == "completed"
+            and t["last"] is not None
+            and self.metric in t["last"]
+        ]
+        if not done:
+            return None
+        sign = 1 if self.scheduler.mode == "min" else -1
+        return min(done, key=lambda t: sign * t["last"][self.metric])
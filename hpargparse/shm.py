@@ -0,0 +1,163 @@
+import os
+import struct
+import sys
+import types
+
+import dill
+import hpman
+
+from . import config
+
+from typing import Mapping, Optional
+
+_HEADER = struct.Struct("<Q")
+
+# names of segments exported by this process
+_exported_names = set()
+
+
+def _shared_memory_module():
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise RuntimeError("Sharing hyperparameters requires Python 3.8 or newer")
+    return shared_memory
+
+
+def _open_shared_memory(name: str):
+    shared_memory = _shared_memory_module()
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    import multiprocessing
+
+    shm = shared_memory.SharedMemory(name=name)
+    # Attaching registers the segment to the resource tracker, which unlinks
+    # it when the processes using the tracker exit. Processes started by
+    # multiprocessing, with any start method, share the tracker of their
+    # parent, where the registration of the exporter must be kept. Other
+    # processes, e.g. started by a launcher, run their own tracker.
+    if name not in _exported_names and multiprocessing.parent_process() is None:
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
+class SharedValues:
+    """Handle of exported hyperparameter values in shared memory. The
+    exporting process owns the segment and should call :meth:`unlink` (or
+    use the handle as a context manager) once all children have attached.
+    """
+
+    def __init__(self, shm, env_name: Optional[str]):
+        self._shm = shm
+        self._env_name = env_name
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory segment, to be passed to
+        :func:`.attach_shared`."""
+        return self._shm.name
+
+    def close(self):
+        self._shm.close()
+
+    def unlink(self):
+        """Release the segment. Children that have already attached keep
+        their values."""
+        self.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        _exported_names.discard(self.name)
+        if self._env_name and os.environ.get(self._env_name) == self.name:
+            del os.environ[self._env_name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+
+def export_shared(
+    hp_mgr: hpman.HyperParameterManager,
+    name: Optional[str] = None,
+    *,
+    env_name: Optional[str] = config.HP_SHM_NAME_ENV,
+) -> SharedValues:
+    """Export the resolved hyperparameter values into a read-only shared
+    memory snapshot. This is usually done after `parser.parse_args()` and
+    before forking DataLoader workers or creating a process pool.
+
+    :param hp_mgr: The hyperparameter manager to be exported.
+    :param name: Name of the shared memory segment. A random one is chosen
+        if not given.
+    :param env_name: If not None, the segment name is put into this
+        environment variable so that child processes, which inherit the
+        environment, can call :func:`.attach_shared` without arguments.
+
+    :return: a :class:`.SharedValues` handle.
+
+    :note: Requires Python 3.8 or newer.
+    """
+    shared_memory = _shared_memory_module()
+
+    payload = dill.dumps(hp_mgr.get_values())
+    shm = shared_memory.SharedMemory(
+        name=name, create=True, size=_HEADER.size + len(payload)
+    )
+    _HEADER.pack_into(shm.buf, 0, len(payload))
+    shm.buf[_HEADER.size : _HEADER.size + len(payload)] = payload
+
+    _exported_names.add(shm.name)
+    if env_name:
+        os.environ[env_name] = shm.name
+    return SharedValues(shm, env_name)
+
+
+def attach_shared(
+    hp_mgr: Optional[hpman.HyperParameterManager] = None,
+    name: Optional[str] = None,
+    *,
+    env_name: str = config.HP_SHM_NAME_ENV,
+) -> Mapping:
+    """Attach to values exported by :func:`.export_shared`, typically in a
+    child process.
+
+    :param hp_mgr: If given, the values are set to this manager.
+    :param name: Name of the shared memory segment. Defaults to the value
+        of environment variable `env_name`.
+    :param env_name: See `name`.
+
+    :return: a read-only mapping of hyperparameter names to values.
+
+    :note: Only the serialized snapshot is shared. Each attaching process
+        deserializes its own copy of the values, which costs time and memory
+        in proportion to their size, e.g. of large arrays.
+    """
+    if name is None:
+        name = os.environ.get(env_name)
+        if not name:
+            raise KeyError(
+                "No shared hyperparameters: environment variable `{}` is not set".format(
+                    env_name
+                )
+            )
+
+    shm = _open_shared_memory(name)
+    try:
+        (size,) = _HEADER.unpack_from(shm.buf, 0)
+        values = dill.loads(bytes(shm.buf[_HEADER.size : _HEADER.size + size]))
+    finally:
+        shm.close()
+
+    if hp_mgr is not None:
+        hp_mgr.set_values(values)
+    return types.MappingProxyType(values)
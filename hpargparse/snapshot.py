@@ -0,0 +1,134 @@
+import hpman
+
+from .freeze import is_frozen
+
+from typing import Dict, List, Optional
+
+
+class HPSnapshot:
+    """A snapshot of values of a manager, taken lazily: the prior state of a
+    hyperparameter is copied only when it is first written through a setter
+    (`set_value`, `set_values` or `set_tree`) after the snapshot is taken.
+    Both taking and restoring a snapshot cost O(changed keys), which makes
+    resets between trials of an in-process sweep cheap.
+
+    .. code:: python
+
+        with hpargparse.snapshot(_) as snap:
+            for trial in trials:
+                _.set_values(trial)
+                run()
+                snap.restore()
+    """
+
+    def __init__(self, hp_mgr: hpman.HyperParameterManager):
+        self.hp_mgr = hp_mgr
+        # name -> occurrences of its node, or None if it had no node
+        self._saved = {}  # type: Dict[str, Optional[List]]
+        _install_hooks(hp_mgr)
+        hp_mgr._hpargparse_snapshots.append(self)
+
+    def _capture(self, name):
+        if name in self._saved:
+            return
+        tree = self.hp_mgr.tree.get(name)
+        if tree is None or tree.node is None:
+            self._saved[name] = None
+        else:
+            self._saved[name] = list(tree.node._db)
+
+    @property
+    def changed(self) -> List[str]:
+        """Names written since the snapshot or the last restore."""
+        return sorted(self._saved)
+
+    def restore(self):
+        """Restore the values at the time of the snapshot. The snapshot stays
+        active and can be restored again."""
+        for name, db in self._saved.items():
+            tree = self.hp_mgr.tree.get(name)
+            if tree is None:
+                continue
+            if db is None:
+                tree.node = None
+                _prune(self.hp_mgr.tree, name.split(self.hp_mgr.tree.sep))
+            else:
+                tree.node._db = list(db)
+        self._saved.clear()
+
+    def release(self):
+        """Stop tracking changes. The current values are kept."""
+        snapshots = self.hp_mgr._hpargparse_snapshots
+        if self in snapshots:
+            snapshots.remove(self)
+        if not snapshots:
+            _uninstall_hooks(self.hp_mgr)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _prune(tree, route):
+    """Remove empty subtrees along route, deepest first."""
+    if not route:
+        return
+    child = tree.children.get(route[0])
+    if child is None:
+        return
+    _prune(child, route[1:])
+    if child.node is None and not child.children:
+        del tree.children[route[0]]
+
+
+def _install_hooks(hp_mgr):
+    if "_hpargparse_snapshots" in vars(hp_mgr):
+        return
+    hp_mgr._hpargparse_snapshots = []
+    snapshots = hp_mgr._hpargparse_snapshots
+    set_value = hp_mgr.set_value
+    set_values = hp_mgr.set_values
+
+    def capture(names):
+        for snap in snapshots:
+            for name in names:
+                snap._capture(name)
+
+    # the manager may be frozen after the hooks are installed, and these
+    # take precedence over the setters of the frozen class
+    def new_set_value(name, value):
+        if is_frozen(hp_mgr):
+            hp_mgr._raise_frozen()
+        capture([name])
+        return set_value(name, value)
+
+    def new_set_values(values):
+        if is_frozen(hp_mgr):
+            hp_mgr._raise_frozen()
+        capture(values)
+        return set_values(values)
+
+    # set_tree goes through set_values
+    hp_mgr.set_value = new_set_value
+    hp_mgr.set_values = new_set_values
+
+
+def _uninstall_hooks(hp_mgr):
+    if "_hpargparse_snapshots" not in vars(hp_mgr):
+        return
+    del hp_mgr._hpargparse_snapshots
+    del hp_mgr.set_value
+    del hp_mgr.set_values
+
+
+def snapshot(hp_mgr: hpman.HyperParameterManager) -> HPSnapshot:
+    """Take a snapshot of `hp_mgr`. See :class:`.HPSnapshot`."""
+    return HPSnapshot(hp_mgr)
+
+
+def restore(snap: HPSnapshot):
+    """Restore `hp_mgr` to the state of a snapshot. See
+    :meth:`.HPSnapshot.restore`."""
+    snap.restore()
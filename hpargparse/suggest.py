@@ -0,0 +1,123 @@
+import collections
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Levenshtein distance between two strings.
+
+    :param max_distance: If given, only distances up to it are computed
+        exactly; any greater distance is returned as `max_distance + 1`,
+        which is much faster for dissimilar strings.
+    """
+    # a common prefix and suffix never need edits, and names sharing a
+    # namespace have long ones
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start : len(a) - end], b[start : len(b) - end]
+
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is None:
+        max_distance = len(a)
+    inf = max_distance + 1
+    if len(a) - len(b) > max_distance:
+        return inf
+
+    # only cells within max_distance of the diagonal can stay within it
+    prev = [j if j <= max_distance else inf for j in range(len(b) + 1)]
+    for i, ca in enumerate(a, 1):
+        cur = [inf] * (len(b) + 1)
+        cur[0] = best = i if i <= max_distance else inf
+        for j in range(max(1, i - max_distance), min(len(b), i + max_distance) + 1):
+            d = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < d:
+                d = prev[j] + 1
+            if cur[j - 1] + 1 < d:
+                d = cur[j - 1] + 1
+            cur[j] = d
+            if d < best:
+                best = d
+        if best > max_distance:
+            return inf
+        prev = cur
+    return min(prev[-1], inf)
+
+
+class NameIndex:
+    """An n-gram index for fuzzy lookup of names, built once and queried
+    many times. Candidates sharing enough n-grams with the query are
+    collected from posting lists and verified by a bounded
+    :func:`.edit_distance`, most shared first, and the bound tightens as
+    suggestions are found, so queries stay fast with 100k names even when
+    they share namespaces.
+    """
+
+    def __init__(self, names: Iterable[str], n: int = 3):
+        self.n = n
+        self.names = sorted(set(names))
+        self._postings = collections.defaultdict(list)  # type: Dict[str, List[int]]
+        for i, name in enumerate(self.names):
+            for gram in set(self._grams(name)):
+                self._postings[gram].append(i)
+
+    def _grams(self, s):
+        s = "^{}$".format(s)
+        return [s[i : i + self.n] for i in range(max(1, len(s) - self.n + 1))]
+
+    def suggest(
+        self, query: str, max_distance: Optional[int] = None, limit: int = 3
+    ) -> List[str]:
+        """Find names close to `query`.
+
+        :param query: The (mistyped) name.
+        :param max_distance: Maximum edit distance. Defaults to a quarter of
+            the query length, bounded to [1, 3].
+        :param limit: Maximum number of suggestions.
+
+        :return: names sorted by edit distance, nearest first.
+        """
+        if max_distance is None:
+            max_distance = max(1, min(3, len(query) // 4))
+
+        grams = set(self._grams(query))
+        counts = collections.Counter()
+        for gram in grams:
+            counts.update(self._postings.get(gram, ()))
+
+        results = []  # type: List[Tuple[int, str]]
+
+        def verify(name):
+            nonlocal max_distance
+            if abs(len(name) - len(query)) > max_distance:
+                return
+            d = edit_distance(query, name, max_distance)
+            if d > max_distance:
+                return
+            results.append((d, name))
+            if len(results) >= limit:
+                # no need to look further than the worst of the best so far
+                results.sort()
+                del results[limit:]
+                max_distance = results[-1][0]
+
+        # candidates sharing the most n-grams are the likeliest to be near,
+        # which lowers max_distance early; by the q-gram lemma, each edit
+        # destroys at most n grams, so the rest can be skipped once they
+        # share too few
+        for i, shared in counts.most_common():
+            if shared < len(grams) - max_distance * self.n:
+                break
+            verify(self.names[i])
+
+        if len(grams) - max_distance * self.n <= 0:
+            # too short to rely on n-grams; candidates may share none at all
+            for i, name in enumerate(self.names):
+                if i not in counts:
+                    verify(name)
+
+        return [name for _, name in sorted(results)[:limit]]
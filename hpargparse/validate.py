@@ -0,0 +1,224 @@
+"""Check many saved hyperparameter files against the current sources at once,
+without loading them into a manager. See :func:`.validate_files`."""
+
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import sys
+
+import hpman
+
+from .catalog import HPCatalog
+from .conditions import inactive_names
+from .hputils import convert_loaded_value, flatten_values, load_values
+
+from typing import Dict, List, Optional
+
+
+def build_spec(hp_mgr: hpman.HyperParameterManager) -> Dict[str, dict]:
+    """Collect what is needed to validate values of each hyperparameter: its
+    default value, its `choices`, `required` and `range` hints, and its
+    condition (see :mod:`.conditions`).
+
+    A range is given as `_("lr", 0.1, range=(0, 1))`; either bound may be
+    None for an open interval. Bounds are inclusive. Ranges are checked by
+    :func:`.validate_files` and searched by `hpcli search` only; they are
+    not enforced when parsing or loading.
+    """
+    spec = {}
+    for record in HPCatalog(hp_mgr):
+        rng = record.range
+        if rng is not None:
+            lo, hi = rng
+            rng = (
+                -math.inf if lo is None else float(lo),
+                math.inf if hi is None else float(hi),
+            )
+        spec[record.name] = {
+            "default": record.default,
+            "choices": record.choices,
+            "required": bool(record.required),
+            "range": rng,
+            "condition": record.condition,
+        }
+    return spec
+
+
+# per-process state, built once by _init_worker
+_worker_spec = None  # type: Optional[Dict[str, dict]]
+_worker_separator = "."
+
+
+def _init_worker(spec: Dict[str, dict], separator: str):
+    global _worker_spec, _worker_separator
+    _worker_spec = spec
+    _worker_separator = separator
+
+
+def _inactive(values):
+    conds = {k: s["condition"] for k, s in _worker_spec.items() if s["condition"]}
+    if not conds:
+        return set()
+    merged = {k: s["default"] for k, s in _worker_spec.items()}
+    merged.update(values)
+    return inactive_names(conds, merged)
+
+
+def _in_choices(v, choices):
+    try:
+        return v in choices
+    except (TypeError, ValueError):
+        # e.g. arrays, which compare elementwise; not checked
+        return True
+
+
+def _error(name, kind, message):
+    return {"name": name, "error": kind, "message": message}
+
+
+def _check_file(args):
+    """Check a single file, except for ranges which are checked across all
+    files at once by the caller.
+
+    :return: a tuple of (errors, values of hyperparameters with a range)
+    """
+    path, serial_format = args
+    spec = _worker_spec
+    errors = []
+    try:
+        values = load_values(path, serial_format)
+        if not isinstance(values, dict):
+            raise TypeError("expected a mapping, got {}".format(type(values).__name__))
+    except Exception as e:
+        return [_error(None, "load", "{}: {}".format(type(e).__name__, e))], {}
+
+    values = flatten_values(values, spec, _worker_separator)
+    converted = {}
+    for k, v in values.items():
+        if k not in spec:
+            errors.append(_error(k, "unknown", "unknown hyperparameter"))
+            continue
+        try:
+            converted[k] = convert_loaded_value(spec[k]["default"], v, path)
+        except (TypeError, ValueError, SyntaxError, OSError) as e:
+            converted[k] = e
+
+    inactive = _inactive(
+        {k: v for k, v in converted.items() if not isinstance(v, Exception)}
+    )
+    ranged = {}
+    for k, v in converted.items():
+        if k in inactive:
+            continue
+        if isinstance(v, Exception):
+            errors.append(_error(k, "type", "{}: {}".format(type(v).__name__, v)))
+            continue
+
+        s = spec[k]
+        if s["choices"] is not None and not _in_choices(v, s["choices"]):
+            errors.append(
+                _error(k, "choices", "value `{!r}` not in {!r}".format(v, s["choices"]))
+            )
+        if (
+            s["range"] is not None
+            and isinstance(v, (int, float))
+            and not isinstance(v, bool)
+        ):
+            ranged[k] = v
+
+    for k, s in spec.items():
+        if s["required"] and k not in values and k not in inactive:
+            errors.append(_error(k, "required", "required hyperparameter is missing"))
+    return errors, ranged
+
+
+def _check_ranges(spec, ranged_values, reports):
+    """Check all values of ranged hyperparameters across files at once."""
+    np = sys.modules.get("numpy")
+    if np is None:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+    for k, s in spec.items():
+        if s["range"] is None:
+            continue
+        lo, hi = s["range"]
+        idx = [i for i, r in enumerate(ranged_values) if k in r]
+        if not idx:
+            continue
+        if np is not None:
+            vals = np.fromiter(
+                (ranged_values[i][k] for i in idx), dtype=float, count=len(idx)
+            )
+            bad = np.flatnonzero(~((vals >= lo) & (vals <= hi)))
+            bad = [idx[j] for j in bad.tolist()]
+        else:
+            bad = [i for i in idx if not lo <= ranged_values[i][k] <= hi]
+        for i in bad:
+            reports[i]["errors"].append(
+                _error(
+                    k,
+                    "range",
+                    "value `{!r}` not in [{}, {}]".format(ranged_values[i][k], lo, hi),
+                )
+            )
+
+
+def validate_files(
+    hp_mgr: hpman.HyperParameterManager,
+    paths: List[str],
+    *,
+    serial_format: str = "auto",
+    jobs: Optional[int] = None,
+) -> List[dict]:
+    """Validate saved hyperparameter files against hyperparameters of
+    `hp_mgr`: unknown names, values :func:`.hp_load` cannot convert to the
+    type of a hyperparameter, violations of `choices` and `range` hints, and
+    missing `required` hyperparameters. Inactive conditional hyperparameters
+    are not checked.
+
+    :param hp_mgr: A manager with sources already parsed.
+    :param paths: Files to check, in any format :func:`.hputils.hp_load`
+        accepts.
+    :param serial_format: Format of the files; 'auto' infers it from each
+        file name.
+    :param jobs: Number of worker processes. Defaults to the number of CPUs;
+        1 checks files in the current process.
+
+    :return: a report per file, in the order of `paths`, each a dict of
+        `path`, `ok` and `errors`, a list of dicts of `name`, `error` and
+        `message`.
+    """
+    spec = build_spec(hp_mgr)
+    tasks = [(path, serial_format) for path in paths]
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(tasks)))
+
+    pool_kwargs = dict(initializer=_init_worker, initargs=(spec, hp_mgr.separator))
+    if sys.version_info < (3, 7):
+        # no initializer yet; forked workers inherit the state set below
+        pool_kwargs = {}
+        if multiprocessing.get_start_method() != "fork":
+            jobs = 1
+
+    _init_worker(spec, hp_mgr.separator)
+    if jobs == 1:
+        results = list(map(_check_file, tasks))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, **pool_kwargs
+        ) as executor:
+            chunksize = max(1, len(tasks) // (jobs * 4))
+            results = list(executor.map(_check_file, tasks, chunksize=chunksize))
+
+    reports = [
+        {"path": path, "errors": errors} for path, (errors, _) in zip(paths, results)
+    ]
+    _check_ranges(spec, [r for _, r in results], reports)
+    for report in reports:
+        report["ok"] = not report["errors"]
+    return reports
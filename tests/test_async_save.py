@@ -0,0 +1,86 @@
+import threading
+import unittest
+from unittest import mock
+
+import yaml
+import hpargparse
+from hpargparse import async_save
+
+from test_hputils import auto_cleanup_temp_dir, make_mgr
+
+SOURCE = '_("a", 1)\n_("b", [1, 2])'
+
+
+class TestAsyncSave(unittest.TestCase):
+    def test_save_snapshot(self):
+        hp_mgr = make_mgr(SOURCE)
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "config.yaml")
+            future = hpargparse.hp_save_async(path, hp_mgr)
+            hp_mgr.get_value("b").append(3)
+            hp_mgr.set_value("a", 2)
+            self.assertEqual(future.result(timeout=10), path)
+            hpargparse.flush_saves()
+
+            with open(path) as f:
+                self.assertEqual(yaml.safe_load(f), {"a": 1, "b": [1, 2]})
+
+    def test_arrays_are_not_copied(self):
+        import numpy as np
+
+        hp_mgr = make_mgr(SOURCE)
+        saver = hpargparse.AsyncSaver(max_workers=1)
+        saved = []
+        gate = threading.Event()
+
+        def fake_dump(path, values, serial_format, separator):
+            gate.wait(10)
+            saved.append(values)
+
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "weights.npy")
+            np.save(path, np.arange(4))
+            weights = np.load(path, mmap_mode="r")
+            hp_mgr.set_value("a", weights)
+            with mock.patch.object(async_save, "dump_values", fake_dump):
+                saver.save("x.yaml", hp_mgr)
+                hp_mgr.get_value("b").append(3)
+                gate.set()
+                saver.flush(timeout=10)
+            (values,) = saved
+            self.assertIs(values["a"], weights)
+            self.assertEqual(values["b"], [1, 2])
+            del weights, values, saved
+
+    def test_merge_queued_saves(self):
+        hp_mgr = make_mgr(SOURCE)
+        saver = hpargparse.AsyncSaver(max_workers=1)
+        written = []
+        gate = threading.Event()
+
+        def fake_dump(path, values, serial_format, separator):
+            gate.wait(10)
+            written.append((path, values["a"]))
+
+        with mock.patch.object(async_save, "dump_values", fake_dump):
+            f0 = saver.save("x.yaml", hp_mgr)
+            hp_mgr.set_value("a", 2)
+            f1 = saver.save("y.yaml", hp_mgr)
+            hp_mgr.set_value("a", 3)
+            f2 = saver.save("y.yaml", hp_mgr)
+            gate.set()
+            saver.flush(timeout=10)
+
+        self.assertIs(f1, f2)
+        self.assertEqual(written, [("x.yaml", 1), ("y.yaml", 3)])
+
+    def test_flush_raises(self):
+        hp_mgr = make_mgr(SOURCE)
+        saver = hpargparse.AsyncSaver()
+        with auto_cleanup_temp_dir() as d:
+            future = saver.save(str(d / "a.bcd"), hp_mgr)
+            # also when the save has failed before flushing
+            self.assertIsInstance(future.exception(timeout=10), ValueError)
+            self.assertRaises(ValueError, saver.flush, 10)
+            # reported once
+            saver.flush(10)
@@ -0,0 +1,97 @@
+import argparse
+import contextlib
+import io
+import unittest
+
+import hpargparse
+import yaml
+from hpargparse.catalog import HPCatalog, catalog_of
+
+from test_hputils import auto_cleanup_temp_dir, make_mgr
+
+SOURCE = """
+_("b", 1, help="the b")
+_("a", "x", choices=["x", "y"])
+_("a")
+_("c.d", 0.5, required=False)
+"""
+
+
+class TestCatalog(unittest.TestCase):
+    def test_records(self):
+        hp_mgr = make_mgr(SOURCE, "src.py")
+        catalog = HPCatalog(hp_mgr)
+        self.assertEqual(catalog.names(), ("a", "b", "c.d"))
+        a, b, cd = catalog
+        self.assertEqual((a.default, a.choices, a.help), ("x", ["x", "y"], None))
+        self.assertEqual(b.help, "the b")
+        self.assertIs(cd.required, False)
+        self.assertEqual(a.occurrences, (("src.py", 3), ("src.py", 4)))
+        self.assertNotIn("e", catalog)
+
+        hp_mgr.set_value("b", 2)
+        self.assertEqual(catalog.get("b").value, 2)
+        self.assertEqual(catalog.get("b").default, 1)
+        self.assertEqual(catalog.values(), hp_mgr.get_values())
+
+    def test_bind(self):
+        with auto_cleanup_temp_dir() as d:
+            path = d / "src.py"
+            path.write_text(SOURCE)
+            hp_mgr = make_mgr(SOURCE, str(path))
+            parser = argparse.ArgumentParser()
+            hpargparse.bind(parser, hp_mgr)
+            catalog = parser._hpargparse_catalog
+            self.assertEqual(len(catalog), 3)
+
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out), self.assertRaises(SystemExit):
+                parser.parse_args(["--b", "5", "--hp-list", "detail"])
+            self.assertIn("the b", out.getvalue())
+            self.assertEqual(catalog.get("b").value, 5)
+
+    def test_added_after_bind(self):
+        hp_mgr = make_mgr(SOURCE, "src.py")
+        parser = argparse.ArgumentParser()
+        hpargparse.bind(parser, hp_mgr)
+        hp_mgr.parse_source('_("e", 3)')
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.yaml")
+            parser.parse_args(["--hp-save", path])
+            with open(path) as f:
+                self.assertIn("e: 3", f.read())
+
+            hp_mgr = make_mgr(SOURCE, "src.py")
+            parser = argparse.ArgumentParser()
+            hpargparse.bind(parser, hp_mgr)
+            hp_mgr.parse_source('_("e", 0)')
+            parser.parse_args(["--hp-load", path])
+            self.assertEqual(hp_mgr.get_value("e"), 3)
+            self.assertEqual(parser._hpargparse_catalog.get("e").default, 0)
+
+    def test_snapshot_restore(self):
+        hp_mgr = make_mgr(SOURCE, "src.py")
+        parser = argparse.ArgumentParser()
+        hpargparse.bind(parser, hp_mgr)
+        catalog = parser._hpargparse_catalog
+        with hpargparse.snapshot(hp_mgr) as snap:
+            hp_mgr.set_value("e", 3)
+            self.assertIn("e", catalog.refresh())
+            snap.restore()
+            hp_mgr.set_value("f", 4)
+            self.assertEqual(catalog.refresh().names(), ("a", "b", "c.d", "f"))
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.yaml")
+            parser.parse_args(["--hp-save", path])
+            with open(path) as f:
+                saved = yaml.safe_load(f)
+        self.assertNotIn("e", saved)
+        self.assertEqual(saved["f"], 4)
+
+    def test_catalog_of(self):
+        hp_mgr = make_mgr(SOURCE, "src.py")
+        catalog = catalog_of(hp_mgr)
+        self.assertIs(catalog_of(hp_mgr), catalog)
+        hp_mgr.set_value("e", 3)
+        self.assertIn("e", catalog_of(hp_mgr))
+        self.assertEqual(hpargparse.active_names(hp_mgr), ["a", "b", "c.d", "e"])
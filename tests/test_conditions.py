@@ -0,0 +1,131 @@
+import contextlib
+import io
+import unittest
+
+import hpargparse
+import yaml
+from hpargparse import conditions, validate
+
+from test_hputils import auto_cleanup_temp_dir, make_bound, make_mgr
+
+SOURCE = """
+_("optimizer", "adam", choices=["adam", "sgd"])
+_("lr", 0.1)
+_("sgd.momentum", 0.9, condition={"optimizer": "sgd"})
+_("sgd.nesterov", False, condition={"optimizer": "sgd"})
+_("sgd.dampening", 0.0, condition={"sgd.nesterov": False})
+_("adam.beta1", 0.9, condition={"optimizer": ["adam", "adamw"]})
+"""
+
+
+class TestConditions(unittest.TestCase):
+    def _options(self, parser):
+        return {k for k in parser._option_string_actions if not k.startswith("--hp")}
+
+    def test_inactive_names(self):
+        hp_mgr = make_mgr(SOURCE)
+        conds = conditions.conditions_of(hp_mgr)
+        values = hp_mgr.get_values()
+        self.assertEqual(
+            conditions.inactive_names(conds, values),
+            {"sgd.momentum", "sgd.nesterov", "sgd.dampening"},
+        )
+        values.update({"optimizer": "sgd", "sgd.nesterov": True})
+        self.assertEqual(
+            conditions.inactive_names(conds, values), {"adam.beta1", "sgd.dampening"}
+        )
+
+    def test_parse(self):
+        parser, hp_mgr = make_bound(SOURCE)
+        self.assertNotIn("--sgd.momentum", self._options(parser))
+
+        args, extras = parser.parse_known_args(["--sgd.momentum", "0.5"])
+        self.assertEqual(extras, ["--sgd.momentum", "0.5"])
+        self.assertIn("--adam.beta1", self._options(parser))
+
+        parser, hp_mgr = make_bound(SOURCE)
+        parser.parse_args(["--optimizer", "sgd", "--sgd.momentum", "0.5"])
+        self.assertEqual(hp_mgr.get_value("sgd.momentum"), 0.5)
+        self.assertNotIn("--adam.beta1", self._options(parser))
+        self.assertEqual(
+            hpargparse.active_names(hp_mgr),
+            [
+                "lr",
+                "optimizer",
+                "sgd.dampening",
+                "sgd.momentum",
+                "sgd.nesterov",
+            ],
+        )
+
+    def test_parse_abbreviations_and_positionals(self):
+        parser, hp_mgr = make_bound(SOURCE)
+        parser.parse_args(["--optim", "sgd", "--sgd.mom", "0.5"])
+        self.assertEqual(hp_mgr.get_value("sgd.momentum"), 0.5)
+
+        parser, hp_mgr = make_bound(SOURCE)
+        parser.add_argument("rest", nargs="*")
+        args = parser.parse_args(["--", "--optimizer", "sgd"])
+        self.assertEqual(args.rest, ["--optimizer", "sgd"])
+        self.assertNotIn("--sgd.momentum", self._options(parser))
+
+        parser, hp_mgr = make_bound(SOURCE)
+        parser.add_argument("--optimizer-log")
+        with contextlib.redirect_stderr(io.StringIO()):
+            # ambiguous for the main parser, so not taken as the controller
+            self.assertRaises(SystemExit, parser.parse_args, ["--optim", "sgd"])
+        self.assertNotIn("--sgd.momentum", self._options(parser))
+
+    def test_save_load_and_list(self):
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.yaml")
+            parser, hp_mgr = make_bound(SOURCE)
+            parser.parse_args(["--optimizer", "sgd", "--hp-save", path])
+            with open(path) as f:
+                saved = yaml.safe_load(f)
+            self.assertEqual(set(saved), {"optimizer", "lr", "sgd"})
+            self.assertNotIn("adam", saved)
+
+            # the loaded controller activates the branch
+            parser, hp_mgr = make_bound(SOURCE)
+            parser.parse_args(["--hp-load", path, "--sgd.momentum", "0.1"])
+            self.assertEqual(hp_mgr.get_value("sgd.momentum"), 0.1)
+
+            parser, hp_mgr = make_bound(SOURCE)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out), self.assertRaises(SystemExit):
+                parser.parse_args(["--hp-list", "json"])
+            self.assertNotIn("sgd", out.getvalue())
+            self.assertIn("adam.beta1", out.getvalue())
+
+    def test_save_async(self):
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.yaml")
+            parser, hp_mgr = make_bound(SOURCE)
+            hpargparse.hp_save_async(path, hp_mgr).result()
+            with open(path) as f:
+                saved = yaml.safe_load(f)
+            self.assertEqual(set(saved), {"optimizer", "lr", "adam"})
+
+    def test_parse_overlay(self):
+        parser, hp_mgr = make_bound(SOURCE)
+        self.assertEqual(
+            hpargparse.parse_overlay(
+                parser, ["--optimizer", "sgd", "--sgd.momentum", "0.5"]
+            ),
+            {"optimizer": "sgd", "sgd.momentum": 0.5},
+        )
+        # the option is added now, but the branch is inactive with adam
+        self.assertEqual(
+            hpargparse.parse_overlay(parser, ["--sgd.momentum", "0.1"]), {}
+        )
+        self.assertEqual(hp_mgr.get_value("optimizer"), "adam")
+
+    def test_validate(self):
+        hp_mgr = make_mgr(SOURCE)
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.yaml")
+            with open(path, "w") as f:
+                yaml.dump({"optimizer": "adam", "sgd": {"momentum": "bad"}}, f)
+            (report,) = validate.validate_files(hp_mgr, [path], jobs=1)
+            self.assertTrue(report["ok"], report)
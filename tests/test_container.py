@@ -0,0 +1,53 @@
+import os
+import pickle
+import unittest
+
+from hpargparse import container
+
+from test_hputils import auto_cleanup_temp_dir, make_bound
+
+SOURCE = '_("lr", 0.1)\n_("model.depth", 18)'
+
+
+class TestContainer(unittest.TestCase):
+    def test_save_and_load(self):
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "model.ckpt")
+            payload = pickle.dumps({"weights": os.urandom(1 << 20)})
+            with open(path, "wb") as f:
+                f.write(payload)
+
+            parser, hp_mgr = make_bound(SOURCE)
+            parser.parse_args(
+                ["--lr", "0.5", "--hp-save", path, "--hp-serial-format", "embedded"]
+            )
+            with open(path, "rb") as f:
+                self.assertEqual(
+                    pickle.load(f)["weights"], pickle.loads(payload)["weights"]
+                )
+            self.assertEqual(container.read_block(path)[0], "yaml")
+
+            # saving again in auto format replaces the block
+            size = os.path.getsize(path)
+            parser.parse_args(["--lr", "0.25", "--hp-save", path])
+            self.assertEqual(os.path.getsize(path), size + 1)
+
+            parser, hp_mgr = make_bound(SOURCE)
+            parser.parse_args(["--hp-load", path])
+            self.assertEqual(hp_mgr.get_values(), {"lr": 0.25, "model.depth": 18})
+
+    def test_errors(self):
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "plain.bin")
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+            self.assertFalse(container.has_block(path))
+            with self.assertRaises(container.NoEmbeddedBlockError):
+                container.read_block(path)
+
+            container.write_block(path, b"lr: 1\n", "yaml")
+            with open(path, "r+b") as f:
+                f.seek(100)
+                f.write(b"L")
+            with self.assertRaises(ValueError):
+                container.read_block(path)
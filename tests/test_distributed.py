@@ -0,0 +1,222 @@
+import os
+import socket
+import threading
+import unittest
+from unittest import mock
+
+import dill
+import hpargparse
+from hpargparse import distributed, hputils
+
+from test_hputils import auto_cleanup_temp_dir, make_bound
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestDistributed(unittest.TestCase):
+    def _broadcast_in_threads(self, rendezvous, world_size):
+        results = [None] * world_size
+
+        def run(rank):
+            results[rank] = distributed.broadcast_object(
+                {"a": 1} if rank == 0 else None,
+                rank=rank,
+                world_size=world_size,
+                rendezvous=rendezvous,
+                timeout=10,
+            )
+
+        threads = [threading.Thread(target=run, args=(r,)) for r in range(world_size)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_broadcast_tcp(self):
+        rendezvous = "tcp://127.0.0.1:{}".format(_free_port())
+        self.assertEqual(self._broadcast_in_threads(rendezvous, 4), [{"a": 1}] * 4)
+
+    def test_broadcast_file(self):
+        with auto_cleanup_temp_dir() as d:
+            rendezvous = "file://{}".format(d / "rdzv")
+            self.assertEqual(self._broadcast_in_threads(rendezvous, 3), [{"a": 1}] * 3)
+
+    def test_rank_and_world_size(self):
+        self.assertEqual(distributed.get_rank_and_world_size({}), (0, 1))
+        self.assertEqual(
+            distributed.get_rank_and_world_size({"RANK": "3", "WORLD_SIZE": "8"}),
+            (3, 8),
+        )
+        self.assertEqual(
+            distributed.get_rendezvous({"MASTER_ADDR": "h", "MASTER_PORT": "29500"}),
+            "tcp://h:29501",
+        )
+        self.assertIsNone(distributed.get_launch_id({}))
+        self.assertEqual(
+            distributed.get_launch_id({"MASTER_ADDR": "h", "MASTER_PORT": "29500"}),
+            "MASTER_ADDR=h,MASTER_PORT=29500",
+        )
+
+    def test_non_zero_rank_receives_values(self):
+        parser, hp_mgr = make_bound('_("a", 1)\n_("b", 2)', distributed=True)
+
+        with auto_cleanup_temp_dir() as d:
+            rendezvous = "file://{}".format(d / "rdzv")
+            # what rank 0 would have sent
+            sender = threading.Thread(
+                target=distributed.broadcast_object,
+                args=(({"a": 10, "b": 20}, None, []),),
+                kwargs=dict(
+                    rank=0,
+                    world_size=2,
+                    rendezvous=rendezvous,
+                    timeout=10,
+                    launch_id=distributed.get_launch_id(),
+                ),
+            )
+            sender.start()
+            env = {
+                "RANK": "1",
+                "WORLD_SIZE": "2",
+                hpargparse.config.HP_RENDEZVOUS_ENV: rendezvous,
+            }
+            save_path = d / "config.yaml"
+            with mock.patch.dict(os.environ, env):
+                parser.parse_args(["--a", "5", "--hp-save", str(save_path)])
+            sender.join()
+
+            self.assertFalse(save_path.exists())
+        self.assertEqual(hp_mgr.get_values(), {"a": 10, "b": 20})
+
+    def test_file_rendezvous_launch_id_and_cleanup(self):
+        with auto_cleanup_temp_dir() as d:
+            rendezvous = "file://{}".format(d / "rdzv")
+            # left by an earlier launch
+            (d / "rdzv").write_bytes(dill.dumps(("old", False, {"a": 0})))
+            (d / "rdzv.ack-1").write_bytes(repr("new").encode("utf-8"))
+            results = [None] * 3
+
+            def run(rank):
+                results[rank] = distributed.broadcast_object(
+                    {"a": 1} if rank == 0 else None,
+                    rank=rank,
+                    world_size=3,
+                    rendezvous=rendezvous,
+                    timeout=10,
+                    launch_id="new",
+                )
+
+            receivers = [threading.Thread(target=run, args=(r,)) for r in (1, 2)]
+            for t in receivers:
+                t.start()
+            run(0)
+            for t in receivers:
+                t.join()
+            self.assertEqual(results, [{"a": 1}] * 3)
+            self.assertEqual(list(d.iterdir()), [])
+
+    def test_rank_0_failure(self):
+        parser, hp_mgr = make_bound('_("a", 1)', distributed=True)
+
+        with auto_cleanup_temp_dir() as d:
+            rendezvous = "file://{}".format(d / "rdzv")
+            errors = []
+
+            def receive():
+                try:
+                    distributed.broadcast_object(
+                        None,
+                        rank=1,
+                        world_size=2,
+                        rendezvous=rendezvous,
+                        timeout=10,
+                        launch_id=distributed.get_launch_id(),
+                    )
+                except distributed.BroadcastError as e:
+                    errors.append(e)
+
+            receiver = threading.Thread(target=receive)
+            receiver.start()
+            env = {
+                "RANK": "0",
+                "WORLD_SIZE": "2",
+                hpargparse.config.HP_RENDEZVOUS_ENV: rendezvous,
+            }
+            with mock.patch.dict(os.environ, env):
+                self.assertRaises(
+                    FileNotFoundError,
+                    parser.parse_args,
+                    ["--hp-load", str(d / "missing.yaml")],
+                )
+            receiver.join()
+            (error,) = errors
+            self.assertIn("missing.yaml", str(error))
+            self.assertEqual(list(d.iterdir()), [])
+
+    def test_conditional_load_on_rank_0_only(self):
+        source = '_("opt", "adam")\n_("momentum", 0.9, condition={"opt": "sgd"})'
+        with auto_cleanup_temp_dir() as d:
+            rendezvous = "file://{}".format(d / "rdzv")
+            config_path = d / "config.yaml"
+            config_path.write_text("opt: sgd\n")
+            argv = ["--hp-load", str(config_path), "--momentum", "0.5"]
+            load_values = mock.patch.object(
+                hputils, "load_values", wraps=hputils.load_values
+            )
+
+            # rank 0, with rank 1 receiving in a thread
+            parser, hp_mgr = make_bound(source, distributed=True)
+            received = []
+            receiver = threading.Thread(
+                target=lambda: received.append(
+                    distributed.broadcast_object(
+                        None,
+                        rank=1,
+                        world_size=2,
+                        rendezvous=rendezvous,
+                        timeout=10,
+                        launch_id=distributed.get_launch_id(),
+                    )
+                )
+            )
+            receiver.start()
+            env = {
+                "RANK": "0",
+                "WORLD_SIZE": "2",
+                hpargparse.config.HP_RENDEZVOUS_ENV: rendezvous,
+            }
+            with mock.patch.dict(os.environ, env), load_values as m:
+                parser.parse_args(argv)
+            receiver.join()
+            self.assertEqual(m.call_count, 1)
+            ((values, exit_code, active),) = received
+            self.assertEqual(values, {"opt": "sgd", "momentum": 0.5})
+            self.assertIsNone(exit_code)
+            self.assertEqual(active, ["momentum"])
+
+            # rank 1, with what rank 0 sent sent again by a thread
+            parser, hp_mgr = make_bound(source, distributed=True)
+            sender = threading.Thread(
+                target=distributed.broadcast_object,
+                args=(received[0],),
+                kwargs=dict(
+                    rank=0,
+                    world_size=2,
+                    rendezvous=rendezvous,
+                    timeout=10,
+                    launch_id=distributed.get_launch_id(),
+                ),
+            )
+            sender.start()
+            env["RANK"] = "1"
+            with mock.patch.dict(os.environ, env), load_values as m:
+                args = parser.parse_args(argv)
+            sender.join()
+            self.assertEqual(m.call_count, 0)
+            self.assertEqual(args.momentum, 0.5)
+            self.assertEqual(hp_mgr.get_values(), values)
@@ -0,0 +1,102 @@
+import contextlib
+import io
+import json
+import subprocess
+import unittest
+
+from hpargparse import cli, drift
+
+from test_hputils import auto_cleanup_temp_dir
+
+OLD = {
+    "train.py": '_("lr", 0.1)\n_("epochs", 10)\n_("optimizer", "sgd")\n',
+    "model.py": '_("depth", 18)\nx = _("lr")\n',
+    "util.py": "def f(x):\n    return x\n",
+}
+NEW = {
+    "train.py": '_("lr", 0.01)\n_("epochs", 10.0)\n_("batch_size", 64)\n',
+    "model.py": '_("depth", 18)\nx = _("lr")\n',
+    "util.py": "def f(x):\n    return x\n",
+}
+
+
+def write_tree(root, files):
+    root.mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        (root / name).write_text(content)
+
+
+class TestDrift(unittest.TestCase):
+    def _check(self, changes):
+        self.assertEqual(
+            [(c["name"], c["change"]) for c in changes],
+            [
+                ("batch_size", "added"),
+                ("epochs", "retyped"),
+                ("lr", "changed"),
+                ("optimizer", "removed"),
+            ],
+        )
+
+    def test_dirs(self):
+        with auto_cleanup_temp_dir() as d:
+            write_tree(d / "old", OLD)
+            write_tree(d / "new", NEW)
+
+            summarizer = drift.SourceSummarizer(cache_dir=str(d / "cache"))
+            old = drift.collect_defaults(
+                drift.iter_dir_sources(str(d / "old")), summarizer
+            )
+            new = drift.collect_defaults(
+                drift.iter_dir_sources(str(d / "new")), summarizer
+            )
+            self.assertEqual(
+                old["lr"],
+                {"value": "0.1", "type": "float", "file": "train.py", "line": 1},
+            )
+            changes = drift.compare_defaults(old, new)
+            self._check(changes)
+            self.assertEqual(changes[2]["new"]["value"], "0.01")
+            # unchanged model.py is parsed once, util.py not at all
+            self.assertEqual(summarizer.parsed, 3)
+
+            # a later run only reads the cache
+            summarizer = drift.SourceSummarizer(cache_dir=str(d / "cache"))
+            drift.collect_defaults(drift.iter_dir_sources(str(d / "new")), summarizer)
+            self.assertEqual(summarizer.parsed, 0)
+            # in a single cache entry
+            self.assertEqual(len(list((d / "cache" / "drift").iterdir())), 1)
+
+    def test_git(self):
+        with auto_cleanup_temp_dir() as d:
+            repo = str(d / "repo")
+
+            def git(*args):
+                subprocess.run(
+                    ["git", "-C", repo, "-c", "user.name=t", "-c", "user.email=t@t"]
+                    + list(args),
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                )
+
+            write_tree(d / "repo", OLD)
+            git("init", "-q")
+            git("add", ".")
+            git("commit", "-qm", "old")
+            write_tree(d / "repo", NEW)
+            git("commit", "-qam", "new")
+
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = cli.SUBCOMMANDS["drift"](
+                    ["--git", repo, "--cache-dir", str(d / "cache"), "--json"]
+                    + ["HEAD~1", "HEAD"]
+                )
+            self.assertEqual(code, 1)
+            self._check([json.loads(l) for l in out.getvalue().splitlines()])
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                code = cli.SUBCOMMANDS["drift"](
+                    ["--git", repo, "--cache-dir", str(d / "cache"), "HEAD", "HEAD"]
+                )
+            self.assertEqual(code, 0)
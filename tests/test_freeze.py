@@ -0,0 +1,88 @@
+import pickle
+import unittest
+
+import hpman
+import hpargparse
+
+from test_hputils import make_mgr
+
+
+class PicklableManager(hpman.HyperParameterManager):
+    pass
+
+
+SOURCE = '_("a", 1)\n_("model.depth", 50)'
+
+
+class TestFreeze(unittest.TestCase):
+    def test_freeze(self):
+        hp_mgr = make_mgr(SOURCE)
+        hp_mgr.set_value("a", 2)
+        hpargparse.freeze(hp_mgr)
+
+        self.assertTrue(hpargparse.is_frozen(hp_mgr))
+        self.assertIsInstance(hp_mgr, hpman.HyperParameterManager)
+        self.assertEqual(hp_mgr("a", 1), 2)
+        self.assertEqual(hp_mgr("model.depth"), 50)
+        self.assertEqual(hp_mgr.get_value("model"), {"depth": 50})
+        self.assertRaises(hpargparse.FrozenManagerError, hp_mgr, "unknown", 3)
+        self.assertRaises(KeyError, hp_mgr, "unknown")
+        self.assertEqual(hp_mgr.get_values(), {"a": 2, "model.depth": 50})
+
+        for setter, args in [
+            (hp_mgr.set_value, ("a", 3)),
+            (hp_mgr.set_values, ({"a": 3},)),
+            (hp_mgr.set_tree, ({"a": 3},)),
+        ]:
+            self.assertRaises(hpargparse.FrozenManagerError, setter, *args)
+        self.assertEqual(hp_mgr("a"), 2)
+
+        data = pickle.dumps(hp_mgr)
+        self.assertNotIn(b"Frozen", data)
+        hp_mgr = pickle.loads(data)
+        self.assertTrue(hpargparse.is_frozen(hp_mgr))
+        self.assertEqual(hp_mgr("a"), 2)
+
+        hpargparse.unfreeze(hp_mgr)
+        self.assertIs(type(hp_mgr), hpman.HyperParameterManager)
+        hp_mgr.set_value("a", 3)
+        self.assertEqual(hp_mgr("a"), 3)
+
+    def test_freeze_in_snapshot(self):
+        hp_mgr = make_mgr(SOURCE)
+        with hpargparse.snapshot(hp_mgr):
+            hpargparse.freeze(hp_mgr)
+            for setter, args in [
+                (hp_mgr.set_value, ("a", 5)),
+                (hp_mgr.set_values, ({"a": 5},)),
+                (hp_mgr.set_tree, ({"a": 5},)),
+            ]:
+                self.assertRaises(hpargparse.FrozenManagerError, setter, *args)
+        self.assertEqual(hp_mgr.get_value("a"), 1)
+        self.assertEqual(hpman.HyperParameterManager.get_value(hp_mgr, "a"), 1)
+
+    def test_freeze_subclass(self):
+        class Manager(hpman.HyperParameterManager):
+            pass
+
+        hp_mgr = Manager("_")
+        hp_mgr.parse_source('_("a", 1)')
+        hpargparse.freeze(hp_mgr)
+        self.assertIsInstance(hp_mgr, Manager)
+        self.assertEqual(hp_mgr("a"), 1)
+        hpargparse.unfreeze(hp_mgr)
+        self.assertIs(type(hp_mgr), Manager)
+
+    def test_pickle_subclass(self):
+        hp_mgr = hpargparse.freeze(PicklableManager("_"))
+        hp_mgr = pickle.loads(pickle.dumps(hp_mgr))
+        self.assertIsInstance(hp_mgr, PicklableManager)
+        self.assertTrue(hpargparse.is_frozen(hp_mgr))
+
+    def test_memoize_sees_frozen_reads(self):
+        from hpargparse.memoize import record_reads
+
+        hp_mgr = hpargparse.freeze(make_mgr(SOURCE))
+        with record_reads(hp_mgr) as names:
+            hp_mgr("a")
+        self.assertEqual(names, ["a"])
@@ -0,0 +1,61 @@
+import argparse
+import contextlib
+import io
+import os
+import unittest
+from unittest import mock
+
+from hpargparse import help_cache
+
+from test_hputils import auto_cleanup_temp_dir, make_bound
+
+
+class TestHelpCache(unittest.TestCase):
+    def _make(self, cache_dir, default=1):
+        parser, _ = make_bound(
+            '_("a", {})\n_("model.depth", 50)'.format(default),
+            parser=argparse.ArgumentParser(prog="prog", epilog="the end"),
+            help_cache=cache_dir,
+        )
+        return parser
+
+    def test_cached_help(self):
+        with auto_cleanup_temp_dir() as d:
+            parser = self._make(str(d))
+            expected = argparse.ArgumentParser.format_help(parser)
+            self.assertEqual(parser.format_help(), expected)
+            self.assertEqual(len(os.listdir(str(d))), 1)
+
+            with mock.patch.object(
+                help_cache, "iter_help_sections", side_effect=AssertionError
+            ):
+                out = io.StringIO()
+                parser.print_help(out)
+            self.assertEqual(out.getvalue(), expected)
+
+            # a new invocation hits the cache
+            parser = self._make(str(d))
+            with mock.patch.object(argparse.ArgumentParser, "format_help") as m:
+                self.assertEqual(parser.format_help(), expected)
+                m.assert_not_called()
+
+            # changed defaults invalidate it
+            parser = self._make(str(d), default=2)
+            self.assertIn("(default: 2)", parser.format_help())
+
+    def test_fingerprint_python_version(self):
+        with auto_cleanup_temp_dir() as d:
+            parser = self._make(str(d))
+            key = help_cache.help_fingerprint(parser)
+            with mock.patch.object(help_cache.sys, "version_info", (3, 99, 0)):
+                self.assertNotEqual(help_cache.help_fingerprint(parser), key)
+
+    def test_streamed_help(self):
+        with auto_cleanup_temp_dir() as d:
+            parser = self._make(str(d / "cache"))
+            expected = argparse.ArgumentParser.format_help(parser)
+            with mock.patch.object(os, "makedirs", side_effect=PermissionError):
+                out = io.StringIO()
+                with contextlib.redirect_stdout(out):
+                    parser.print_help()
+            self.assertEqual(out.getvalue(), expected)
@@ -2,9 +2,11 @@ import unittest
 import hpargparse
 import argparse
 import pickle
+import yaml
 import hpman
 from pathlib import Path
 import contextlib
+import io
 
 import os
 import shutil
@@ -26,6 +28,28 @@ def auto_cleanup_temp_dir():
         shutil.rmtree(str(tmpdir))
 
 
+def make_mgr(source, filename="<unknown>"):
+    """
+    :return: a manager with `source` parsed
+    """
+    hp_mgr = hpman.HyperParameterManager("_")
+    hp_mgr.parse_source(source, filename)
+    return hp_mgr
+
+
+def make_bound(source, parser=None, **kwargs):
+    """
+    :param parser: The parser to bind to; a new one by default.
+    :param kwargs: Passed to :func:`hpargparse.bind`.
+    :return: a tuple of (parser, hp_mgr) with `source` parsed and bound
+    """
+    hp_mgr = make_mgr(source)
+    if parser is None:
+        parser = argparse.ArgumentParser()
+    hpargparse.bind(parser, hp_mgr, **kwargs)
+    return parser, hp_mgr
+
+
 class TestAll(unittest.TestCase):
     def _make(self, fpath):
         fpath = str(fpath)
@@ -201,7 +225,15 @@ class TestAll(unittest.TestCase):
             ]
             assertion(parser.format_help(), regex)
 
-        all_keys = ["save", "load", "list", "detail", "serial-format", "exit"]
+        all_keys = [
+            "save",
+            "load",
+            "list",
+            "detail",
+            "help-group",
+            "serial-format",
+            "exit",
+        ]
 
         def test_exist(keywords, **bind_kwargs):
 
@@ -331,3 +363,145 @@ class TestAll(unittest.TestCase):
 
         args = parser.parse_args(["--b", "True"])
         self.assertEqual(args.b, True)
+
+    def test_array_file_argument(self):
+        import numpy as np
+
+        parser, hp_mgr = self._make_dict_and_list()
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "weights.npy")
+            np.save(path, np.arange(4, dtype="float32"))
+            parser.parse_args(["an_arg_value", "--b", "@" + path])
+
+            b = hp_mgr.get_value("b")
+            self.assertIsInstance(b, np.memmap)
+            np.testing.assert_array_equal(b, [0, 1, 2, 3])
+
+    def test_hp_save_and_load_array(self):
+        import numpy as np
+
+        with auto_cleanup_temp_dir() as d:
+            parser, hp_mgr = self._make_dict_and_list()
+            hp_mgr.set_value("b", np.arange(3))
+            path = d / "config.yaml"
+            parser.parse_args(["an_arg_value", "--hp-save", str(path)])
+
+            self.assertTrue((d / "config.b.npy").exists())
+            self.assertIn("b: '@config.b.npy'", path.read_text())
+
+            parser, hp_mgr = self._make_dict_and_list()
+            parser.parse_args(["an_arg_value", "--hp-load", str(path)])
+            b = hp_mgr.get_value("b")
+            self.assertIsInstance(b, np.memmap)
+            np.testing.assert_array_equal(b, [0, 1, 2])
+
+            # strings of other types are not array references
+            self.assertEqual(
+                hpargparse.hputils.convert_loaded_value("x", "@b.npy", str(path)),
+                "@b.npy",
+            )
+
+    def test_hp_load_and_save_array_in_place(self):
+        import numpy as np
+
+        with auto_cleanup_temp_dir() as d:
+            parser, hp_mgr = self._make_dict_and_list()
+            hp_mgr.set_value("b", np.arange(3))
+            path = d / "config.yaml"
+            parser.parse_args(["an_arg_value", "--hp-save", str(path)])
+
+            # the loaded array is a memory map of the file it is saved to
+            parser, hp_mgr = self._make_dict_and_list()
+            parser.parse_args(
+                ["an_arg_value", "--hp-load", str(path), "--hp-save", str(path)]
+            )
+            np.testing.assert_array_equal(hp_mgr.get_value("b"), [0, 1, 2])
+
+            parser, hp_mgr = self._make_dict_and_list()
+            parser.parse_args(["an_arg_value", "--hp-load", str(path)])
+            np.testing.assert_array_equal(hp_mgr.get_value("b"), [0, 1, 2])
+            self.assertEqual(
+                sorted(p.name for p in d.iterdir()), ["config.b.npy", "config.yaml"]
+            )
+
+    def test_hp_list_array(self):
+        import numpy as np
+
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "weights.npy")
+            np.save(path, np.arange(4, dtype="float32"))
+            for b, expected in [
+                (np.arange(3), [0, 1, 2]),
+                (np.zeros((100, 2)), "<ndarray shape=(100, 2) dtype=float64>"),
+                ("@" + path, "@" + path),
+            ]:
+                for fmt in ["json", "yaml"]:
+                    parser, hp_mgr = self._make_dict_and_list()
+                    if isinstance(b, str):
+                        argv = ["an_arg_value", "--b", b, "--hp-list", fmt]
+                    else:
+                        hp_mgr.set_value("b", b)
+                        argv = ["an_arg_value", "--hp-list", fmt]
+                    out = io.StringIO()
+                    with contextlib.redirect_stdout(out):
+                        self.assertRaises(SystemExit, parser.parse_args, argv)
+                    # json is also yaml
+                    listed = yaml.safe_load(
+                        "\n".join(line.rstrip() for line in out.getvalue().splitlines())
+                    )
+                    self.assertEqual(listed["b"], expected)
+
+    def _make_namespaced(self):
+        return make_bound(
+            '_("lr", 0.1)\n'
+            '_("model.backbone.depth", 50)\n'
+            '_("model.backbone.width", 64)\n'
+            '_("model.head.num_classes", 10)\n'
+        )
+
+    def test_namespace_groups(self):
+        parser, hp_mgr = self._make_namespaced()
+        h = parser.format_help()
+        self.assertRegex(h, "model.backbone:\n  --model.backbone.depth")
+        self.assertRegex(h, "model.head:\n  --model.head.num-classes")
+
+        parser.parse_args(["--model.backbone.depth", "101"])
+        self.assertEqual(hp_mgr.get_value("model.backbone.depth"), 101)
+
+    def test_hp_help_group(self):
+        parser, hp_mgr = self._make_namespaced()
+        for namespace, present, absent in [
+            ("model.backbone", "--model.backbone.width", "--model.head"),
+            ("model", "--model.head.num-classes", "--lr"),
+        ]:
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertRaises(
+                    SystemExit, parser.parse_args, ["--hp-help-group", namespace]
+                )
+            self.assertIn(present, out.getvalue())
+            self.assertNotIn(absent, out.getvalue())
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertRaises(
+                SystemExit, parser.parse_args, ["--hp-help-group", "nope"]
+            )
+
+    def test_hp_save_and_load_nested(self):
+        with auto_cleanup_temp_dir() as d:
+            path = d / "config.yaml"
+            parser, hp_mgr = self._make_namespaced()
+            parser.parse_args(["--model.head.num-classes", "5", "--hp-save", str(path)])
+
+            with open(str(path)) as f:
+                saved = yaml.safe_load(f)
+            self.assertEqual(saved["model"]["backbone"], {"depth": 50, "width": 64})
+
+            parser, hp_mgr = self._make_namespaced()
+            parser.parse_args(["--hp-load", str(path)])
+            self.assertEqual(hp_mgr.get_value("model.head.num_classes"), 5)
+
+            # flat keys are still accepted
+            path.write_text("model.backbone.depth: 18\n")
+            parser.parse_args(["--hp-load", str(path)])
+            self.assertEqual(hp_mgr.get_value("model.backbone.depth"), 18)
@@ -0,0 +1,84 @@
+import os
+import unittest
+
+import hpman
+import hpargparse
+from hpargparse import imports
+
+from test_hputils import auto_cleanup_temp_dir
+
+FILES = {
+    "train.py": 'import os\nimport pkg.model\n_("lr", 0.1)\n\n'
+    "def main():\n    from pkg import data\n",
+    "pkg/__init__.py": "",
+    "pkg/model.py": 'from . import layers\nfrom .missing import x\n_("depth", 18)\n',
+    "pkg/layers/__init__.py": "from ..util import *\n",
+    "pkg/util.py": '_("eps", 1e-5)\n',
+    "pkg/data.py": '_("batch_size", 32)\n',
+    "pkg/dead.py": '_("unused", 1)\n',
+    "tests/test_train.py": 'import train\n_("test_only", 1)\n',
+}
+
+
+class TestImports(unittest.TestCase):
+    def _write(self, d):
+        for name, content in FILES.items():
+            path = d / "project" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        return d / "project"
+
+    def test_find_imports(self):
+        self.assertEqual(
+            imports.find_imports("from ..c import d\nimport e.f", "a.b.m", False),
+            ["a.c", "a.c.d", "e.f"],
+        )
+        self.assertEqual(
+            imports.find_imports("from . import x", "a", True), ["a", "a.x"]
+        )
+
+    def test_parse_reachable(self):
+        with auto_cleanup_temp_dir() as d:
+            root = self._write(d)
+            cache_dir = str(d / "cache")
+            reachable = imports.reachable_modules(
+                str(root / "train.py"), cache_dir=cache_dir
+            )
+            self.assertEqual(
+                [p[len(str(root)) + 1 :] for p in reachable],
+                [
+                    "pkg/__init__.py",
+                    "pkg/data.py",
+                    "pkg/layers/__init__.py",
+                    "pkg/model.py",
+                    "pkg/util.py",
+                    "train.py",
+                ],
+            )
+
+            hp_mgr = hpman.HyperParameterManager("_")
+            hpargparse.parse_reachable(
+                hp_mgr, str(root / "train.py"), cache_dir=cache_dir
+            )
+            self.assertEqual(
+                hp_mgr.get_values(),
+                {"lr": 0.1, "depth": 18, "eps": 1e-5, "batch_size": 32},
+            )
+
+            # a modified module is analyzed again
+            (root / "pkg" / "util.py").write_text("import pkg.dead\n")
+            reachable = imports.reachable_modules(
+                str(root / "train.py"), cache_dir=cache_dir
+            )
+            self.assertIn(str(root / "pkg" / "dead.py"), reachable)
+
+            # a module created later is followed from an unmodified one
+            self.assertNotIn(str(root / "pkg" / "missing.py"), reachable)
+            (root / "pkg" / "missing.py").write_text("x = 1\n")
+            reachable = imports.reachable_modules(
+                str(root / "train.py"), cache_dir=cache_dir
+            )
+            self.assertIn(str(root / "pkg" / "missing.py"), reachable)
+
+            # one index per root rather than a file per module
+            self.assertEqual(len(os.listdir(os.path.join(cache_dir, "imports"))), 1)
@@ -0,0 +1,81 @@
+import argparse
+import unittest
+
+import hpargparse
+from hpargparse import cli, journal
+
+from test_hputils import auto_cleanup_temp_dir, make_mgr
+
+SOURCE = '_("lr", 0.1)\n_("wd", 1e-5)'
+
+
+class TestJournal(unittest.TestCase):
+    def _write(self, path):
+        hp_mgr = make_mgr(SOURCE)
+        with hpargparse.HPJournal(path, hp_mgr) as j:
+            j.record(step=0)
+            j.set_value("lr", 0.01, step=100)
+            hp_mgr.set_value("wd", 0.0)
+            j.record()  # step-less, belongs to step 100
+            j.set_value("lr", 0.001, step=200)
+            # nothing changed
+            j.record(step=300)
+        return hp_mgr
+
+    def test_replay(self):
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.jsonl")
+            self._write(path)
+            self.assertEqual(len(list(journal.read_journal(path))), 5)
+
+            replay = hpargparse.replay_journal
+            self.assertEqual(replay(path, 0), {"lr": 0.1, "wd": 1e-5})
+            self.assertEqual(replay(path, 150), {"lr": 0.01, "wd": 0.0})
+            self.assertEqual(replay(path), {"lr": 0.001, "wd": 0.0})
+
+            # appending continues from the replayed values
+            hp_mgr = make_mgr(SOURCE)
+            hp_mgr.set_values({"lr": 0.001, "wd": 0.0})
+            with hpargparse.HPJournal(path, hp_mgr) as j:
+                j.record(step=400)
+            self.assertEqual(len(list(journal.read_journal(path))), 5)
+
+    def test_hp_load_at_step(self):
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.jsonl")
+            self._write(path)
+
+            hp_mgr = make_mgr(SOURCE)
+            parser = argparse.ArgumentParser()
+            hpargparse.bind(parser, hp_mgr)
+            parser.parse_args(["--hp-load", path + "@step=150"])
+            self.assertEqual(hp_mgr.get_values(), {"lr": 0.01, "wd": 0.0})
+
+            self.assertRaises(
+                ValueError, parser.parse_args, ["--hp-save", str(d / "x.jsonl")]
+            )
+
+    def test_compact(self):
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.jsonl")
+            self._write(path)
+
+            out = str(d / "compact.jsonl")
+            self.assertEqual(
+                cli.SUBCOMMANDS["compact-journal"](
+                    [path, "-o", out, "--upto-step", "100"]
+                ),
+                0,
+            )
+            records = list(journal.read_journal(out))
+            self.assertEqual(len(records), 3)
+            self.assertEqual(
+                hpargparse.replay_journal(out, 100), {"lr": 0.01, "wd": 0.0}
+            )
+            self.assertEqual(
+                hpargparse.replay_journal(out), hpargparse.replay_journal(path)
+            )
+
+            hpargparse.compact_journal(path)
+            self.assertEqual(len(list(journal.read_journal(path))), 2)
+            self.assertEqual(hpargparse.replay_journal(path), {"lr": 0.001, "wd": 0.0})
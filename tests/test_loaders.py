@@ -0,0 +1,94 @@
+import http.server
+import os
+import socketserver
+import threading
+import unittest
+import urllib.parse
+
+import hpargparse
+from hpargparse import loaders
+
+from test_hputils import auto_cleanup_temp_dir, make_bound, make_mgr, test_file_dir
+
+
+class _Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    # http.server.ThreadingHTTPServer is new in Python 3.7
+    daemon_threads = True
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+    root = str(test_file_dir / "basic")
+
+    def do_GET(self):
+        _Handler.requests.append(self.path)
+        super().do_GET()
+
+    def translate_path(self, path):
+        # the `directory` argument is new in Python 3.7
+        path = urllib.parse.unquote(urllib.parse.urlsplit(path).path)
+        parts = [p for p in path.split("/") if p not in ("", ".", "..")]
+        return os.path.join(self.root, *parts)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestLoaders(unittest.TestCase):
+    def setUp(self):
+        _Handler.requests = []
+        self.server = _Server(("127.0.0.1", 0), _Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.base_uri = "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def _make(self, loader):
+        parser, hp_mgr = make_bound('_("a", 1)\n_("b", 2)')
+        loaders.register_loader("http", loader)
+        self.addCleanup(loaders.register_loader, "http", loaders.http_loader)
+        return parser, hp_mgr
+
+    def test_hp_load_http(self):
+        with auto_cleanup_temp_dir() as d:
+            loader = loaders.HTTPLoader(str(d), max_age=0, offline=False)
+            parser, hp_mgr = self._make(loader)
+            uri = self.base_uri + "/config.yaml"
+            parser.parse_args(["--hp-load", uri])
+            self.assertEqual(hp_mgr.get_values(), {"a": 2, "b": 3})
+
+            # revalidated with a conditional request, answered by 304
+            self.assertEqual(loader(uri), loader.cache.path_of(uri))
+            self.assertEqual(len(_Handler.requests), 2)
+
+            loader.max_age = 3600
+            loader(uri)
+            self.assertEqual(len(_Handler.requests), 2)
+
+    def test_offline(self):
+        with auto_cleanup_temp_dir() as d:
+            loader = loaders.HTTPLoader(str(d), offline=True)
+            uri = self.base_uri + "/config.yaml"
+            self.assertRaises(FileNotFoundError, loader, uri)
+
+            loader.offline = False
+            loader(uri)
+            loader.offline = True
+            with open(loader(uri)) as f:
+                self.assertIn("a: 2", f.read())
+            self.assertEqual(len(_Handler.requests), 1)
+
+    def test_custom_scheme(self):
+        loaders.register_loader(
+            "test", lambda uri: str(test_file_dir / "basic" / uri[len("test://") :])
+        )
+        self.addCleanup(loaders._loaders.pop, "test")
+        hp_mgr = make_mgr('_("a", 1)\n_("b", 2)')
+        hpargparse.hputils.hp_load("test://config.yaml", hp_mgr, "auto")
+        self.assertEqual(hp_mgr.get_values(), {"a": 2, "b": 3})
+        self.assertRaises(ValueError, loaders.resolve_uri, "nope://x")
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+import hpargparse
+from hpargparse.cache import DiskCache
+from hpargparse.memoize import record_reads
+
+from test_hputils import auto_cleanup_temp_dir, make_mgr
+
+SOURCE = '_("a", 1)\n_("b", 2)'
+
+
+class TestMemoize(unittest.TestCase):
+    def test_memoize_relevant_values(self):
+        hp_mgr = make_mgr(SOURCE)
+        calls = []
+
+        with auto_cleanup_temp_dir() as d:
+
+            @hpargparse.hp_memoize(hp_mgr, cache_dir=str(d))
+            def f(x):
+                calls.append(x)
+                return x + hp_mgr("a")
+
+            self.assertEqual(f(10), 11)
+            self.assertEqual(f(10), 11)
+            self.assertEqual(len(calls), 1)
+
+            # `b` is not read by f, so the cached result is still valid
+            hp_mgr.set_value("b", 3)
+            self.assertEqual(f(10), 11)
+            self.assertEqual(len(calls), 1)
+
+            hp_mgr.set_value("a", 5)
+            self.assertEqual(f(10), 15)
+            self.assertEqual(len(calls), 2)
+
+            self.assertEqual(f(20), 25)
+            self.assertEqual(len(calls), 3)
+
+    def test_memoize_branches(self):
+        hp_mgr = make_mgr(SOURCE)
+        calls = []
+
+        with auto_cleanup_temp_dir() as d:
+
+            @hpargparse.hp_memoize(hp_mgr, cache_dir=str(d))
+            def f():
+                calls.append(None)
+                return hp_mgr("b") if hp_mgr("a") == 2 else 0
+
+            self.assertEqual(f(), 0)
+            hp_mgr.set_value("a", 2)
+            self.assertEqual(f(), 2)
+            hp_mgr.set_value("b", 7)
+            self.assertEqual(f(), 7)
+            self.assertEqual(len(calls), 3)
+
+    def test_record_reads(self):
+        hp_mgr = make_mgr(SOURCE)
+        barrier = threading.Barrier(2)
+        recorded = {}
+
+        def read(name):
+            with record_reads(hp_mgr) as names:
+                barrier.wait(10)
+                hp_mgr(name)
+                barrier.wait(10)
+            recorded[name] = names
+
+        threads = [threading.Thread(target=read, args=(k,)) for k in "ab"]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # reads of other threads are not recorded
+        self.assertEqual(recorded, {"a": ["a"], "b": ["b"]})
+
+        with record_reads(hp_mgr) as outer:
+            hp_mgr("a")
+            with record_reads(hp_mgr) as inner:
+                # wrapping get_value while recording is kept afterwards
+                with hpargparse.overlay(hp_mgr, {"b": 3}):
+                    self.assertEqual(hp_mgr("a"), 1)
+        self.assertEqual(inner, ["a"])
+        self.assertEqual(outer, ["a", "a"])
+        with hpargparse.overlay(hp_mgr, {"b": 4}):
+            self.assertEqual(hp_mgr("b"), 4)
+
+    def test_disk_cache_eviction(self):
+        with auto_cleanup_temp_dir() as d:
+            cache = DiskCache(str(d), max_entries=2)
+            # recency is tracked by mtime, so leave a gap between accesses
+            cache.put("x", b"1")
+            time.sleep(0.05)
+            cache.put("y", b"2")
+            time.sleep(0.05)
+            self.assertEqual(cache.get("x"), b"1")
+            time.sleep(0.05)
+            cache.put("z", b"3")
+            self.assertIsNone(cache.get("y"))
+            self.assertEqual(cache.get("x"), b"1")
+            self.assertEqual(cache.get("z"), b"3")
+
+    def test_disk_cache_scans_only_over_slack(self):
+        with auto_cleanup_temp_dir() as d:
+            cache = DiskCache(str(d), max_entries=20)
+            with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+                for i in range(22):
+                    cache.put(str(i), b"x")
+                # the first put counts entries already in the directory
+                self.assertEqual(scandir.call_count, 1)
+                self.assertEqual(len(os.listdir(str(d))), 22)
+                cache.put("22", b"x")
+                self.assertEqual(scandir.call_count, 2)
+                self.assertEqual(len(os.listdir(str(d))), 20)
@@ -0,0 +1,94 @@
+import asyncio
+import sys
+import threading
+import unittest
+
+import hpargparse
+
+from test_hputils import make_bound
+
+SOURCE = '_("beam_size", 4)\n_("mode", "greedy")'
+
+
+class TestOverlay(unittest.TestCase):
+    def test_nested_overlays(self):
+        parser, hp_mgr = make_bound(SOURCE)
+        with hpargparse.overlay(hp_mgr, {"beam_size": 8}):
+            self.assertEqual(hp_mgr("beam_size", 4), 8)
+            with hpargparse.overlay(hp_mgr, {"mode": "beam"}):
+                self.assertEqual(hp_mgr.get_values(), {"beam_size": 8, "mode": "beam"})
+            self.assertEqual(hp_mgr("mode"), "greedy")
+        self.assertEqual(hp_mgr("beam_size"), 4)
+
+    def test_threads(self):
+        parser, hp_mgr = make_bound(SOURCE)
+        barrier = threading.Barrier(4)
+        results = {}
+
+        def handle(i):
+            with hpargparse.overlay(hp_mgr, {"beam_size": i}):
+                barrier.wait(10)
+                results[i] = hp_mgr("beam_size")
+
+        threads = [threading.Thread(target=handle, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, {i: i for i in range(4)})
+        self.assertEqual(hp_mgr("beam_size"), 4)
+
+    def test_concurrent_parse_overlay(self):
+        # the resolver swaps options of the parser during a parse
+        parser, hp_mgr = make_bound(
+            '_("beam_size", 4)\n_("mode", "greedy")', fast_option_lookup=True
+        )
+        errors = []
+
+        def handle(i):
+            try:
+                for _ in range(200):
+                    argv = ["--beam", str(i), "--mode", str(i)]
+                    values = hpargparse.parse_overlay(parser, argv)
+                    assert values == {"beam_size": i, "mode": str(i)}, values
+            except BaseException as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads often to expose races
+        try:
+            threads = [threading.Thread(target=handle, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+
+    @unittest.skipIf(sys.version_info < (3, 7), "asyncio tasks have contexts")
+    def test_asyncio_and_parse_overlay(self):
+        parser, hp_mgr = make_bound(SOURCE)
+
+        async def handle(argv):
+            with hpargparse.overlay(hp_mgr, hpargparse.parse_overlay(parser, argv)):
+                await asyncio.sleep(0.01)
+                return hp_mgr("beam_size"), hp_mgr("mode")
+
+        async def main():
+            return await asyncio.gather(
+                handle(["--beam-size", "16"]),
+                handle(["--mode", "beam"]),
+                handle([]),
+            )
+
+        self.assertEqual(
+            asyncio.run(main()), [(16, "greedy"), (4, "beam"), (4, "greedy")]
+        )
+        self.assertIs(
+            type(hpargparse.parse_overlay(parser, ["--mode", "x"])["mode"]), str
+        )
+
+        # the global manager and the parser state are untouched
+        parser.parse_args([])
+        self.assertEqual(hp_mgr.get_values(), {"beam_size": 4, "mode": "greedy"})
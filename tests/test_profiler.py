@@ -0,0 +1,72 @@
+import argparse
+import json
+import unittest
+from unittest import mock
+
+import hpargparse
+from hpargparse.profiler import AccessProfiler
+
+from test_hputils import auto_cleanup_temp_dir, make_mgr
+
+SOURCE = '_("a", 1)\n_("b", 2)\n_("c", 3)'
+
+
+class TestProfiler(unittest.TestCase):
+    def test_report(self):
+        hp_mgr = make_mgr(SOURCE)
+        profiler = AccessProfiler(hp_mgr, sample_every=2).install()
+        for _ in range(10):
+            hp_mgr("a", 1)
+        hp_mgr.get_value("b")
+        profiler.uninstall()
+        hp_mgr("a")
+
+        report = profiler.report()
+        self.assertEqual(report["total_reads"], 11)
+        self.assertEqual(report["unread"], ["c"])
+        a = report["hyperparameters"]["a"]
+        self.assertEqual(a["reads"], 10)
+        self.assertEqual(a["sampled_reads"], 5)
+        self.assertIsNotNone(a["estimated_time_ns"])
+        ((site, count),) = a["call_sites"].items()
+        self.assertIn("test_profiler.py", site)
+        self.assertEqual(count, 5)
+        self.assertNotIn("get_value", vars(hp_mgr))
+
+    def test_uninstall_under_overlay(self):
+        hp_mgr = make_mgr(SOURCE)
+        profiler = AccessProfiler(hp_mgr, sample_every=1).install()
+        with hpargparse.overlay(hp_mgr, {"a": 10}):
+            profiler.uninstall()
+            # the overlay installed after the profiler keeps working
+            self.assertEqual(hp_mgr("a"), 10)
+            self.assertEqual(hp_mgr("b"), 2)
+        self.assertEqual(hp_mgr("a"), 1)
+        self.assertEqual(profiler.report()["total_reads"], 0)
+
+    def test_access_report_action(self):
+        hp_mgr = make_mgr(SOURCE)
+        parser = argparse.ArgumentParser()
+        hpargparse.bind(parser, hp_mgr, inject_actions=["access-report"])
+        self.assertIn("--hp-access-report", parser.format_help())
+
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "report.json")
+            with mock.patch("atexit.register") as register:
+                parser.parse_args(["--hp-access-report", path])
+            hp_mgr("b")
+            (dump, dump_path), _ = register.call_args
+            dump(dump_path)
+
+            with open(path) as f:
+                report = json.load(f)
+        self.assertEqual(report["hyperparameters"]["b"]["reads"], 1)
+        self.assertEqual(report["unread"], ["a", "c"])
+
+    def test_disabled_by_default(self):
+        hp_mgr = make_mgr(SOURCE)
+        parser = argparse.ArgumentParser()
+        hpargparse.bind(parser, hp_mgr)
+        self.assertNotIn("--hp-access-report", parser.format_help())
+        parser.parse_args([])
+        self.assertNotIn("get_value", vars(hp_mgr))
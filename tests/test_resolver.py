@@ -0,0 +1,60 @@
+import argparse
+import contextlib
+import io
+import unittest
+
+from hpargparse.resolver import OptionPrefixIndex, install_prefix_resolver
+
+from test_hputils import make_bound
+
+
+class TestResolver(unittest.TestCase):
+    def _make_parser(self):
+        parser = argparse.ArgumentParser(prog="prog")
+        parser.add_argument("-x", type=int)
+        parser.add_argument("--learning-rate", type=float)
+        parser.add_argument("--learning-rate-decay", type=float)
+        parser.add_argument("--layers", type=int)
+        parser.add_argument("--seed", type=int)
+        parser.add_argument("rest", nargs="*")
+        return parser
+
+    def _parse(self, parser, argv):
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            try:
+                return parser.parse_known_args(argv)
+            except SystemExit:
+                return err.getvalue()
+
+    def test_same_as_argparse(self):
+        for argv in [
+            ["--learning-rate", "0.1"],
+            ["--learning-rate-d", "0.1"],
+            ["--learn", "0.1"],
+            ["--la=3", "--se", "-1"],
+            ["-x3", "-1", "--unknown", "-y"],
+            ["--seed=4", "--seed", "5", "a", "b"],
+        ]:
+            stock = self._parse(self._make_parser(), argv)
+            fast = self._parse(install_prefix_resolver(self._make_parser()), argv)
+            self.assertEqual(stock, fast, argv)
+
+        parser = install_prefix_resolver(self._make_parser())
+        self.assertIn("ambiguous option", self._parse(parser, ["--l", "1"]))
+
+        # options added after installation are seen
+        parser.add_argument("--zeta", type=int)
+        self.assertEqual(parser.parse_args(["--ze", "1"]).zeta, 1)
+
+    def test_prefix_index(self):
+        index = OptionPrefixIndex(["--b", "--ab", "--a", "--abc", "-a"])
+        self.assertEqual(index.with_prefix("--a"), ["--ab", "--a", "--abc"])
+        self.assertEqual(index.with_prefix("--x"), [])
+
+    def test_bind(self):
+        parser, hp_mgr = make_bound(
+            '_("learning_rate", 0.1)\n_("seed", 1)', fast_option_lookup=True
+        )
+        parser.parse_args(["--learning", "0.2", "--see", "-3"])
+        self.assertEqual(hp_mgr.get_values(), {"learning_rate": 0.2, "seed": -3})
@@ -0,0 +1,116 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+import hpargparse
+
+from hpargparse import cli, search
+
+from test_hputils import auto_cleanup_temp_dir
+
+TRIAL = """
+import argparse
+import sys
+import hpargparse
+from hpman.m import _
+
+parser = argparse.ArgumentParser()
+_.parse_file(__file__)
+hpargparse.bind(parser, _)
+parser.parse_args()
+
+print("starting")
+print("a warning", file=sys.stderr)
+for step in range(1, _("num_steps", 9) + 1):
+    loss = abs(_("lr", 0.1, range=(0, 1)) - 0.3) + 1 / step
+    if _("optimizer", "sgd", choices=["sgd", "adam"]) == "adam":
+        loss += 0.05
+    hpargparse.report(step, loss=loss)
+"""
+
+
+class TestSearch(unittest.TestCase):
+    def test_scheduler(self):
+        scheduler = search.ASHAScheduler(1, 9, eta=3, mode="min")
+        self.assertEqual(scheduler.rungs, [1, 3])
+        trials = [{"rungs": {}} for _ in range(4)]
+        self.assertTrue(scheduler.on_report(trials, trials[0], 1, 0.5))
+        self.assertTrue(scheduler.on_report(trials, trials[1], 1, 0.7))
+        # the third is not in the top third
+        self.assertFalse(scheduler.on_report(trials, trials[2], 1, 0.6))
+        self.assertTrue(scheduler.on_report(trials, trials[3], 2, 0.1))
+        self.assertEqual(trials[3]["rungs"], {"1": 0.1})
+
+    def test_report(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            search.report(3, loss=0.5)
+        self.assertEqual(search.parse_report(out.getvalue()), {"step": 3, "loss": 0.5})
+        self.assertIsNone(search.parse_report("loss: 0.5"))
+
+    def _search(self, d, trials):
+        # trials import hpargparse from this tree
+        root = os.path.dirname(os.path.dirname(hpargparse.__file__))
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(
+            err
+        ), mock.patch.dict(os.environ, PYTHONPATH=root):
+            code = cli.SUBCOMMANDS["search"](
+                ["--state", str(d / "state.json"), "--trials", str(trials)]
+                + ["-j", "3", "--metric", "loss", "--max-resource", "9"]
+                + ["--", sys.executable, str(d / "trial.py")]
+            )
+        self.assertEqual(code, 0)
+        self.assertIn("] starting\n", err.getvalue())
+        with open(str(d / "state.json")) as f:
+            return json.loads(out.getvalue()), json.load(f)["trials"]
+
+    def test_search_and_resume(self):
+        with auto_cleanup_temp_dir() as d:
+            (d / "trial.py").write_text(TRIAL)
+            best, trials = self._search(d, 9)
+            self.assertEqual(len(trials), 9)
+            statuses = [t["status"] for t in trials]
+            self.assertIn("stopped", statuses)
+            self.assertEqual(set(statuses), {"completed", "stopped"})
+            self.assertEqual(set(best["params"]), {"lr", "optimizer"})
+            self.assertEqual(best["last"]["step"], 9)
+            self.assertTrue(
+                all(
+                    best["last"]["loss"] <= t["last"]["loss"]
+                    for t in trials
+                    if t["status"] == "completed"
+                )
+            )
+
+            with open(best["stderr"]) as f:
+                self.assertEqual(f.read(), "a warning\n")
+
+            _, resumed = self._search(d, 12)
+            self.assertEqual(resumed[:9], trials)
+            self.assertTrue(all(t["status"] != "pending" for t in resumed))
+
+    def test_resume_drops_rungs(self):
+        with auto_cleanup_temp_dir() as d:
+            state = str(d / "state.json")
+            with open(state, "w") as f:
+                trial = {"id": 0, "params": {}, "status": "running"}
+                trial.update(rungs={"1": 0.0}, last={"step": 1, "loss": 0.0})
+                json.dump({"trials": [trial]}, f)
+            driver = search.SearchDriver(
+                [sys.executable, "-c", "pass"],
+                {},
+                state,
+                num_trials=1,
+                jobs=1,
+                metric="loss",
+                scheduler=search.ASHAScheduler(1, 9),
+            )
+            (trial,) = driver.run()
+            self.assertEqual(trial["status"], "completed")
+            self.assertEqual(trial["rungs"], {})
+            self.assertIsNone(trial["last"])
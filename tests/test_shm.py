@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import sys
+import unittest
+from unittest import mock
+
+import hpargparse
+from hpargparse import shm
+
+from test_hputils import make_mgr
+
+SOURCE = '_("a", 1)\n_("b", "x")'
+
+
+def _child(queue):
+    hp_mgr = make_mgr(SOURCE)
+    values = hpargparse.attach_shared(hp_mgr)
+    queue.put((dict(values), hp_mgr.get_value("a"), hp_mgr.get_value("b")))
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "requires multiprocessing.shared_memory")
+class TestShm(unittest.TestCase):
+    def test_attach_in_same_process(self):
+        hp_mgr = make_mgr(SOURCE)
+        hp_mgr.set_value("a", 3)
+        with hpargparse.export_shared(hp_mgr, env_name=None) as shared:
+            values = hpargparse.attach_shared(name=shared.name)
+        self.assertEqual(dict(values), {"a": 3, "b": "x"})
+        with self.assertRaises(TypeError):
+            values["a"] = 4
+
+    def test_attach_in_child_process(self):
+        hp_mgr = make_mgr(SOURCE)
+        hp_mgr.set_values({"a": 42, "b": "shared"})
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        with hpargparse.export_shared(hp_mgr):
+            p = ctx.Process(target=_child, args=(queue,))
+            p.start()
+            result = queue.get(timeout=60)
+            p.join()
+        self.assertEqual(result, ({"a": 42, "b": "shared"}, 42, "shared"))
+        self.assertNotIn(hpargparse.config.HP_SHM_NAME_ENV, os.environ)
+
+    @unittest.skipIf(sys.version_info >= (3, 13), "attached without tracking")
+    def test_resource_tracker_registration(self):
+        from multiprocessing import resource_tracker
+
+        hp_mgr = make_mgr(SOURCE)
+        with hpargparse.export_shared(hp_mgr, env_name=None) as shared:
+            for exported, parent, unregistered in [
+                (True, None, False),
+                (False, object(), False),
+                (False, None, True),
+            ]:
+                with mock.patch.object(
+                    shm, "_exported_names", {shared.name} if exported else set()
+                ), mock.patch(
+                    "multiprocessing.parent_process", return_value=parent
+                ), mock.patch.object(
+                    resource_tracker, "unregister"
+                ) as unregister:
+                    hpargparse.attach_shared(name=shared.name)
+                self.assertEqual(unregister.called, unregistered)
+
+    def test_attach_without_export(self):
+        self.assertRaises(KeyError, hpargparse.attach_shared, env_name="NO_SUCH_ENV")
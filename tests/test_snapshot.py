@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+import hpargparse
+
+from test_hputils import auto_cleanup_temp_dir, make_bound, make_mgr
+
+SOURCE = '_("a", 1)\n_("b", 2)\n_("group.c", 3)'
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_restore(self):
+        hp_mgr = make_mgr(SOURCE)
+        with hpargparse.snapshot(hp_mgr) as snap:
+            hp_mgr.set_value("a", 10)
+            hp_mgr.set_tree({"group": {"c": 30, "d": 40}})
+            hp_mgr.set_value("new.x", 5)
+            self.assertEqual(snap.changed, ["a", "group.c", "group.d", "new.x"])
+
+            hpargparse.restore(snap)
+            self.assertEqual(hp_mgr.get_values(), {"a": 1, "b": 2, "group.c": 3})
+            self.assertIsNone(hp_mgr.tree.get("new"))
+            self.assertEqual(snap.changed, [])
+
+            # still active after a restore
+            hp_mgr.set_value("b", 20)
+            snap.restore()
+            self.assertEqual(hp_mgr.get_value("b"), 2)
+
+        self.assertNotIn("set_value", vars(hp_mgr))
+        hp_mgr.set_value("a", 100)
+        self.assertEqual(hp_mgr.get_value("a"), 100)
+
+    def test_nested_snapshots(self):
+        hp_mgr = make_mgr(SOURCE)
+        outer = hpargparse.snapshot(hp_mgr)
+        hp_mgr.set_value("a", 10)
+        inner = hpargparse.snapshot(hp_mgr)
+        hp_mgr.set_value("a", 20)
+        inner.restore()
+        inner.release()
+        self.assertEqual(hp_mgr.get_value("a"), 10)
+        outer.restore()
+        outer.release()
+        self.assertEqual(hp_mgr.get_value("a"), 1)
+
+    def test_failed_parse_rolls_back(self):
+        parser, hp_mgr = make_bound(SOURCE)
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.yaml")
+            with mock.patch.object(
+                hpargparse.hputils, "hp_save", side_effect=OSError("disk full")
+            ):
+                with self.assertRaises(OSError):
+                    parser.parse_args(["--a", "10", "--hp-save", path])
+        self.assertEqual(hp_mgr.get_values(), {"a": 1, "b": 2, "group.c": 3})
+        self.assertNotIn("set_value", vars(hp_mgr))
+
+        parser.parse_args(["--a", "10"])
+        self.assertEqual(hp_mgr.get_value("a"), 10)
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import unittest
+
+from hpargparse.suggest import NameIndex, edit_distance
+
+from test_hputils import make_bound
+
+SOURCE = '_("learning_rate", 0.1)'
+
+
+class TestSuggest(unittest.TestCase):
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("kitten", "sitting"), 3)
+        self.assertEqual(edit_distance("", "abc"), 3)
+        self.assertEqual(edit_distance("abc", "abc"), 0)
+        self.assertEqual(edit_distance("kitten", "sitting", max_distance=2), 3)
+        self.assertEqual(edit_distance("kitten", "sitting", max_distance=1), 2)
+        self.assertEqual(edit_distance("a.b.kitten", "a.b.sitting", 3), 3)
+
+    def test_name_index(self):
+        index = NameIndex(
+            ["--learning-rate", "--learning-rates", "--batch-size", "--a"]
+        )
+        self.assertEqual(
+            index.suggest("--learnig-rate"), ["--learning-rate", "--learning-rates"]
+        )
+        self.assertEqual(index.suggest("--batch-szie"), ["--batch-size"])
+        self.assertEqual(index.suggest("--b"), ["--a"])
+        self.assertEqual(index.suggest("--completely-different"), [])
+
+    def test_name_index_large(self):
+        # namespaced names share most of their n-grams with each other
+        keys = ["weight-decay", "bias-decay", "lr-mult", "momentum", "dropout"]
+        keys += ["init-std", "groups", "stride", "padding", "dilation"]
+        names = [
+            "--layer{}.conv{}.{}".format(layer, conv, key)
+            for layer in range(200)
+            for conv in range(50)
+            for key in keys
+        ]
+        index = NameIndex(names)
+
+        self.assertEqual(
+            index.suggest("--layer12.conv3.weigth-decay"),
+            [
+                "--layer12.conv3.weight-decay",
+                "--layer1.conv3.weight-decay",
+                "--layer10.conv3.weight-decay",
+            ],
+        )
+        self.assertEqual(
+            index.suggest("--layer12.conv3.stide")[0], "--layer12.conv3.stride"
+        )
+        self.assertEqual(
+            index.suggest("--layr150.conv49.padding")[0], "--layer150.conv49.padding"
+        )
+
+    def test_suggest_mode(self):
+        parser, _ = make_bound(SOURCE, unknown_options="suggest")
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            args, extras = parser.parse_known_args(["--learnig-rate", "0.2"])
+        self.assertEqual(extras, ["--learnig-rate", "0.2"])
+        self.assertIn("did you mean `--learning-rate`?", err.getvalue())
+
+    def test_error_mode(self):
+        parser, _ = make_bound(SOURCE, unknown_options="error")
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            self.assertRaises(
+                SystemExit, parser.parse_known_args, ["--learnig-rate=0.2"]
+            )
+        self.assertIn("did you mean `--learning-rate`?", err.getvalue())
+
+        # positional extras are fine
+        parser.parse_known_args(["extra"])
+        parser.parse_known_args(["--", "--learnig-rate"])
+
+    def test_suggest_conditional(self):
+        parser, _ = make_bound(
+            '_("optimizer", "adam")\n'
+            '_("sgd_momentum", 0.9, condition={"optimizer": "sgd"})',
+            unknown_options="error",
+        )
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            self.assertRaises(
+                SystemExit,
+                parser.parse_known_args,
+                ["--optimizer", "sgd", "--sgd-momentun", "0.5"],
+            )
+        self.assertIn("did you mean `--sgd-momentum`?", err.getvalue())
@@ -0,0 +1,91 @@
+import contextlib
+import io
+import json
+import unittest
+
+import dill
+import yaml
+from hpargparse import cli, validate
+
+from test_hputils import auto_cleanup_temp_dir, make_mgr
+
+SOURCE = """
+_("lr", 0.1, range=(0, 1))
+_("epochs", 10, range=(1, None))
+_("optimizer", "sgd", choices=["sgd", "adam"])
+_("model.depth", 18, required=True)
+_("layers", [1, 2])
+"""
+
+
+class TestValidate(unittest.TestCase):
+    def _write_configs(self, d):
+        configs = {
+            "good.yaml": {"lr": 0.5, "model": {"depth": 50}, "layers": [3]},
+            "bad.yaml": {
+                "lr": 2,
+                "epochs": 0,
+                "optimizer": "rmsprop",
+                "unknown": 1,
+                "layers": "[1",
+            },
+            # "50" is converted like --hp-load does; the others cannot be
+            "typed.yaml": {"model.depth": "50", "epochs": "ten", "layers": "(1,)"},
+        }
+        paths = []
+        for name, values in configs.items():
+            path = str(d / name)
+            with open(path, "w") as f:
+                yaml.dump(values, f)
+            paths.append(path)
+
+        path = str(d / "good.pkl")
+        with open(path, "wb") as f:
+            dill.dump({"model.depth": 34, "epochs": 3}, f)
+        paths.append(path)
+        return paths
+
+    def _errors(self, report):
+        return sorted((e["name"], e["error"]) for e in report["errors"])
+
+    def _check(self, reports):
+        self.assertEqual([r["ok"] for r in reports], [True, False, False, True])
+        self.assertEqual(
+            self._errors(reports[1]),
+            [
+                ("epochs", "range"),
+                ("layers", "type"),
+                ("lr", "range"),
+                ("model.depth", "required"),
+                ("optimizer", "choices"),
+                ("unknown", "unknown"),
+            ],
+        )
+        self.assertEqual(
+            self._errors(reports[2]), [("epochs", "type"), ("layers", "type")]
+        )
+
+    def test_validate_files(self):
+        hp_mgr = make_mgr(SOURCE)
+        with auto_cleanup_temp_dir() as d:
+            paths = self._write_configs(d)
+            self._check(validate.validate_files(hp_mgr, paths, jobs=1))
+            self._check(validate.validate_files(hp_mgr, paths, jobs=2))
+
+            missing = validate.validate_files(hp_mgr, [str(d / "missing.yaml")])
+            self.assertEqual(self._errors(missing[0]), [(None, "load")])
+
+    def test_cli(self):
+        with auto_cleanup_temp_dir() as d:
+            source = d / "src.py"
+            source.write_text(SOURCE)
+            paths = self._write_configs(d)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = cli.SUBCOMMANDS["validate"](
+                    ["-s", str(source), "-j", "1"] + paths
+                )
+            self.assertEqual(code, 1)
+            reports = [json.loads(line) for line in out.getvalue().splitlines()]
+            self.assertEqual([r["path"] for r in reports], paths)
+            self._check(reports)
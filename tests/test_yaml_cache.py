@@ -0,0 +1,48 @@
+import os
+import unittest
+from unittest import mock
+
+import yaml
+from hpargparse import yaml_cache
+
+from test_hputils import auto_cleanup_temp_dir, make_bound
+
+
+class TestYAMLCache(unittest.TestCase):
+    def test_load(self):
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.yaml")
+            with open(path, "w") as f:
+                yaml.dump({"lr": 0.1, "model": {"depth": 18}}, f)
+
+            cache = yaml_cache.YAMLCache(str(d / "cache"))
+            self.assertEqual(cache.load(path), {"lr": 0.1, "model": {"depth": 18}})
+            with mock.patch.object(yaml, "safe_load", side_effect=AssertionError):
+                self.assertEqual(cache.load(path), {"lr": 0.1, "model": {"depth": 18}})
+
+            # same size, same mtime, different content
+            st = os.stat(path)
+            with open(path, "w") as f:
+                yaml.dump({"lr": 0.2, "model": {"depth": 18}}, f)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            self.assertEqual(cache.load(path)["lr"], 0.2)
+
+            # not supported by marshal
+            with open(path, "w") as f:
+                f.write("date: 2020-01-01\n")
+            cache.load(path)
+            with mock.patch.object(yaml, "safe_load", return_value={}) as m:
+                cache.load(path)
+            m.assert_called_once()
+
+    def test_bind(self):
+        with auto_cleanup_temp_dir() as d:
+            path = str(d / "hp.yaml")
+            with open(path, "w") as f:
+                yaml.dump({"lr": 0.5}, f)
+
+            for _ in range(2):
+                parser, hp_mgr = make_bound('_("lr", 0.1)', yaml_cache=str(d / "cache"))
+                parser.parse_args(["--hp-load", path])
+                self.assertEqual(hp_mgr.get_value("lr"), 0.5)
+            self.assertEqual(len(os.listdir(str(d / "cache" / "yaml"))), 1)